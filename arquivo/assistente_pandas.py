@@ -49,12 +49,25 @@ def analisar_e_carregar_csv(caminho_arquivo: str, amostra_bytes: int = 10000) ->
 
         # --- Passo 3: Carregar os Dados com o Pandas ---
         print("\n--- 🔄 Carregando o arquivo completo com os parâmetros detectados ---")
-        df = pd.read_csv(
-            caminho_arquivo,
-            sep=delimitador_detectado,
-            encoding=codificacao_detectada,
-            engine='python' # Usar a engine 'python' é mais flexível com delimitadores
-        )
+        # Tenta o motor 'c', mais rápido, e deixa o 'python' como último
+        # recurso ('c' só aceita delimitadores de um caractere). O 'pyarrow'
+        # fica de fora: ele converteria textos com cara de data em datas
+        motores = ['c', 'python'] if len(delimitador_detectado) == 1 else ['python']
+
+        for motor in motores:
+            try:
+                df = pd.read_csv(
+                    caminho_arquivo,
+                    sep=delimitador_detectado,
+                    encoding=codificacao_detectada,
+                    engine=motor
+                )
+                break
+            except ValueError as e:
+                if motor == motores[-1]:
+                    raise
+                print(f"⚠️  Aviso: O motor '{motor}' falhou ({e}). Tentando o próximo...")
+        print(f"✅ Motor de leitura utilizado: '{motor}'")
 
         # --- Passo 4: Exibir o Resumo e Retornar o DataFrame ---
         print("\n--- 📊 Resumo do DataFrame Carregado ---")
@@ -0,0 +1,411 @@
+"""
+Benchmarks da Caixa de Ferramentas do Analista
+----------------------------------------------
+
+Gera dados sintéticos com o formato dos arquivos de exemplo do repositório
+e mede o desempenho de `carregar_csv_inteligente` e `converter_notebook_para_py`.
+
+Conjuntos de dados gerados:
+- vendas_br:   como `relatorio_vendas_BR.csv` (';' e Latin-1).
+- feedback_us: como `dados_feedback_US.csv` (texto entre aspas, com vírgulas
+               e quebras de linha dentro dos campos).
+- log_acessos: como `log_acessos.tsv` (tabulações, ordenado por Timestamp).
+- notebook:    notebooks grandes, com saídas contendo imagens em base64.
+
+Antes dos casos, mede o tempo de `import ferramentas_analista` e o de um
+comando curto da linha de comando, e falha se a importação carregar o pandas,
+o chardet ou o nbformat (que devem ser importados só quando usados).
+
+Cada caso roda em um processo novo, para que o pico de memória (RSS) medido
+seja só dele. O tempo total é medido em volta de cada chamada; o tempo de cada
+fase vem do `MetricasExecucao` retornado pelas próprias funções
+(`retornar_metricas=True`) e é informado à parte. Os resultados são gravados em
+JSON e podem ser comparados com uma execução anterior para detectar regressões.
+
+Uso:
+    python benchmark_ferramentas.py --tamanhos 1MB 100MB 2GB --saida atual.json
+    python benchmark_ferramentas.py --tamanhos 1MB 100MB --comparar base.json
+"""
+
+import argparse
+import base64
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+CONJUNTOS = ('vendas_br', 'feedback_us', 'log_acessos', 'notebook')
+LINHAS_POR_ESCRITA = 1_000
+
+# ==============================================================================
+# GERADORES DE DADOS SINTÉTICOS
+# ==============================================================================
+PRODUTOS = ['Notebook Gamer', 'Cadeira de Escritório', 'Cafeteira Elétrica',
+            'Açúcar Mascavo 1kg', 'Monitor 4K', 'Fone sem Fio', 'Mesa de Jantar']
+CATEGORIAS = ['Eletrônicos', 'Móveis', 'Eletrodomésticos', 'Alimentos']
+COMENTARIOS = ['Excellent service, very fast delivery!',
+               'The product is good, but the packaging was damaged.',
+               'I like it. Would recommend.',
+               'Arrived late;\nsupport was helpful, though.',
+               'Said "great" on the box, and it was.']
+ENDPOINTS = ['/api/data', '/login', '/logout', '/api/users', '/static/app.js']
+STATUS = [200, 200, 200, 200, 201, 304, 401, 404, 500]
+
+
+def _escrever_ate(caminho: str, tamanho_bytes: int, codificacao: str, cabecalho: str, gerar_linhas):
+    """Escreve o cabeçalho e blocos de linhas até o arquivo atingir o tamanho pedido."""
+    escritos = 0
+    with open(caminho, 'w', encoding=codificacao, newline='') as f:
+        escritos += f.write(cabecalho)
+        inicio = 0
+        while escritos < tamanho_bytes:
+            bloco = ''.join(gerar_linhas(inicio, LINHAS_POR_ESCRITA))
+            escritos += f.write(bloco)
+            inicio += LINHAS_POR_ESCRITA
+
+
+def gerar_vendas_br(caminho: str, tamanho_bytes: int, semente: int = 42):
+    rng = random.Random(semente)
+    inicio = datetime(2025, 1, 1)
+
+    def linhas(primeira, quantidade):
+        for i in range(primeira, primeira + quantidade):
+            data = (inicio + timedelta(days=i // 1000)).strftime('%Y-%m-%d')
+            yield (f"{100 + i};{rng.choice(PRODUTOS)};{rng.choice(CATEGORIAS)};"
+                   f"{rng.uniform(5, 6000):.2f};{data}\n")
+
+    _escrever_ate(caminho, tamanho_bytes, 'latin-1', "ID_Produto;Produto;Categoria;Preço;Data_Venda\n", linhas)
+
+
+def gerar_feedback_us(caminho: str, tamanho_bytes: int, semente: int = 42):
+    rng = random.Random(semente)
+
+    def linhas(primeira, quantidade):
+        for i in range(primeira, primeira + quantidade):
+            comentario = rng.choice(COMENTARIOS).replace('"', '""')
+            yield f'{5000 + i},{rng.randint(1, 5)},"{comentario}"\n'
+
+    _escrever_ate(caminho, tamanho_bytes, 'utf-8', "CustomerID,Rating,Comment\n", linhas)
+
+
+def gerar_log_acessos(caminho: str, tamanho_bytes: int, semente: int = 42):
+    rng = random.Random(semente)
+    inicio = datetime(2025, 8, 17, tzinfo=timezone.utc)
+
+    def linhas(primeira, quantidade):
+        for i in range(primeira, primeira + quantidade):
+            momento = (inicio + timedelta(seconds=i)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            ip = f"{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+            yield f"{momento}\t{ip}\t{rng.choice(ENDPOINTS)}\t{rng.choice(STATUS)}\n"
+
+    _escrever_ate(caminho, tamanho_bytes, 'utf-8', "Timestamp\tIP_Address\tEndpoint\tStatus_Code\n", linhas)
+
+
+def gerar_notebook(caminho: str, tamanho_bytes: int, semente: int = 42, bytes_imagem: int = 200_000):
+    """
+    Gera um notebook com células de markdown e código (incluindo comandos
+    mágicos, shell e display()) até atingir o tamanho pedido. Metade das
+    células de código tem uma saída com uma "imagem" PNG em base64.
+    """
+    rng = random.Random(semente)
+    imagem = base64.b64encode(rng.randbytes(bytes_imagem * 3 // 4)).decode('ascii')
+    celulas, tamanho = [], 0
+    while tamanho < tamanho_bytes:
+        i = len(celulas)
+        if i % 3 == 0:
+            celula = {'cell_type': 'markdown', 'metadata': {},
+                      'source': [f"## Seção {i}\n", "\n", "Texto explicativo da análise."]}
+        else:
+            saidas = []
+            if i % 2 == 0:
+                saidas.append({'output_type': 'display_data', 'metadata': {},
+                               'data': {'image/png': imagem, 'text/plain': ['<Figure>']}})
+            celula = {'cell_type': 'code', 'execution_count': i, 'metadata': {}, 'outputs': saidas,
+                      'source': ["%matplotlib inline\n", "!pip install openpyxl -q\n",
+                                 f"df_{i} = carregar_csv_inteligente('dados_{i}.csv')\n",
+                                 f"display(df_{i}.head())"]}
+        celulas.append(celula)
+        tamanho += len(json.dumps(celula))
+    notebook = {'cells': celulas, 'metadata': {}, 'nbformat': 4, 'nbformat_minor': 4}
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(notebook, f, indent=1, ensure_ascii=False)
+
+
+GERADORES = {
+    'vendas_br': (gerar_vendas_br, '.csv'),
+    'feedback_us': (gerar_feedback_us, '.csv'),
+    'log_acessos': (gerar_log_acessos, '.tsv'),
+    'notebook': (gerar_notebook, '.ipynb'),
+}
+
+
+def preparar_dados(conjunto: str, tamanho_bytes: int, pasta: str) -> str:
+    """Gera o arquivo sintético, se ainda não existir na pasta, e retorna seu caminho."""
+    gerador, extensao = GERADORES[conjunto]
+    caminho = os.path.join(pasta, f"{conjunto}_{tamanho_bytes}{extensao}")
+    if not os.path.exists(caminho):
+        os.makedirs(pasta, exist_ok=True)
+        print(f"--- 🛠️  Gerando '{caminho}' ---")
+        gerador(caminho + '.tmp', tamanho_bytes)
+        os.replace(caminho + '.tmp', caminho)
+    return caminho
+
+# ==============================================================================
+# EXECUÇÃO DOS CASOS
+# ==============================================================================
+def _pico_rss_bytes() -> int:
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+
+def _medir_carregamento(caminho: str) -> dict:
+    import ferramentas_analista as fa
+    # Importado de propósito, sem uso: o `ferramentas_analista` só importa o
+    # pandas na primeira leitura, e esse custo (medido à parte, nos casos de
+    # inicialização) não deve entrar no tempo do carregamento
+    import pandas
+
+    # O tempo total é medido em volta da chamada: a soma das fases deixa de
+    # fora o que acontece entre elas
+    inicio = time.perf_counter()
+    df, metricas = fa.carregar_csv_inteligente(caminho, usar_cache=False, silencioso=True,
+                                               retornar_metricas=True)
+    tempo_total = time.perf_counter() - inicio
+    if metricas.erro:
+        raise RuntimeError(metricas.erro)
+    return {
+        'linhas': metricas.linhas,
+        'fases': metricas.fases,
+        'tempo_total': tempo_total,
+        'detalhes': {'codificacao': metricas.codificacao, 'motor': metricas.motor},
+    }
+
+
+def _medir_conversao(caminho: str) -> dict:
+    import ferramentas_analista as fa
+
+    inicio = time.perf_counter()
+    metricas = fa.converter_notebook_para_py(caminho, caminho + '.py', silencioso=True,
+                                             retornar_metricas=True)
+    tempo_total = time.perf_counter() - inicio
+    if metricas.erro:
+        raise RuntimeError(metricas.erro)
+    return {'linhas': metricas.linhas, 'fases': metricas.fases, 'tempo_total': tempo_total,
+            'detalhes': {}}
+
+
+def _executar_caso(conjunto: str, caminho: str, fila):
+    """Roda um caso no processo filho e devolve as medidas pela fila."""
+    try:
+        medidas = _medir_conversao(caminho) if conjunto == 'notebook' else _medir_carregamento(caminho)
+        medidas['pico_rss_bytes'] = _pico_rss_bytes()
+        fila.put(medidas)
+    except Exception as e:
+        fila.put({'erro': f"{type(e).__name__}: {e}"})
+
+
+def medir(conjunto: str, caminho: str) -> dict:
+    contexto = multiprocessing.get_context('spawn')
+    fila = contexto.Queue()
+    processo = contexto.Process(target=_executar_caso, args=(conjunto, caminho, fila))
+    processo.start()
+    medidas = fila.get()
+    processo.join()
+    return medidas
+
+
+def executar(conjuntos: list[str], tamanhos: list[int], pasta: str, repeticoes: int) -> list[dict]:
+    resultados = []
+    for conjunto in conjuntos:
+        for tamanho in tamanhos:
+            caminho = preparar_dados(conjunto, tamanho, pasta)
+            tamanho_real = os.path.getsize(caminho)
+            rodadas = [medir(conjunto, caminho) for _ in range(repeticoes)]
+            erros = [r['erro'] for r in rodadas if 'erro' in r]
+            if erros:
+                print(f"❌ {conjunto} ({_formatar_tamanho(tamanho)}): {erros[0]}")
+                resultados.append({'caso': f"{conjunto}/{tamanho}", 'erro': erros[0]})
+                continue
+
+            # A melhor rodada é a menos afetada por ruído do sistema
+            melhor = min(rodadas, key=lambda r: r['tempo_total'])
+            resultado = {
+                'caso': f"{conjunto}/{tamanho}",
+                'conjunto': conjunto,
+                'tamanho_bytes': tamanho_real,
+                'tempo_total': melhor['tempo_total'],
+                'fases': melhor['fases'],
+                'linhas': melhor['linhas'],
+                'linhas_por_segundo': melhor['linhas'] / melhor['tempo_total'] if melhor['tempo_total'] else None,
+                'mb_por_segundo': tamanho_real / 1024 ** 2 / melhor['tempo_total'] if melhor['tempo_total'] else None,
+                'pico_rss_bytes': max(r['pico_rss_bytes'] for r in rodadas),
+                'detalhes': melhor['detalhes'],
+            }
+            resultados.append(resultado)
+            print(f"✅ {conjunto:<12} {_formatar_tamanho(tamanho_real):>10}  "
+                  f"{resultado['tempo_total']:8.3f} s  {resultado['linhas_por_segundo'] or 0:12,.0f} linhas/s  "
+                  f"pico RSS {_formatar_tamanho(resultado['pico_rss_bytes'])}")
+            print("   " + "  ".join(f"{fase}: {duracao:.3f} s" for fase, duracao in resultado['fases'].items()))
+    return resultados
+
+# Módulos pesados que não podem ser carregados por `import ferramentas_analista`
+MODULOS_PESADOS = ('pandas', 'chardet', 'nbformat', 'numpy', 'pyarrow')
+
+_CODIGO_IMPORTACAO = """
+import json, resource, sys, time
+inicio = time.perf_counter()
+import ferramentas_analista
+tempo = time.perf_counter() - inicio
+print(json.dumps({'tempo': tempo, 'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  'carregados': [m for m in %r if m in sys.modules]}))
+""" % (MODULOS_PESADOS,)
+
+
+def medir_inicializacao(pasta: str, repeticoes: int) -> list[dict]:
+    """
+    Mede o tempo de `import ferramentas_analista` e o de um comando curto da
+    linha de comando ('detectar'), cada um em um interpretador novo. Falha se
+    a importação carregar algum dos módulos pesados.
+    """
+    import subprocess
+
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    ambiente = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [raiz, os.environ.get('PYTHONPATH')])))
+    resultados = []
+
+    rodadas = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-c', _CODIGO_IMPORTACAO], env=ambiente,
+                               capture_output=True, text=True, check=True)
+        rodadas.append(json.loads(saida.stdout))
+    carregados = sorted({m for r in rodadas for m in r['carregados']})
+    if carregados:
+        resultados.append({'caso': 'inicializacao/importacao',
+                           'erro': f"a importação carregou {', '.join(carregados)}"})
+    else:
+        rss = max(r['rss'] for r in rodadas)
+        resultados.append({'caso': 'inicializacao/importacao', 'conjunto': 'inicializacao',
+                           'tempo_total': min(r['tempo'] for r in rodadas), 'fases': {},
+                           'pico_rss_bytes': rss if sys.platform == 'darwin' else rss * 1024,
+                           'detalhes': {}})
+
+    # O comando completo, com a inicialização do interpretador
+    caminho = preparar_dados('vendas_br', 1024 ** 2, pasta)
+    comando = [sys.executable, os.path.join(raiz, 'ferramentas_analista.py'), 'detectar', caminho, '--sem-cache']
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(comando, env=ambiente, capture_output=True, check=True)
+        tempos.append(time.perf_counter() - inicio)
+    resultados.append({'caso': 'inicializacao/cli_detectar', 'conjunto': 'inicializacao',
+                       'tempo_total': min(tempos), 'fases': {},
+                       'pico_rss_bytes': _pico_rss_filhos_bytes(), 'detalhes': {}})
+
+    for resultado in resultados:
+        if 'erro' in resultado:
+            print(f"❌ {resultado['caso']}: {resultado['erro']}")
+        else:
+            print(f"✅ {resultado['caso']:<28} {resultado['tempo_total']:8.3f} s")
+    return resultados
+
+
+def _pico_rss_filhos_bytes() -> int:
+    pico = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return pico if sys.platform == 'darwin' else pico * 1024
+
+# ==============================================================================
+# COMPARAÇÃO ENTRE EXECUÇÕES
+# ==============================================================================
+def comparar(atuais: list[dict], anteriores: list[dict], tolerancia: float) -> list[str]:
+    """
+    Compara tempo total e pico de memória de cada caso com uma execução
+    anterior e retorna a descrição das regressões acima da tolerância.
+    """
+    por_caso = {r['caso']: r for r in anteriores if 'erro' not in r}
+    regressoes = []
+    for atual in atuais:
+        anterior = por_caso.get(atual['caso'])
+        if anterior is None or 'erro' in atual:
+            continue
+        for metrica in ('tempo_total', 'pico_rss_bytes'):
+            if anterior[metrica] and atual[metrica] > anterior[metrica] * (1 + tolerancia):
+                variacao = atual[metrica] / anterior[metrica] - 1
+                regressoes.append(f"{atual['caso']}: {metrica} piorou {variacao:+.1%} "
+                                  f"({anterior[metrica]:.4g} → {atual[metrica]:.4g})")
+    return regressoes
+
+# ==============================================================================
+# LINHA DE COMANDO
+# ==============================================================================
+UNIDADES = {'KB': 1024, 'MB': 1024 ** 2, 'GB': 1024 ** 3}
+
+
+def _ler_tamanho(texto: str) -> int:
+    texto = texto.strip().upper()
+    for unidade, fator in UNIDADES.items():
+        if texto.endswith(unidade):
+            return int(float(texto[:-len(unidade)]) * fator)
+    return int(texto)
+
+
+def _formatar_tamanho(n_bytes: float) -> str:
+    for unidade in ('B', 'KB', 'MB', 'GB'):
+        if n_bytes < 1024 or unidade == 'GB':
+            return f"{n_bytes:.1f} {unidade}"
+        n_bytes /= 1024
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do carregador de CSV e do conversor de notebooks.")
+    parser.add_argument('--conjuntos', nargs='+', choices=CONJUNTOS, default=list(CONJUNTOS))
+    parser.add_argument('--tamanhos', nargs='+', default=['1MB', '10MB', '100MB'],
+                        help="Tamanhos dos arquivos gerados (ex: 1MB 500MB 2GB).")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--pasta-dados', default=os.path.join('.bench_dados'),
+                        help="Pasta onde os dados sintéticos são gerados e reaproveitados.")
+    parser.add_argument('--saida', default='bench_resultados.json')
+    parser.add_argument('--comparar', help="JSON de uma execução anterior para detectar regressões.")
+    parser.add_argument('--tolerancia', type=float, default=0.10,
+                        help="Piora relativa aceita antes de acusar regressão (padrão: 0.10).")
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    resultados = medir_inicializacao(args.pasta_dados, args.repeticoes)
+    resultados += executar(args.conjuntos, [_ler_tamanho(t) for t in args.tamanhos],
+                           args.pasta_dados, args.repeticoes)
+    relatorio = {
+        'data': datetime.now(timezone.utc).isoformat(),
+        'ambiente': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'plataforma': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'resultados': resultados,
+    }
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, indent=2, ensure_ascii=False)
+    print(f"\n--- 💾 Resultados gravados em '{args.saida}' ---")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            anteriores = json.load(f)['resultados']
+        regressoes = comparar(resultados, anteriores, args.tolerancia)
+        if regressoes:
+            print("\n⚠️  REGRESSÕES DETECTADAS")
+            for regressao in regressoes:
+                print(f"   - {regressao}")
+            return 1
+        print("✅ Nenhuma regressão em relação à execução anterior.")
+    return 1 if any('erro' in r for r in resultados) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
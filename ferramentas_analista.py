@@ -12,147 +12,3713 @@ Funções disponíveis:
 - converter_notebook_para_py: Transforma um notebook Jupyter (.ipynb) em 
   um script Python (.py) limpo, compatível e gera um relatório de 
   modificações.
+- carregar_csv_em_blocos: Lê arquivos maiores que a memória em blocos de
+  DataFrames, reaproveitando a detecção automática.
+- info_cache_deteccao / limpar_cache_deteccao: Inspecionam e limpam o cache
+  da detecção de codificação e delimitador.
+- carregar_varios_csv: Carrega vários arquivos (lista ou glob) em paralelo,
+  com relatório de erros por arquivo e concatenação por esquema.
+- configurar_cache_colunar / info_cache_colunar / limpar_cache_colunar:
+  Administram as cópias Parquet/Feather usadas por `cache_colunar=`.
+- converter_notebooks_em_lote: Converte árvores inteiras de notebooks em
+  paralelo, pulando os que não mudaram, com um relatório de compatibilidade
+  combinado. Também disponível na linha de comando:
+  `python ferramentas_analista.py converter <pasta>`.
+- observar_notebooks: Observa uma pasta e reconverte os notebooks assim que
+  são salvos (`converter <pasta> --observar` na linha de comando).
+- perfilar_csv: Resume cada coluna (nulos, tipo, mínimo/máximo, média, desvio,
+  distintos e quantis aproximados) em uma única passagem, com memória constante.
+- construir_indice_tempo / carregar_intervalo_tempo: Indexam um log ordenado
+  por tempo (`<arquivo>.idx.json`, estendido conforme o arquivo cresce) e
+  carregam só as linhas de um intervalo de tempo, lendo direto os bytes dele.
+- CarregadorAssincrono: `await carregador.carregar(...)` para serviços em
+  asyncio, com limite de carregamentos simultâneos e cancelamento.
+- CarregadorIncremental: Acompanha um arquivo que cresce (como um log) e, a
+  cada `atualizar()`, lê só as linhas acrescentadas.
+- CheckpointsEtapas: Usado pelos scripts gerados com
+  `converter_notebook_para_py(..., checkpoints=True)` para pular as células
+  que não mudaram, restaurando as variáveis delas do disco.
+
+Com `n_processos=N`, `carregar_csv_inteligente` divide um único arquivo grande
+em intervalos de bytes alinhados aos fins de registro e os lê em N processos.
+
+Na linha de comando: `python ferramentas_analista.py carregar|detectar|converter`
+(ou `load|sniff|convert`). O pandas, o chardet e o nbformat só são importados
+quando usados.
+
+Todas as funções aceitam `silencioso=True` para desligar as mensagens
+impressas. O tempo de cada fase, os bytes e linhas processados e o resultado
+da detecção ficam em um `MetricasExecucao` (`retornar_metricas=True`), são
+enviados ao logger 'ferramentas_analista' e, opcionalmente, a um callback
+`ao_registrar(evento, dados)`.
 """
 
-import pandas as pd
-import chardet
+from __future__ import annotations
+
+import codecs
+import contextlib
 import csv
+import functools
+import glob
+import hashlib
+import importlib.util
 import io
-import nbformat
+import itertools
+import json
+import logging
+import math
+import mmap
+import os
+import re
 import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING
+
+# pandas, chardet e nbformat são importados só quando usados: converter um
+# notebook não paga a importação do pandas, e a linha de comando inicia rápido
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Motores de leitura do pandas, do mais rápido para o mais tolerante.
+MOTORES_CSV = ('pyarrow', 'c', 'python')
+# Formato de data que nenhum valor satisfaz: impede o 'pyarrow' de converter
+# sozinho os textos com cara de data e hora
+FORMATO_DATA_NENHUM = '\x00'
+# Linhas lidas para saber quais colunas os motores 'c'/'python' leem como texto
+LINHAS_AMOSTRA_TEXTO = 1000
+
+logger = logging.getLogger(__name__)
+# Sem configuração do usuário, os eventos não vão para o stderr
+logger.addHandler(logging.NullHandler())
 
 # ==============================================================================
-# FUNÇÃO 1: CARREGADOR INTELIGENTE DE DADOS (Sem alterações)
+# AUXILIARES: MENSAGENS E MÉTRICAS DE EXECUÇÃO
 # ==============================================================================
-def carregar_csv_inteligente(caminho_arquivo: str, amostra_bytes: int = 20000) -> pd.DataFrame | None:
-    # (O código desta função permanece o mesmo da versão anterior)
-    print(f"--- 🚀 Iniciando Análise Automática de '{caminho_arquivo}' ---")
-    try:
-        with open(caminho_arquivo, 'rb') as f:
+@dataclass
+class MetricasExecucao:
+    """
+    Medidas de uma execução do carregador ou do conversor.
+
+    Attributes:
+        operacao (str): 'carregar_csv', 'carregar_csv_em_blocos' ou 'converter_notebook'.
+        caminho (str): Arquivo de entrada.
+        fases (dict): Nome da fase -> duração em segundos. No carregador:
+                      'leitura_amostra', 'deteccao_codificacao',
+                      'deteccao_delimitador' e 'leitura_csv' (mais
+                      'amostra_tipos', 'filtro' e 'cache_colunar', quando usados). No
+                      conversor: 'leitura_notebook', 'transformacao' e 'escrita'.
+        bytes_processados (int): Bytes do arquivo efetivamente lidos.
+        linhas (int): Linhas do DataFrame ou do script gerado.
+        codificacao, confianca, delimitador, motor: Resultado da detecção e
+                      motor de leitura usado (apenas no carregador).
+        erro (str, optional): Descrição do erro, se a execução falhou.
+    """
+    operacao: str
+    caminho: str
+    fases: dict[str, float] = field(default_factory=dict)
+    bytes_processados: int = 0
+    linhas: int = 0
+    codificacao: str | None = None
+    confianca: float | None = None
+    delimitador: str | None = None
+    motor: str | None = None
+    erro: str | None = None
+
+    @property
+    def tempo_total(self) -> float:
+        return sum(self.fases.values())
+
+    def como_dict(self) -> dict:
+        dados = asdict(self)
+        dados['tempo_total'] = self.tempo_total
+        return dados
+
+
+class _Relator:
+    """
+    Concentra a saída de uma execução: as mensagens para o usuário (que o
+    modo silencioso desliga), os eventos de `logging`, as métricas por fase
+    e as chamadas ao callback `ao_registrar(evento, dados)`.
+    """
+
+    def __init__(self, operacao: str, caminho: str, silencioso: bool = False,
+                 ao_registrar: Callable[[str, dict], None] | None = None):
+        self.metricas = MetricasExecucao(operacao, caminho)
+        self.silencioso = silencioso
+        self.ao_registrar = ao_registrar
+
+    def mensagem(self, texto: str):
+        if not self.silencioso:
+            print(texto)
+
+    def aviso(self, texto: str):
+        self.mensagem(texto)
+        logger.warning("%s '%s': %s", self.metricas.operacao, self.metricas.caminho, texto)
+
+    def _notificar(self, evento: str, **dados):
+        if self.ao_registrar is not None:
+            self.ao_registrar(evento, {'operacao': self.metricas.operacao,
+                                       'caminho': self.metricas.caminho, **dados})
+
+    @contextlib.contextmanager
+    def fase(self, nome: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracao = time.perf_counter() - inicio
+            self.metricas.fases[nome] = self.metricas.fases.get(nome, 0.0) + duracao
+            logger.debug("%s '%s': fase '%s' levou %.4f s",
+                         self.metricas.operacao, self.metricas.caminho, nome, duracao)
+            self._notificar('fase', fase=nome, duracao=duracao)
+
+    def concluir(self):
+        m = self.metricas
+        logger.info("%s '%s': concluído em %.4f s (%d bytes, %d linhas)",
+                    m.operacao, m.caminho, m.tempo_total, m.bytes_processados, m.linhas)
+        self._notificar('concluido', metricas=m.como_dict())
+
+    def falhar(self, erro: Exception):
+        self.metricas.erro = f"{type(erro).__name__}: {erro}"
+        logger.error("%s '%s': %s", self.metricas.operacao, self.metricas.caminho, self.metricas.erro)
+        self._notificar('erro', erro=self.metricas.erro)
+
+# ==============================================================================
+# AUXILIARES: SELEÇÃO DO MOTOR DE LEITURA
+# ==============================================================================
+def _motores_candidatos(delimitador: str, motor: str | None = None) -> list[str]:
+    """
+    Define a ordem de motores a tentar na leitura do arquivo.
+
+    Sem um motor explícito, usa o 'pyarrow' (se instalado), depois o 'c' e,
+    por último, o 'python'. Os dois primeiros só aceitam delimitadores de um
+    único caractere, que é o caso de tudo o que o csv.Sniffer detecta.
+    """
+    if motor is not None:
+        if motor not in MOTORES_CSV:
+            raise ValueError(f"Motor desconhecido: '{motor}'. Opções: {', '.join(MOTORES_CSV)}")
+        return [motor]
+
+    candidatos = []
+    if len(delimitador) == 1:
+        if importlib.util.find_spec('pyarrow') is not None:
+            candidatos.append('pyarrow')
+        candidatos.append('c')
+    candidatos.append('python')
+    return candidatos
+
+
+def _motores_sem_pyarrow(motores: list[str]) -> list[str]:
+    """
+    Remove o 'pyarrow' da lista de motores, para leituras que ele não aceita
+    (`nrows`, `chunksize`, `usecols` junto com `names`). Se só ele restava,
+    usa o 'c' e o 'python'.
+    """
+    return [m for m in motores if m != 'pyarrow'] or ['c', 'python']
+
+
+def _ler_cabecalho(caminho_arquivo: str, motores: list[str], relator: _Relator | None = None,
+                   **opcoes_leitura) -> pd.DataFrame:
+    """Lê só o cabeçalho do arquivo, devolvendo um DataFrame vazio com as colunas."""
+    df, _ = _ler_csv_com_fallback(caminho_arquivo, _motores_sem_pyarrow(motores), relator, nrows=0,
+                                  **opcoes_leitura)
+    return df
+
+
+def _colunas_texto(amostra: pd.DataFrame, opcoes_leitura: dict) -> dict:
+    """
+    Mapeia para 'str' as colunas que os motores 'c'/'python' leram como texto
+    na amostra e que ainda não têm tipo definido nas opções de leitura.
+    """
+    import pandas as pd
+
+    definidas = set(opcoes_leitura.get('dtype') or {}) | set(opcoes_leitura.get('parse_dates') or [])
+    return {
+        coluna: 'str' for coluna, tipo in amostra.dtypes.items()
+        if coluna not in definidas
+        and not (pd.api.types.is_numeric_dtype(tipo) or pd.api.types.is_bool_dtype(tipo)
+                 or pd.api.types.is_datetime64_any_dtype(tipo))
+    }
+
+
+def _fixar_colunas_texto(caminho_arquivo: str, motores: list[str], relator: _Relator | None,
+                         opcoes_leitura: dict, amostra: pd.DataFrame | None = None,
+                         em_blocos: bool = False) -> dict:
+    """
+    Devolve as opções de leitura com as colunas de texto fixadas como 'str',
+    para que o 'pyarrow' (veja `_ler_com_pyarrow`) e a leitura em blocos, que
+    infere os tipos bloco a bloco, cheguem aos mesmos tipos de uma leitura
+    inteira pelo 'c'. Sem o 'pyarrow' na lista e fora da leitura em blocos,
+    as opções voltam como estão.
+
+    Args:
+        amostra (pd.DataFrame, optional): Amostra já lida pelos motores
+                                          'c'/'python'. Sem ela, as primeiras
+                                          `LINHAS_AMOSTRA_TEXTO` linhas são lidas.
+        em_blocos (bool): Se True, fixa as colunas mesmo sem o 'pyarrow'.
+    """
+    if 'pyarrow' not in motores and not em_blocos:
+        return opcoes_leitura
+    if amostra is None:
+        amostra, _ = _ler_csv_com_fallback(caminho_arquivo, _motores_sem_pyarrow(motores), relator,
+                                           nrows=LINHAS_AMOSTRA_TEXTO, **opcoes_leitura)
+    texto = _colunas_texto(amostra, opcoes_leitura)
+    if not texto:
+        return opcoes_leitura
+    return {**opcoes_leitura, 'dtype': {**texto, **(opcoes_leitura.get('dtype') or {})}}
+
+
+def _ler_com_pyarrow(caminho_arquivo: str, **opcoes_leitura) -> pd.DataFrame:
+    """
+    Lê com o motor 'pyarrow', mantendo os tipos que o 'c' e o 'python' dariam.
+
+    O 'pyarrow' converte por conta própria textos com cara de data ou hora
+    ('2025-08-17T11:20:05Z' vira datetime64 com fuso, '2025-08-17' vira
+    `datetime.date`). Aqui a inferência de data/hora é desligada e as colunas
+    marcadas como 'str' em `dtype` que o 'pyarrow' não leu como texto voltam
+    a sê-lo: datas 'AAAA-MM-DD' voltam idênticas ao arquivo; qualquer outra
+    conversão (como '12:30' lido como hora) gera um ValueError, para que o
+    próximo motor assuma a leitura. A volta para texto é feita pelo próprio
+    Arrow, sem passar valor a valor pelo Python.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    tipos = dict(opcoes_leitura.pop('dtype', None) or {})
+    texto = [coluna for coluna, tipo in tipos.items() if tipo == 'str']
+    for coluna in texto:
+        del tipos[coluna]
+    if not opcoes_leitura.get('parse_dates'):
+        opcoes_leitura['date_format'] = FORMATO_DATA_NENHUM
+    df = pd.read_csv(caminho_arquivo, engine='pyarrow', dtype=tipos or None, **opcoes_leitura)
+    for coluna in texto:
+        if coluna not in df.columns or isinstance(df[coluna].dtype, pd.StringDtype):
+            continue
+        valores = pa.array(df[coluna], from_pandas=True)
+        if not (pa.types.is_date32(valores.type) or pa.types.is_string(valores.type)
+                or valores.null_count == len(valores)):
+            raise ValueError(f"o 'pyarrow' leu a coluna de texto '{coluna}' como '{valores.type}'")
+        df[coluna] = valores.cast(pa.string()).to_pandas().set_axis(df.index)
+    return df
+
+
+def _ler_csv_com_fallback(caminho_arquivo: str, motores: list[str], relator: _Relator | None = None,
+                          **opcoes_leitura) -> tuple[pd.DataFrame, str]:
+    """
+    Tenta ler o arquivo com cada motor da lista, na ordem, e devolve o
+    DataFrame junto com o nome do motor que conseguiu fazer a leitura.
+    """
+    import pandas as pd
+
+    relator = relator or _Relator('ler_csv', caminho_arquivo)
+    ultimo_erro = None
+    for motor in motores:
+        if hasattr(caminho_arquivo, 'seek'):
+            # Um buffer em memória precisa voltar ao início após a tentativa anterior
+            caminho_arquivo.seek(0)
+        try:
+            if motor == 'pyarrow':
+                return _ler_com_pyarrow(caminho_arquivo, **opcoes_leitura), motor
+            return pd.read_csv(caminho_arquivo, engine=motor, **opcoes_leitura), motor
+        except ValueError as e:
+            # ParserError, UnicodeDecodeError e ArrowInvalid herdam de ValueError
+            ultimo_erro = e
+            relator.aviso(f"⚠️  Aviso: O motor '{motor}' não conseguiu ler o arquivo ({e}).")
+    raise ultimo_erro
+
+# ==============================================================================
+# AUXILIARES: CACHE DA DETECÇÃO
+# ==============================================================================
+class CacheDeteccao:
+    """
+    Cache LRU, em memória e em disco, dos resultados da detecção de formato.
+
+    Cada entrada é indexada pelo caminho absoluto do arquivo e guarda a sua
+    identidade (tamanho, mtime e hash da amostra). Se o arquivo mudar, a
+    identidade deixa de bater e a entrada é descartada na próxima consulta.
+    """
+
+    def __init__(self, caminho_disco: str | None = None, max_entradas: int = 512):
+        if caminho_disco is None:
+            pasta = os.environ.get(
+                'FERRAMENTAS_ANALISTA_CACHE',
+                os.path.join(os.path.expanduser('~'), '.cache', 'ferramentas_analista')
+            )
+            caminho_disco = os.path.join(pasta, 'deteccao.json')
+        self.caminho_disco = caminho_disco
+        self.max_entradas = max_entradas
+        self._entradas: OrderedDict[str, dict] | None = None
+
+    def _carregar(self) -> OrderedDict:
+        if self._entradas is None:
+            self._entradas = OrderedDict()
+            try:
+                with open(self.caminho_disco, 'r', encoding='utf-8') as f:
+                    self._entradas.update(json.load(f))
+            except (OSError, ValueError):
+                # Cache ausente ou corrompido: começa vazio
+                pass
+        return self._entradas
+
+    def _salvar(self, chave: str, entrada: dict):
+        """
+        Grava uma entrada no disco. O arquivo é lido de novo logo antes, para
+        não apagar as entradas gravadas por outros processos desde a última
+        leitura, e trocado de uma vez (os.replace), para que ninguém leia um
+        arquivo pela metade.
+        """
+        entradas = OrderedDict()
+        with contextlib.suppress(OSError, ValueError):
+            with open(self.caminho_disco, 'r', encoding='utf-8') as f:
+                entradas.update(json.load(f))
+        entradas.pop(chave, None)
+        entradas[chave] = entrada
+        while len(entradas) > self.max_entradas:
+            entradas.popitem(last=False)
+        try:
+            os.makedirs(os.path.dirname(self.caminho_disco), exist_ok=True)
+            temporario = f"{self.caminho_disco}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump(entradas, f)
+            os.replace(temporario, self.caminho_disco)
+        except OSError as e:
+            logger.warning("Não foi possível gravar o cache de detecção em '%s': %s", self.caminho_disco, e)
+            return
+        self._entradas = entradas
+
+    def obter(self, caminho_arquivo: str, identidade: list) -> dict | None:
+        entradas = self._carregar()
+        chave = os.path.abspath(caminho_arquivo)
+        entrada = entradas.get(chave)
+        if entrada is None:
+            return None
+        if entrada['identidade'] != identidade:
+            del entradas[chave]
+            return None
+        entradas.move_to_end(chave)
+        return entrada['resultado']
+
+    def guardar(self, caminho_arquivo: str, identidade: list, resultado: dict):
+        entradas = self._carregar()
+        chave = os.path.abspath(caminho_arquivo)
+        entradas[chave] = {'identidade': identidade, 'resultado': resultado}
+        entradas.move_to_end(chave)
+        while len(entradas) > self.max_entradas:
+            entradas.popitem(last=False)
+        self._salvar(chave, entradas[chave])
+
+    def completar(self, caminho_arquivo: str, identidade: list, campos: dict):
+        """Acrescenta `campos` ao resultado guardado, se a entrada ainda for do mesmo arquivo."""
+        entradas = self._carregar()
+        chave = os.path.abspath(caminho_arquivo)
+        entrada = entradas.get(chave)
+        if entrada is None or entrada['identidade'] != identidade:
+            return
+        entrada['resultado'].update(campos)
+        self._salvar(chave, entrada)
+
+    def limpar(self):
+        self._entradas = OrderedDict()
+        try:
+            os.remove(self.caminho_disco)
+        except FileNotFoundError:
+            pass
+
+    def info(self) -> dict:
+        entradas = self._carregar()
+        return {
+            'caminho_disco': self.caminho_disco,
+            'max_entradas': self.max_entradas,
+            'total_entradas': len(entradas),
+            'arquivos': {caminho: entrada['resultado'] for caminho, entrada in entradas.items()},
+        }
+
+
+_cache_deteccao = CacheDeteccao()
+
+
+def info_cache_deteccao() -> dict:
+    """Retorna o conteúdo e a configuração do cache de detecção."""
+    return _cache_deteccao.info()
+
+
+def limpar_cache_deteccao():
+    """Apaga todas as entradas do cache de detecção, em memória e em disco."""
+    _cache_deteccao.limpar()
+
+# ==============================================================================
+# AUXILIARES: CACHE COLUNAR (PARQUET/FEATHER)
+# ==============================================================================
+FORMATOS_CACHE_COLUNAR = ('parquet', 'feather')
+# Chave, nos metadados do esquema Arrow, dos `attrs` e dos tipos originais do DataFrame
+CHAVE_METADADOS_CACHE = b'ferramentas_analista'
+
+
+class CacheColunar:
+    """
+    Guarda cópias colunares (Parquet ou Feather) dos DataFrames já carregados,
+    para que leituras seguintes do mesmo arquivo pulem a detecção e o parsing.
+
+    O nome de cada cópia combina um hash do caminho do arquivo de origem, um
+    hash das opções de leitura (a variante) e um hash da identidade da origem
+    (tamanho e mtime). Quando a origem muda, a cópia antiga da mesma variante
+    e do mesmo formato deixa de ser encontrada e é apagada na próxima
+    gravação; as de outras variantes continuam valendo. Se a pasta passar de
+    `limite_bytes`, as cópias usadas há mais tempo são removidas primeiro.
+
+    Os `attrs` do DataFrame e os tipos das colunas vão junto, nos metadados do
+    arquivo, para que uma leitura do cache devolva o mesmo DataFrame que a
+    leitura do CSV (o Parquet, por exemplo, guarda datetime64[s] como [ms]).
+    """
+
+    def __init__(self, pasta: str | None = None, limite_bytes: int = 5 * 1024 ** 3):
+        if pasta is None:
+            pasta = os.path.join(
+                os.environ.get(
+                    'FERRAMENTAS_ANALISTA_CACHE',
+                    os.path.join(os.path.expanduser('~'), '.cache', 'ferramentas_analista')
+                ),
+                'colunar'
+            )
+        self.pasta = pasta
+        self.limite_bytes = limite_bytes
+
+    def _caminho(self, caminho_arquivo: str, formato: str, variante: dict) -> tuple[str, str]:
+        estado = os.stat(caminho_arquivo)
+        hash_caminho = hashlib.sha1(os.path.abspath(caminho_arquivo).encode('utf-8')).hexdigest()[:16]
+        hash_variante = hashlib.sha1(json.dumps(variante, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        identidade = json.dumps([estado.st_size, estado.st_mtime_ns])
+        hash_identidade = hashlib.sha1(identidade.encode('utf-8')).hexdigest()[:16]
+        prefixo = f"{hash_caminho}-{hash_variante}"
+        return prefixo, os.path.join(self.pasta, f"{prefixo}-{hash_identidade}.{formato}")
+
+    def ler(self, caminho_arquivo: str, formato: str, variante: dict) -> pd.DataFrame | None:
+        import pandas as pd
+
+        _, caminho_cache = self._caminho(caminho_arquivo, formato, variante)
+        if not os.path.exists(caminho_cache):
+            return None
+        if formato == 'parquet':
+            import pyarrow.parquet
+
+            metadados = pyarrow.parquet.read_schema(caminho_cache, memory_map=True).metadata
+            df = pd.read_parquet(caminho_cache, memory_map=True)
+        else:
+            import pyarrow.feather
+
+            tabela = pyarrow.feather.read_table(caminho_cache, memory_map=True)
+            metadados = tabela.schema.metadata
+            df = tabela.to_pandas()
+        extras = json.loads((metadados or {}).get(CHAVE_METADADOS_CACHE, b'{}'))
+        for coluna, tipo in extras.get('tipos', {}).items():
+            if str(df[coluna].dtype) != tipo:
+                df[coluna] = df[coluna].astype(tipo)
+        df.attrs.update(extras.get('attrs', {}))
+        # Marca a cópia como usada recentemente, para a política de remoção
+        os.utime(caminho_cache)
+        df.attrs['cache_colunar'] = caminho_cache
+        return df
+
+    def gravar(self, caminho_arquivo: str, formato: str, variante: dict, df: pd.DataFrame):
+        import pyarrow as pa
+
+        prefixo, caminho_cache = self._caminho(caminho_arquivo, formato, variante)
+        os.makedirs(self.pasta, exist_ok=True)
+        temporario = f"{caminho_cache}.{os.getpid()}.tmp"
+        tabela = pa.Table.from_pandas(df, preserve_index=False)
+        extras = {
+            'attrs': {chave: valor for chave, valor in df.attrs.items() if chave != 'cache_colunar'},
+            'tipos': {str(coluna): str(tipo) for coluna, tipo in df.dtypes.items()},
+        }
+        tabela = tabela.replace_schema_metadata({
+            **(tabela.schema.metadata or {}), CHAVE_METADADOS_CACHE: json.dumps(extras).encode('utf-8')
+        })
+        if formato == 'parquet':
+            import pyarrow.parquet
+
+            pyarrow.parquet.write_table(tabela, temporario)
+        else:
+            import pyarrow.feather
+
+            # Sem compressão, para que a leitura possa mapear o arquivo na memória
+            pyarrow.feather.write_feather(tabela, temporario, compression='uncompressed')
+        os.replace(temporario, caminho_cache)
+
+        # Remove as cópias da mesma variante e formato feitas de versões anteriores do arquivo
+        for nome in os.listdir(self.pasta):
+            caminho = os.path.join(self.pasta, nome)
+            if nome.startswith(prefixo + '-') and nome.endswith('.' + formato) and caminho != caminho_cache:
+                os.remove(caminho)
+        self._aplicar_limite()
+
+    def _aplicar_limite(self):
+        copias = []
+        for entrada in os.scandir(self.pasta):
+            if entrada.is_file() and entrada.name.endswith(FORMATOS_CACHE_COLUNAR):
+                estado = entrada.stat()
+                copias.append((estado.st_mtime, estado.st_size, entrada.path))
+        total = sum(tamanho for _, tamanho, _ in copias)
+        for _, tamanho, caminho in sorted(copias):
+            if total <= self.limite_bytes:
+                break
+            os.remove(caminho)
+            total -= tamanho
+
+    def limpar(self):
+        if os.path.isdir(self.pasta):
+            for entrada in os.scandir(self.pasta):
+                if entrada.is_file():
+                    os.remove(entrada.path)
+
+    def info(self) -> dict:
+        copias = []
+        if os.path.isdir(self.pasta):
+            copias = [e for e in os.scandir(self.pasta) if e.is_file() and e.name.endswith(FORMATOS_CACHE_COLUNAR)]
+        return {
+            'pasta': self.pasta,
+            'limite_bytes': self.limite_bytes,
+            'total_copias': len(copias),
+            'total_bytes': sum(e.stat().st_size for e in copias),
+        }
+
+
+_cache_colunar = CacheColunar()
+
+
+def configurar_cache_colunar(pasta: str | None = None, limite_bytes: int | None = None):
+    """Altera a pasta e/ou o limite de tamanho do cache colunar."""
+    if pasta is not None:
+        _cache_colunar.pasta = pasta
+    if limite_bytes is not None:
+        _cache_colunar.limite_bytes = limite_bytes
+        if os.path.isdir(_cache_colunar.pasta):
+            _cache_colunar._aplicar_limite()
+
+
+def info_cache_colunar() -> dict:
+    """Retorna a pasta, o limite e a ocupação atual do cache colunar."""
+    return _cache_colunar.info()
+
+
+def limpar_cache_colunar():
+    """Apaga todas as cópias colunares guardadas."""
+    _cache_colunar.limpar()
+
+# ==============================================================================
+# AUXILIARES: ARQUIVOS COMPRIMIDOS
+# ==============================================================================
+# Assinaturas (magic bytes) dos formatos de compressão, com o nome usado pelo
+# parâmetro `compression` do pandas. A extensão do arquivo não é considerada.
+ASSINATURAS_COMPRESSAO = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+    (b'PK\x03\x04', 'zip'),
+)
+
+
+def _compressao_por_assinatura(cabeca: bytes) -> str | None:
+    """Nome da compressão indicada pelos primeiros bytes do arquivo, ou None."""
+    for assinatura, nome in ASSINATURAS_COMPRESSAO:
+        if cabeca.startswith(assinatura):
+            return nome
+    return None
+
+
+def _abrir_descomprimido(caminho_arquivo: str, compressao: str):
+    """
+    Abre o arquivo comprimido como um fluxo binário já descomprimido. Nada é
+    gravado em disco: os bytes são descomprimidos à medida que são lidos.
+    """
+    if compressao == 'gzip':
+        import gzip
+        return gzip.open(caminho_arquivo, 'rb')
+    if compressao == 'bz2':
+        import bz2
+        return bz2.open(caminho_arquivo, 'rb')
+    if compressao == 'xz':
+        import lzma
+        return lzma.open(caminho_arquivo, 'rb')
+    if compressao == 'zstd':
+        if importlib.util.find_spec('zstandard') is None:
+            raise ImportError("Arquivos .zst requerem o pacote 'zstandard' (pip install zstandard).")
+        import zstandard
+        return zstandard.ZstdDecompressor().stream_reader(open(caminho_arquivo, 'rb'), closefd=True)
+    if compressao == 'zip':
+        import zipfile
+        with zipfile.ZipFile(caminho_arquivo) as arquivo_zip:
+            membros = [m for m in arquivo_zip.infolist() if not m.is_dir()]
+            # Mesma regra do pandas, que só lê arquivos .zip com um único arquivo
+            if len(membros) != 1:
+                raise ValueError(f"O arquivo .zip deve conter um único arquivo; '{caminho_arquivo}' "
+                                 f"contém {len(membros)}.")
+            # O membro aberto mantém o .zip aberto até ser fechado
+            return arquivo_zip.open(membros[0])
+    raise ValueError(f"Compressão desconhecida: '{compressao}'")
+
+
+def _ler_cabeca_descomprimida(caminho_arquivo: str, compressao: str, amostra_bytes: int) -> bytes:
+    """
+    Descomprime só o início do arquivo. A amostra é cortada na última quebra
+    de linha, para não terminar no meio de um caractere ou de uma linha.
+    """
+    with _abrir_descomprimido(caminho_arquivo, compressao) as f:
+        cabeca = f.read(amostra_bytes)
+        if len(cabeca) == amostra_bytes and f.read(1):
+            ultima_quebra = cabeca.rfind(b'\n')
+            if ultima_quebra > 0:
+                cabeca = cabeca[:ultima_quebra + 1]
+    return cabeca
+
+# ==============================================================================
+# AUXILIARES: DETECÇÃO DE CODIFICAÇÃO E DELIMITADOR
+# ==============================================================================
+# Marcas de ordem de bytes (BOM). As de UTF-32 vêm antes porque a BOM do
+# UTF-32 LE começa com a BOM do UTF-16 LE.
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def _ler_amostras(f, tamanho_arquivo: int, amostra_bytes: int) -> list[bytes]:
+    """
+    Lê amostras do início, do meio e do fim do arquivo, pulando com `seek`.
+    Arquivos de até três amostras são lidos inteiros, como uma única amostra.
+    O custo não depende do tamanho do arquivo.
+    """
+    if tamanho_arquivo <= 3 * amostra_bytes:
+        f.seek(0)
+        return [f.read()]
+    amostras = []
+    for posicao in (0, (tamanho_arquivo - amostra_bytes) // 2, tamanho_arquivo - amostra_bytes):
+        f.seek(posicao)
+        amostras.append(f.read(amostra_bytes))
+    return amostras
+
+
+def _utf8_valido(amostras: list[bytes]) -> bool:
+    """
+    Valida as amostras como UTF-8 estrito. As amostras do meio e do fim podem
+    começar no meio de um caractere (bytes de continuação, 0x80-0xBF), e as
+    do início e do meio podem terminar no meio de um; esses cortes são
+    tolerados.
+    """
+    for indice, amostra in enumerate(amostras):
+        if indice > 0:
+            inicio = 0
+            while inicio < 3 and inicio < len(amostra) and 0x80 <= amostra[inicio] <= 0xBF:
+                inicio += 1
+            amostra = amostra[inicio:]
+        ultima = indice == len(amostras) - 1
+        try:
+            codecs.getincrementaldecoder('utf-8')('strict').decode(amostra, final=ultima)
+        except UnicodeDecodeError:
+            return False
+    return True
+
+
+def _detector_estatistico():
+    """Retorna a função de detecção estatística mais rápida instalada."""
+    if importlib.util.find_spec('cchardet') is not None:
+        import cchardet
+        return 'cchardet', cchardet.detect
+    import chardet
+    return 'chardet', chardet.detect
+
+
+def _detectar_codificacao(amostras: list[bytes]) -> tuple[str | None, float, str]:
+    """
+    Detecta a codificação em camadas, da mais barata para a mais cara:
+    BOM, validação UTF-8 estrita e, só se ambas falharem, detecção estatística
+    (cchardet, se instalado, ou chardet) sobre as amostras.
+
+    Returns:
+        tuple: (codificação ou None, confiança entre 0 e 1, método usado)
+    """
+    for bom, codificacao in BOMS:
+        if amostras[0].startswith(bom):
+            return codificacao, 1.0, 'BOM'
+
+    if _utf8_valido(amostras):
+        return 'utf-8', 1.0, 'validação UTF-8'
+
+    # Concentra a detecção nas linhas com bytes não ASCII, que são as que
+    # distinguem uma codificação de outra; o resto só dilui o sinal.
+    linhas_relevantes = [
+        linha for amostra in amostras for linha in amostra.split(b'\n')
+        if not linha.isascii()
+    ]
+    nome_detector, detectar = _detector_estatistico()
+    resultado = detectar(b'\n'.join(linhas_relevantes))
+    if resultado['encoding'] is None:
+        # Não é UTF-8 e o detector não decidiu: o Latin-1 decodifica qualquer byte
+        return 'ISO-8859-1', 0.0, f"{nome_detector} (padrão)"
+    return resultado['encoding'], resultado['confidence'] or 0.0, nome_detector
+
+
+def _detectar_formato(caminho_arquivo: str, amostra_bytes: int, usar_cache: bool = True,
+                      relator: _Relator | None = None) -> dict:
+    """
+    Lê amostras do arquivo e detecta sua codificação e delimitador.
+
+    A codificação é avaliada em amostras do início, do meio e do fim do
+    arquivo; o delimitador, na amostra do início. Arquivos
+    comprimidos (gzip, bz2, xz, zstd, zip) são reconhecidos pelos primeiros
+    bytes, e só o início descomprimido é usado na detecção.
+
+    Com `usar_cache`, o resultado é buscado (e depois guardado) no cache de
+    detecção, evitando repetir a detecção para um arquivo que não mudou.
+
+    Returns:
+        dict: Com as chaves 'codificacao', 'confianca', 'metodo_codificacao',
+              'delimitador', 'bytes_por_linha' (média
+              estimada a partir da amostra) e 'compressao' (None, ou o nome
+              da compressão reconhecida pelos primeiros bytes do arquivo).
+              Vindo do cache, pode ter também 'tem_cabecalho' (veja
+              `_detectar_cabecalho`).
+    """
+    relator = relator or _Relator('detectar_formato', caminho_arquivo)
+    with open(caminho_arquivo, 'rb') as f:
+        with relator.fase('leitura_amostra'):
             raw_data = f.read(amostra_bytes)
-            resultado_chardet = chardet.detect(raw_data)
-            codificacao_detectada = resultado_chardet['encoding']
-            
-            if codificacao_detectada is None:
-                print("⚠️  Aviso: Não foi possível detectar a codificação. Usando 'utf-8'.")
-                codificacao_detectada = 'utf-8'
+            estado = os.fstat(f.fileno())
+            identidade = _identidade_deteccao(estado, raw_data)
+
+        if usar_cache:
+            resultado = _cache_deteccao.obter(caminho_arquivo, identidade)
+            if resultado is not None:
+                if resultado.get('compressao'):
+                    relator.mensagem(f"✅ Compressão Detectada: '{resultado['compressao']}' (do cache)")
+                relator.mensagem(f"✅ Codificação Detectada: '{resultado['codificacao']}' (do cache)")
+                relator.mensagem(f"✅ Delimitador Detectado: '{resultado['delimitador']}' (do cache)")
+                _registrar_deteccao(relator, resultado)
+                return resultado
+
+        with relator.fase('leitura_amostra'):
+            # Arquivos comprimidos não permitem pular para o meio: a detecção
+            # usa só o início, descomprimido em memória
+            compressao = _compressao_por_assinatura(raw_data)
+            if compressao is None:
+                amostras = _ler_amostras(f, estado.st_size, amostra_bytes)
             else:
-                confianca = resultado_chardet['confidence'] * 100
-                print(f"✅ Codificação Detectada: '{codificacao_detectada}' (Confiança: {confianca:.2f}%)")
+                raw_data = _ler_cabeca_descomprimida(caminho_arquivo, compressao, amostra_bytes)
+                amostras = [raw_data]
+    if compressao is not None:
+        relator.mensagem(f"✅ Compressão Detectada: '{compressao}'")
+
+    with relator.fase('deteccao_codificacao'):
+        codificacao_detectada, confianca, metodo = _detectar_codificacao(amostras)
+
+    if codificacao_detectada is None:
+        relator.aviso("⚠️  Aviso: Não foi possível detectar a codificação. Usando 'utf-8'.")
+        codificacao_detectada = 'utf-8'
+    else:
+        relator.mensagem(f"✅ Codificação Detectada: '{codificacao_detectada}' "
+                         f"(Confiança: {confianca * 100:.2f}%, método: {metodo})")
 
+    with relator.fase('deteccao_delimitador'):
         amostra_texto = raw_data.decode(codificacao_detectada, errors='ignore')
-        delimitador_detectado = ','
+        delimitador_detectado = None
         try:
-            dialect = csv.Sniffer().sniff(amostra_texto, delimiters=',;|\t')
-            delimitador_detectado = dialect.delimiter
-            print(f"✅ Delimitador Detectado: '{delimitador_detectado}'")
+            delimitador_detectado = csv.Sniffer().sniff(amostra_texto, delimiters=',;|\t').delimiter
         except csv.Error:
-            print("⚠️  Aviso: Não foi possível detectar o delimitador. Usando ',' (vírgula).")
+            pass
 
-        print("\n--- 🔄 Carregando o arquivo com os parâmetros detectados ---")
-        df = pd.read_csv(caminho_arquivo, sep=delimitador_detectado, encoding=codificacao_detectada, engine='python')
-        print("--- ✅ DataFrame carregado com sucesso! ---")
-        return df
+    if delimitador_detectado is None:
+        relator.aviso("⚠️  Aviso: Não foi possível detectar o delimitador. Usando ',' (vírgula).")
+        delimitador_detectado = ','
+    else:
+        relator.mensagem(f"✅ Delimitador Detectado: '{delimitador_detectado}'")
 
-    except FileNotFoundError:
-        print(f"❌ ERRO: O arquivo não foi encontrado em: '{caminho_arquivo}'")
-        return None
-    except Exception as e:
-        print(f"❌ ERRO: Ocorreu um problema inesperado: {e}")
-        return None
+    resultado = {
+        'codificacao': codificacao_detectada,
+        'confianca': confianca,
+        'metodo_codificacao': metodo,
+        'delimitador': delimitador_detectado,
+        'bytes_por_linha': len(raw_data) / max(raw_data.count(b'\n'), 1),
+        'compressao': compressao,
+    }
+    _registrar_deteccao(relator, resultado)
+    if usar_cache:
+        _cache_deteccao.guardar(caminho_arquivo, identidade, resultado)
+    return resultado
+
+
+def _identidade_deteccao(estado: os.stat_result, amostra: bytes) -> list:
+    """Identidade de um arquivo no cache de detecção: tamanho, mtime e hash da amostra inicial."""
+    return [estado.st_size, estado.st_mtime_ns, hashlib.sha1(amostra).hexdigest()]
+
+
+def _detectar_cabecalho(caminho_arquivo: str, formato: dict, amostra_bytes: int, usar_cache: bool = True) -> bool:
+    """
+    Indica se a primeira linha parece um cabeçalho (`csv.Sniffer.has_header`).
+
+    Os carregadores sempre leem a primeira linha como cabeçalho, então esta
+    verificação, que custa mais que a do delimitador, só é feita quando
+    pedida (no comando `detectar`). Com `usar_cache`, o resultado é guardado
+    na entrada do arquivo no cache de detecção, junto com a codificação e o
+    delimitador, e descartado com eles quando o arquivo muda.
+    """
+    if 'tem_cabecalho' in formato:
+        return formato['tem_cabecalho']
+    with open(caminho_arquivo, 'rb') as f:
+        amostra = f.read(amostra_bytes)
+        identidade = _identidade_deteccao(os.fstat(f.fileno()), amostra)
+    if formato.get('compressao'):
+        amostra = _ler_cabeca_descomprimida(caminho_arquivo, formato['compressao'], amostra_bytes)
+    try:
+        tem_cabecalho = csv.Sniffer().has_header(amostra.decode(formato['codificacao'], errors='ignore'))
+    except csv.Error:
+        tem_cabecalho = True
+    if usar_cache:
+        _cache_deteccao.completar(caminho_arquivo, identidade, {'tem_cabecalho': tem_cabecalho})
+    return tem_cabecalho
+
+
+def _registrar_deteccao(relator: _Relator, resultado: dict):
+    relator.metricas.codificacao = resultado['codificacao']
+    relator.metricas.confianca = resultado['confianca']
+    relator.metricas.delimitador = resultado['delimitador']
 
 # ==============================================================================
-# FUNÇÃO 2: CONVERSOR DE NOTEBOOK (Com detecção completa e relatório)
+# AUXILIARES: OTIMIZAÇÃO DE MEMÓRIA
 # ==============================================================================
-def converter_notebook_para_py(caminho_notebook: str, caminho_script_saida: str | None = None):
+# Tamanho aproximado dos blocos lidos quando há um filtro de linhas.
+BYTES_POR_BLOCO_FILTRO = 64 * 1024 ** 2
+
+# Colunas de texto com no máximo esta fração de valores distintos viram 'category'.
+LIMITE_CARDINALIDADE_CATEGORIA = 0.5
+
+
+def _formatar_bytes(n_bytes: float) -> str:
+    for unidade in ('B', 'KB', 'MB', 'GB'):
+        if abs(n_bytes) < 1024 or unidade == 'GB':
+            return f"{n_bytes:.1f} {unidade}"
+        n_bytes /= 1024
+
+
+def _planejar_tipos(amostra: pd.DataFrame) -> tuple[dict, list[str]]:
     """
-    Converte um notebook Jupyter (.ipynb) para um script Python (.py) limpo e compatível.
+    Decide, a partir de uma amostra lida com os tipos padrão, os tipos de
+    leitura das colunas de texto.
 
-    Identifica e neutraliza comandos específicos do Jupyter (mágicos, shell, display)
-    e gera um relatório final sobre as modificações realizadas.
+    Returns:
+        tuple: (dtypes para o `pd.read_csv`, colunas a serem lidas como datas)
     """
-    if not caminho_notebook.endswith('.ipynb'):
-        print("❌ ERRO: O arquivo de entrada deve ser um Jupyter Notebook (.ipynb)")
-        return
-    if caminho_script_saida is None:
-        caminho_script_saida = caminho_notebook.replace('.ipynb', '.py')
-    print(f"\n--- 🔄 Convertendo '{caminho_notebook}' para '{caminho_script_saida}' ---")
+    import pandas as pd
 
-    try:
-        with open(caminho_notebook, 'r', encoding='utf-8') as f:
-            notebook = nbformat.read(f, as_version=4)
+    arrow_disponivel = importlib.util.find_spec('pyarrow') is not None
+    dtypes, colunas_data = {}, []
+    for coluna in amostra.columns:
+        serie = amostra[coluna]
+        if pd.api.types.is_numeric_dtype(serie) or pd.api.types.is_bool_dtype(serie):
+            # Números são reduzidos depois da leitura, quando o intervalo real é conhecido
+            continue
+        valores = serie.dropna().astype(str)
+        if valores.empty:
+            continue
+        datas = pd.to_datetime(valores, format='ISO8601', errors='coerce')
+        if datas.notna().all():
+            colunas_data.append(coluna)
+        elif valores.nunique() <= len(valores) * LIMITE_CARDINALIDADE_CATEGORIA:
+            dtypes[coluna] = 'category'
+        elif arrow_disponivel:
+            dtypes[coluna] = pd.StringDtype('pyarrow')
+    return dtypes, colunas_data
 
-        script_python = [
-            "# -*- coding: utf-8 -*-",
-            '"""',
-            f"Script gerado automaticamente a partir de {caminho_notebook.split('/')[-1]}",
-            '"""',
-            ""
-        ]
-        
-        # Usamos um set para armazenar os comandos únicos encontrados
-        comandos_jupyter_encontrados = set()
 
-        for cell in notebook.cells:
-            if cell.cell_type == 'code':
-                codigo_limpo = []
-                linhas_codigo = cell.source.split('\n')
-                
-                for i, linha in enumerate(linhas_codigo):
-                    linha_strip = linha.strip()
-                    linha_processada = linha
-
-                    # Identifica todos os comandos, mas só processa uma vez por linha
-                    if 'display(' in linha:
-                        linha_processada = linha.replace('display(', 'print(', 1)
-                        if '#' not in linha_processada:
-                            linha_processada += " # Convertido de display() para print()"
-                        comandos_jupyter_encontrados.add('display()')
-                    
-                    elif linha_strip.startswith('%'):
-                        # Pega o comando específico (ex: %matplotlib, %%time)
-                        comando_magico = linha_strip.split(' ')[0]
-                        comandos_jupyter_encontrados.add(comando_magico)
-                        linha_processada = f"# {linha}"
-                    
-                    elif linha_strip.startswith('!'):
-                        # Pega o comando shell (ex: !pip)
-                        comando_shell = "!" + linha_strip[1:].split(' ')[0]
-                        comandos_jupyter_encontrados.add(comando_shell)
-                        linha_processada = f"# {linha}"
-                    
-                    codigo_limpo.append(linha_processada)
-                
-                script_python.extend(["\n# --- Célula de Código ---", *codigo_limpo, "\n"])
-
-            elif cell.cell_type == 'markdown':
-                script_python.append("#" + "="*78)
-                linhas_markdown = [f"# {linha}" for linha in cell.source.split('\n')]
-                script_python.extend(["# CÉLULA DE MARKDOWN", *linhas_markdown])
-                script_python.append("#" + "="*78 + "\n")
-
-        with open(caminho_script_saida, 'w', encoding='utf-8') as f:
-            f.write("\n".join(script_python))
-
-        print(f"--- ✅ Conversão concluída! Arquivo salvo em: '{caminho_script_saida}' ---")
-
-        # Gera o relatório final se algum comando foi encontrado
-        if comandos_jupyter_encontrados:
-            print("\n" + "="*50)
-            print("⚠️  RELATÓRIO DE COMPATIBILIDADE")
-            print("="*50)
-            print("Seu notebook continha comandos específicos do Jupyter que não")
-            print("funcionam em scripts .py. Eles foram tratados da seguinte forma:")
-            
-            # Ordena para uma exibição consistente
-            for cmd in sorted(list(comandos_jupyter_encontrados)):
-                if cmd == 'display()':
-                    print(f"   - [CONVERTIDO] '{cmd}': Substituído pela função 'print()'.")
+def _reduzir_numericos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte as colunas numéricas para o menor tipo que comporta os valores.
+    Floats só viram float32 quando isso não altera nenhum valor.
+    """
+    import pandas as pd
+
+    for coluna in df.columns:
+        serie = df[coluna]
+        if pd.api.types.is_bool_dtype(serie) or not pd.api.types.is_numeric_dtype(serie):
+            continue
+        if pd.api.types.is_integer_dtype(serie):
+            df[coluna] = pd.to_numeric(serie, downcast='integer')
+        elif pd.api.types.is_float_dtype(serie):
+            reduzida = serie.astype('float32')
+            if ((reduzida.astype(serie.dtype) == serie) | serie.isna()).all():
+                df[coluna] = reduzida
+    return df
+
+# ==============================================================================
+# AUXILIARES: LEITURA ENXUTA DE NOTEBOOKS
+# ==============================================================================
+class _LeitorNotebook:
+    """
+    Leitor de JSON em fluxo, só com o necessário para extrair o tipo e o código
+    de cada célula de um notebook.
+
+    O arquivo é mapeado na memória e percorrido com expressões regulares: os
+    valores que não interessam (saídas, metadados, anexos) são pulados sem
+    serem decodificados, então o custo acompanha o tamanho do código, e não o
+    das imagens em base64 guardadas nas saídas.
+    """
+    _ESPACOS = re.compile(rb'[ \t\n\r]*')
+    _ESTRUTURA = re.compile(rb'[^"\[\]{}]*')
+    _LITERAL = re.compile(rb'-?[0-9][0-9.eE+-]*|true|false|null')
+
+    def __init__(self, dados):
+        self.dados = dados
+        self.pos = 0
+
+    def _erro(self, esperado: str) -> ValueError:
+        return ValueError(f"JSON inválido na posição {self.pos}: esperado {esperado}")
+
+    def _proximo(self) -> int | None:
+        """Pula os espaços e retorna o próximo byte, sem consumi-lo."""
+        self.pos = self._ESPACOS.match(self.dados, self.pos).end()
+        return self.dados[self.pos] if self.pos < len(self.dados) else None
+
+    def _consumir(self, caractere: bytes):
+        if self._proximo() != caractere[0]:
+            raise self._erro(repr(caractere.decode()))
+        self.pos += 1
+
+    def _pular_string(self) -> int:
+        inicio = self.pos
+        if self.dados[inicio:inicio + 1] != b'"':
+            raise self._erro("uma string")
+        # find() percorre as strings longas (imagens em base64) na velocidade
+        # do memchr; só as aspas precedidas por barras exigem atenção
+        fim = self.dados.find(b'"', inicio + 1)
+        while fim != -1:
+            barras = 0
+            while self.dados[fim - 1 - barras] == ord('\\'):
+                barras += 1
+            if barras % 2 == 0:
+                self.pos = fim + 1
+                return inicio
+            fim = self.dados.find(b'"', fim + 1)
+        raise self._erro(f"o fim da string iniciada na posição {inicio}")
+
+    def _iterar(self, abre: bytes, fecha: bytes) -> Iterator[None]:
+        """Percorre um objeto ou lista; o chamador consome cada elemento."""
+        self._consumir(abre)
+        if self._proximo() == fecha[0]:
+            self.pos += 1
+            return
+        while True:
+            yield
+            proximo = self._proximo()
+            self.pos += 1
+            if proximo == fecha[0]:
+                return
+            if proximo != ord(','):
+                self.pos -= 1
+                raise self._erro(f"',' ou {fecha.decode()!r}")
+
+    def chaves(self) -> Iterator[str]:
+        """Percorre um objeto, entregando cada chave; o chamador consome o valor."""
+        for _ in self._iterar(b'{', b'}'):
+            self._proximo()
+            chave = self.valor_de(self._pular_string())
+            self._consumir(b':')
+            yield chave
+
+    def itens(self) -> Iterator[None]:
+        """Percorre uma lista; o chamador consome cada item."""
+        return self._iterar(b'[', b']')
+
+    def pular_valor(self) -> int:
+        """Pula um valor JSON qualquer e retorna a posição em que ele começa."""
+        primeiro = self._proximo()
+        inicio = self.pos
+        if primeiro == ord('"'):
+            self._pular_string()
+        elif primeiro in (ord('{'), ord('[')):
+            profundidade = 0
+            while True:
+                self.pos = self._ESTRUTURA.match(self.dados, self.pos).end()
+                if self.pos >= len(self.dados):
+                    raise self._erro(f"o fim do valor iniciado na posição {inicio}")
+                caractere = self.dados[self.pos]
+                if caractere == ord('"'):
+                    self._pular_string()
+                    continue
+                self.pos += 1
+                profundidade += 1 if caractere in (ord('{'), ord('[')) else -1
+                if profundidade == 0:
+                    break
+        else:
+            encontrado = self._LITERAL.match(self.dados, self.pos)
+            if encontrado is None:
+                raise self._erro("um valor")
+            self.pos = encontrado.end()
+        return inicio
+
+    def valor_de(self, inicio: int):
+        """Decodifica o valor entre `inicio` e a posição atual."""
+        return json.loads(self.dados[inicio:self.pos])
+
+    def valor(self):
+        return self.valor_de(self.pular_valor())
+
+    def fim(self):
+        if self._proximo() is not None:
+            raise self._erro("o fim do arquivo")
+
+
+def _ler_celulas_notebook(caminho_notebook: str) -> list[tuple[str, str]] | None:
+    """
+    Extrai (tipo, código) de cada célula sem carregar as saídas do notebook.
+
+    Retorna None se o notebook não estiver no formato 4, para que o chamador
+    recorra ao `nbformat`, que sabe converter as versões antigas.
+    """
+    with open(caminho_notebook, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Notebook '{caminho_notebook}' está vazio.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+            leitor = _LeitorNotebook(dados)
+            celulas, versao = [], None
+            for chave in leitor.chaves():
+                if chave == 'cells':
+                    celulas = []
+                    for _ in leitor.itens():
+                        tipo, codigo = None, ''
+                        for campo in leitor.chaves():
+                            if campo == 'cell_type':
+                                tipo = leitor.valor()
+                            elif campo == 'source':
+                                codigo = leitor.valor()
+                            else:
+                                leitor.pular_valor()
+                        if tipo is None:
+                            raise ValueError(f"Célula {len(celulas)} sem 'cell_type'.")
+                        # Como no nbformat, o código pode vir dividido em linhas
+                        if isinstance(codigo, list):
+                            codigo = ''.join(codigo)
+                        celulas.append((tipo, codigo))
+                elif chave == 'nbformat':
+                    versao = leitor.valor()
                 else:
-                    print(f"   - [COMENTADO]  '{cmd}': A linha de comando foi mantida, mas desativada com '#'.")
-            print("="*50)
+                    leitor.pular_valor()
+            leitor.fim()
+    return celulas if versao == 4 else None
 
-    except FileNotFoundError:
-        print(f"❌ ERRO: Notebook '{caminho_notebook}' não encontrado.")
-    except Exception as e:
-        print(f"❌ ERRO: Problema inesperado durante a conversão: {e}")
\ No newline at end of file
+# ==============================================================================
+# AUXILIARES: LEITURA PARALELA DE UM ÚNICO ARQUIVO
+# ==============================================================================
+# Abaixo deste tamanho, dividir o arquivo custa mais do que economiza.
+TAMANHO_MINIMO_PARALELO = 16 * 1024 ** 2
+# Blocos lidos de cada vez na contagem de aspas.
+BYTES_POR_CONTAGEM = 64 * 1024 ** 2
+# Pedaços por processo: pedaços menores equilibram melhor a carga entre eles.
+PEDACOS_POR_PROCESSO = 4
+
+
+def _codificacao_multibyte(codificacao: str | None) -> bool:
+    """Indica se, na codificação, o byte da quebra de linha pode fazer parte de outro caractere."""
+    return re.match(r'utf[-_]?(16|32)', codificacao or '', re.IGNORECASE) is not None
+
+
+def _exigir_acesso_por_bytes(formato: dict):
+    """Recusa arquivos em que não é possível ir direto a uma posição e encontrar as linhas pelos bytes."""
+    if formato.get('compressao'):
+        raise ValueError("Arquivos comprimidos não permitem acesso direto por posição; descomprima o arquivo")
+    if _codificacao_multibyte(formato['codificacao']):
+        raise ValueError(f"A codificação '{formato['codificacao']}' não permite localizar linhas por bytes")
+
+
+def _contar_aspas_mapeado(dados, inicio: int, fim: int) -> int:
+    """Conta as aspas entre `inicio` e `fim` de um arquivo mapeado na memória, em blocos."""
+    total = 0
+    for posicao in range(inicio, fim, BYTES_POR_CONTAGEM):
+        total += dados[posicao:min(posicao + BYTES_POR_CONTAGEM, fim)].count(b'"')
+    return total
+
+
+def _contar_aspas(caminho_arquivo: str, inicio: int, fim: int) -> int:
+    """Conta as aspas entre `inicio` e `fim` do arquivo (executado em um processo do pool)."""
+    with open(caminho_arquivo, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+        return _contar_aspas_mapeado(dados, inicio, fim)
+
+
+def _proximo_fim_de_registro(dados, posicao: int, dentro_de_aspas: bool) -> int:
+    """
+    Posição logo depois da primeira quebra de linha, a partir de `posicao`,
+    que não esteja dentro de um campo entre aspas. Aspas duplicadas ("")
+    somam duas e não alteram a paridade.
+    """
+    while True:
+        quebra = dados.find(b'\n', posicao)
+        if quebra == -1:
+            return len(dados)
+        dentro_de_aspas ^= dados[posicao:quebra].count(b'"') % 2 == 1
+        if not dentro_de_aspas:
+            return quebra + 1
+        posicao = quebra + 1
+
+
+def _dividir_em_registros(caminho_arquivo: str, n_pedacos: int, executor) -> list[tuple[int, int]]:
+    """
+    Divide o arquivo (sem o cabeçalho) em intervalos de bytes que começam e
+    terminam em limites de registro.
+
+    Os cortes nominais, em partes iguais, são ajustados para a próxima quebra
+    de linha fora de aspas. Para saber se um corte cai dentro de um campo
+    entre aspas, as aspas de cada parte são contadas em paralelo e a paridade
+    da soma acumulada indica o estado em cada corte.
+    """
+    with open(caminho_arquivo, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+        inicio_dados = _proximo_fim_de_registro(dados, 0, False)
+        tamanho = len(dados)
+        passo = max(1, (tamanho - inicio_dados) // n_pedacos)
+        cortes = list(range(inicio_dados, tamanho, passo))[:n_pedacos] + [tamanho]
+
+        contagens = list(executor.map(_contar_aspas, itertools.repeat(caminho_arquivo),
+                                      cortes[:-1], cortes[1:]))
+        limites, aspas_antes = [inicio_dados], 0
+        for corte, contagem in zip(cortes[1:-1], contagens):
+            aspas_antes += contagem
+            limite = _proximo_fim_de_registro(dados, corte, aspas_antes % 2 == 1)
+            # Um campo muito longo pode atravessar mais de um corte
+            limites.append(max(limite, limites[-1]))
+        limites.append(tamanho)
+    return [(a, b) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+
+
+def _ler_intervalo_csv(caminho_arquivo: str, inicio: int, fim: int, motores: list[str], nomes: list[str],
+                       filtro, colunas: list[str] | None, opcoes_leitura: dict) -> tuple[pd.DataFrame | None, str]:
+    """Lê um intervalo de bytes do arquivo, em um processo do pool, com os nomes do cabeçalho."""
+    with open(caminho_arquivo, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+        trecho = dados[inicio:fim]
+    if not trecho.strip():
+        return None, motores[0]
+    relator = _Relator('carregar_csv', caminho_arquivo, silencioso=True)
+    df, motor = _ler_csv_com_fallback(io.BytesIO(trecho), motores, relator, header=None, names=nomes,
+                                      **opcoes_leitura)
+    if filtro is not None:
+        df = _aplicar_filtro(df, filtro)
+    if colunas is not None:
+        df = df[colunas]
+    return df, motor
+
+
+def _leitura_paralela_viavel(caminho_arquivo: str, formato: dict, filtro, n_processos: int | None,
+                             relator: _Relator) -> bool:
+    """Decide se o arquivo pode ser dividido em intervalos de bytes e lido em paralelo."""
+    if n_processos is None or n_processos <= 1:
+        return False
+    if formato.get('compressao'):
+        relator.aviso("⚠️  Aviso: Arquivos comprimidos não podem ser divididos. Lendo em um só processo.")
+        return False
+    if _codificacao_multibyte(formato['codificacao']):
+        relator.aviso(f"⚠️  Aviso: A codificação '{formato['codificacao']}' não permite dividir o arquivo "
+                      "por bytes. Lendo em um só processo.")
+        return False
+    if filtro is not None and not isinstance(filtro, str):
+        relator.aviso("⚠️  Aviso: Filtros em forma de função não podem ser enviados aos processos. "
+                      "Lendo em um só processo.")
+        return False
+    return os.path.getsize(caminho_arquivo) >= TAMANHO_MINIMO_PARALELO
+
+
+def _ler_csv_paralelo(caminho_arquivo: str, motores: list[str], relator: _Relator, n_processos: int,
+                      filtro=None, colunas: list[str] | None = None, **opcoes_leitura) -> tuple[pd.DataFrame, str]:
+    """
+    Lê um único arquivo em `n_processos` processos, cada um com um intervalo
+    de registros, e junta os pedaços na ordem original.
+    """
+    import pandas as pd
+    from concurrent.futures import ProcessPoolExecutor
+
+    opcoes_leitura.pop('compression', None)
+    cabecalho = _ler_cabecalho(caminho_arquivo, motores, relator,
+                               sep=opcoes_leitura['sep'], encoding=opcoes_leitura['encoding'])
+    nomes = list(cabecalho.columns)
+    if 'usecols' in opcoes_leitura or filtro is not None:
+        # O 'pyarrow' não aceita `usecols` junto com `names`, e a leitura com
+        # filtro usa os mesmos motores da leitura em blocos
+        motores = _motores_sem_pyarrow(motores)
+
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        with relator.fase('divisao_arquivo'):
+            intervalos = _dividir_em_registros(caminho_arquivo, n_processos * PEDACOS_POR_PROCESSO, executor)
+        relator.mensagem(f"✅ Leitura paralela: {len(intervalos)} pedaços em {n_processos} processos")
+        with relator.fase('leitura_csv'):
+            futuros = [executor.submit(_ler_intervalo_csv, caminho_arquivo, inicio, fim, motores, nomes,
+                                       filtro, colunas, opcoes_leitura)
+                       for inicio, fim in intervalos]
+            resultados = [futuro.result() for futuro in futuros]
+
+            # Os tipos são inferidos em cada pedaço: se uma coluna foi lida como
+            # texto em algum deles, os pedaços que a leram como número ou data
+            # são relidos com a coluna como texto, como na leitura única
+            def _texto(tipo) -> bool:
+                return tipo == object or isinstance(tipo, pd.StringDtype)
+            colunas_texto = {coluna for df, _ in resultados if df is not None
+                             for coluna, tipo in df.dtypes.items() if _texto(tipo)}
+            releituras = {}
+            for i, (df, _) in enumerate(resultados):
+                divergentes = [] if df is None else [coluna for coluna in colunas_texto
+                                                     if not _texto(df[coluna].dtype)]
+                if divergentes:
+                    opcoes = dict(opcoes_leitura, dtype={**{c: 'str' for c in divergentes},
+                                                         **(opcoes_leitura.get('dtype') or {})})
+                    releituras[i] = executor.submit(_ler_intervalo_csv, caminho_arquivo, *intervalos[i],
+                                                    motores, nomes, filtro, colunas, opcoes)
+            for i, futuro in releituras.items():
+                resultados[i] = futuro.result()
+
+    with relator.fase('leitura_csv'):
+        partes = [df for df, _ in resultados if df is not None]
+        if partes:
+            df = pd.concat(partes, ignore_index=True)
+        else:
+            df = _ler_cabecalho(caminho_arquivo, motores, relator, **opcoes_leitura)
+            df = df[colunas] if colunas is not None else df
+        # Pedaços com categorias diferentes viram 'object' ao serem concatenados
+        for coluna, tipo in (opcoes_leitura.get('dtype') or {}).items():
+            if tipo == 'category' and coluna in df.columns:
+                df[coluna] = df[coluna].astype('category')
+    # O motor mais tolerante usado em algum pedaço
+    motores_usados = {motor for _, motor in resultados}
+    motor_usado = max(motores_usados, key=motores.index) if motores_usados else motores[0]
+    return df, motor_usado
+
+# ==============================================================================
+# FUNÇÃO 1: CARREGADOR INTELIGENTE DE DADOS
+# ==============================================================================
+def carregar_csv_inteligente(caminho_arquivo: str, amostra_bytes: int = 20000,
+                             motor: str | None = None, usar_cache: bool = True,
+                             otimizar_memoria: bool = False,
+                             cache_colunar: str | None = None,
+                             colunas: list[str] | None = None,
+                             filtro: str | Callable[[pd.DataFrame], pd.Series] | None = None,
+                             n_processos: int | None = None,
+                             silencioso: bool = False,
+                             ao_registrar: Callable[[str, dict], None] | None = None,
+                             retornar_metricas: bool = False):
+    """
+    Detecta a codificação e o delimitador de um arquivo CSV/texto e o carrega
+    em um DataFrame.
+
+    A leitura usa o motor mais rápido disponível ('pyarrow', depois 'c') e só
+    recorre ao motor 'python' se os anteriores falharem. O motor efetivamente
+    usado fica registrado em `df.attrs['motor_csv']`.
+
+    Args:
+        caminho_arquivo (str): Caminho do arquivo a ser carregado.
+        amostra_bytes (int): Bytes lidos do início do arquivo para a detecção.
+        motor (str, optional): Força um motor específico ('pyarrow', 'c' ou
+                               'python'), sem tentativas alternativas.
+        usar_cache (bool): Reaproveita a detecção guardada no cache para
+                           arquivos que não mudaram desde a última leitura.
+        otimizar_memoria (bool): Escolhe os tipos das colunas a partir de uma
+                                 amostra: texto repetitivo vira 'category',
+                                 texto livre vira string Arrow, datas ISO são
+                                 convertidas e números são reduzidos ao menor
+                                 tipo possível. O uso de memória antes e depois
+                                 fica em `df.attrs['memoria']`.
+        cache_colunar (str, optional): 'parquet' ou 'feather'. Guarda uma cópia
+                                       colunar do resultado e, nas próximas
+                                       leituras do arquivo sem alterações, lê
+                                       essa cópia (mapeada na memória) em vez
+                                       do CSV. Requer o pacote `pyarrow`.
+        colunas (list[str], optional): Colunas a serem lidas, na ordem desejada.
+                                       As demais nem chegam a ser convertidas
+                                       pelo parser.
+        filtro (str | callable, optional): Filtro de linhas aplicado durante a
+                                           leitura, bloco a bloco: uma expressão
+                                           do `DataFrame.query` (ex:
+                                           "Status_Code == 401") ou uma função
+                                           que recebe o bloco e devolve uma
+                                           máscara booleana. As colunas citadas
+                                           na expressão são lidas mesmo fora
+                                           de `colunas`; a função só recebe
+                                           as colunas de `colunas`.
+        n_processos (int, optional): Lê um único arquivo grande em vários
+                                     processos. O arquivo é mapeado na memória
+                                     e dividido em intervalos de bytes que
+                                     terminam em fins de registro (respeitando
+                                     campos entre aspas com quebras de linha),
+                                     e os pedaços são juntados na ordem
+                                     original. Arquivos comprimidos, em
+                                     UTF-16/32, pequenos ou com filtro em
+                                     forma de função são lidos em um só processo.
+        silencioso (bool): Desliga as mensagens impressas. Avisos e erros
+                           continuam sendo enviados ao `logging`.
+        ao_registrar (callable, optional): Função chamada como
+                                           `ao_registrar(evento, dados)` ao fim
+                                           de cada fase ('fase'), da execução
+                                           ('concluido') ou em caso de erro ('erro').
+        retornar_metricas (bool): Se True, retorna `(df, metricas)`, com um
+                                  `MetricasExecucao` da execução.
+
+    Returns:
+        pd.DataFrame | None: O DataFrame, ou None em caso de erro. Com
+                             `retornar_metricas=True`, a tupla `(df, metricas)`.
+    """
+    relator = _Relator('carregar_csv', caminho_arquivo, silencioso, ao_registrar)
+    relator.mensagem(f"--- 🚀 Iniciando Análise Automática de '{caminho_arquivo}' ---")
+    df = None
+    try:
+        df = _carregar_csv(caminho_arquivo, amostra_bytes=amostra_bytes, motor=motor,
+                           usar_cache=usar_cache, otimizar_memoria=otimizar_memoria,
+                           cache_colunar=cache_colunar, colunas=colunas, filtro=filtro,
+                           n_processos=n_processos, relator=relator)
+        relator.concluir()
+    except FileNotFoundError as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: O arquivo não foi encontrado em: '{caminho_arquivo}'")
+    except Exception as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: Ocorreu um problema inesperado: {e}")
+
+    if retornar_metricas:
+        return df, relator.metricas
+    return df
+
+
+def _carregar_csv(caminho_arquivo: str, amostra_bytes: int = 20000, motor: str | None = None,
+                  usar_cache: bool = True, otimizar_memoria: bool = False,
+                  cache_colunar: str | None = None, colunas: list[str] | None = None,
+                  filtro: str | Callable[[pd.DataFrame], pd.Series] | None = None,
+                  n_processos: int | None = None, linhas_amostra_tipos: int = 10_000,
+                  relator: _Relator | None = None) -> pd.DataFrame:
+    """
+    Núcleo de `carregar_csv_inteligente`: mesmas etapas, mas propaga os erros
+    em vez de imprimi-los, para que os carregadores em lote possam reportá-los.
+    """
+    import pandas as pd
+
+    relator = relator or _Relator('carregar_csv', caminho_arquivo)
+    if cache_colunar is not None:
+        if cache_colunar not in FORMATOS_CACHE_COLUNAR:
+            raise ValueError(f"Formato de cache desconhecido: '{cache_colunar}'. "
+                             f"Opções: {', '.join(FORMATOS_CACHE_COLUNAR)}")
+        if importlib.util.find_spec('pyarrow') is None:
+            relator.aviso("⚠️  Aviso: O cache colunar requer o pacote 'pyarrow'. Lendo o CSV normalmente.")
+            cache_colunar = None
+        if filtro is not None and not isinstance(filtro, str):
+            relator.aviso("⚠️  Aviso: Filtros em forma de função não podem identificar a cópia colunar. "
+                          "Lendo o CSV normalmente.")
+            cache_colunar = None
+    # Opções que mudam o DataFrame resultante e, portanto, a cópia colunar
+    variante = {'otimizar_memoria': otimizar_memoria}
+    if colunas is not None:
+        variante['colunas'] = list(colunas)
+    if filtro is not None:
+        variante['filtro'] = filtro
+    if cache_colunar is not None:
+        with relator.fase('cache_colunar'):
+            df = _cache_colunar.ler(caminho_arquivo, cache_colunar, variante)
+        if df is not None:
+            relator.metricas.bytes_processados = os.path.getsize(df.attrs['cache_colunar'])
+            relator.metricas.linhas = len(df)
+            relator.mensagem(f"✅ Lido do cache colunar: '{df.attrs['cache_colunar']}'")
+            relator.mensagem("--- ✅ DataFrame carregado com sucesso! ---")
+            return df
+
+    formato = _detectar_formato(caminho_arquivo, amostra_bytes, usar_cache, relator)
+    codificacao_detectada = formato['codificacao']
+    delimitador_detectado = formato['delimitador']
+    motores = _motores_candidatos(delimitador_detectado, motor)
+    opcoes_leitura = {'sep': delimitador_detectado, 'encoding': codificacao_detectada,
+                      'compression': formato.get('compressao')}
+    # Só as colunas pedidas (e as usadas pelo filtro) são convertidas pelo parser
+    usecols, colunas = _resolver_colunas(caminho_arquivo, motores, relator, colunas, filtro, **opcoes_leitura)
+    if usecols is not None:
+        opcoes_leitura['usecols'] = usecols
+
+    if otimizar_memoria:
+        relator.mensagem("\n--- 🔬 Analisando uma amostra para escolher os tipos das colunas ---")
+        with relator.fase('amostra_tipos'):
+            # O 'pyarrow' não aceita nrows, então a amostra é lida pelos outros motores
+            amostra, _ = _ler_csv_com_fallback(
+                caminho_arquivo, _motores_sem_pyarrow(motores), relator, nrows=linhas_amostra_tipos, **opcoes_leitura
+            )
+            memoria_por_linha = amostra.memory_usage(deep=True).sum() / max(len(amostra), 1)
+            dtypes, colunas_data = _planejar_tipos(amostra)
+        opcoes_leitura.update(dtype=dtypes, parse_dates=colunas_data)
+        for coluna, tipo in dtypes.items():
+            nome_tipo = f"string[{tipo.storage}]" if isinstance(tipo, pd.StringDtype) else tipo
+            relator.mensagem(f"   - '{coluna}': {nome_tipo}")
+        for coluna in colunas_data:
+            relator.mensagem(f"   - '{coluna}': data/hora")
+    with relator.fase('amostra_tipos'):
+        opcoes_leitura = _fixar_colunas_texto(caminho_arquivo, motores, relator, opcoes_leitura,
+                                              amostra if otimizar_memoria else None,
+                                              em_blocos=filtro is not None)
+
+    relator.mensagem("\n--- 🔄 Carregando o arquivo com os parâmetros detectados ---")
+    if _leitura_paralela_viavel(caminho_arquivo, formato, filtro, n_processos, relator):
+        df, motor_usado = _ler_csv_paralelo(caminho_arquivo, motores, relator, n_processos,
+                                            filtro=filtro, colunas=colunas, **opcoes_leitura)
+    elif filtro is None:
+        with relator.fase('leitura_csv'):
+            df, motor_usado = _ler_csv_com_fallback(caminho_arquivo, motores, relator, **opcoes_leitura)
+            if colunas is not None:
+                df = df[colunas]
+    else:
+        # As linhas são filtradas bloco a bloco: a memória acompanha o que é
+        # mantido, e não o tamanho do arquivo
+        motores_blocos = _motores_sem_pyarrow(motores)
+        linhas_por_bloco = max(1, int(BYTES_POR_BLOCO_FILTRO / formato['bytes_por_linha']))
+        partes = list(_ler_em_blocos(caminho_arquivo, motores_blocos, linhas_por_bloco, relator,
+                                     filtro=filtro, colunas=colunas, **opcoes_leitura))
+        motor_usado = relator.metricas.motor
+        with relator.fase('leitura_csv'):
+            if partes:
+                df = pd.concat(partes, ignore_index=True)
+            else:
+                df = _ler_cabecalho(caminho_arquivo, motores_blocos, relator, **opcoes_leitura)
+                df = df[colunas] if colunas is not None else df
+            # Blocos com categorias diferentes viram 'object' ao serem concatenados
+            for coluna, tipo in opcoes_leitura.get('dtype', {}).items():
+                if tipo == 'category' and coluna in df.columns:
+                    df[coluna] = df[coluna].astype('category')
+    if otimizar_memoria:
+        with relator.fase('leitura_csv'):
+            df = _reduzir_numericos(df)
+    df.attrs['motor_csv'] = motor_usado
+    relator.metricas.motor = motor_usado
+    relator.metricas.bytes_processados = os.path.getsize(caminho_arquivo)
+    relator.metricas.linhas = len(df)
+    relator.mensagem(f"✅ Motor de leitura utilizado: '{motor_usado}'")
+
+    if otimizar_memoria:
+        memoria = {
+            'estimada_sem_otimizacao': int(memoria_por_linha * len(df)),
+            'otimizada': int(df.memory_usage(deep=True).sum()),
+        }
+        df.attrs['memoria'] = memoria
+        relator.mensagem(f"✅ Memória: {_formatar_bytes(memoria['estimada_sem_otimizacao'])} (estimada, tipos padrão)"
+                         f" → {_formatar_bytes(memoria['otimizada'])} (otimizada)")
+
+    if cache_colunar is not None:
+        try:
+            with relator.fase('cache_colunar'):
+                _cache_colunar.gravar(caminho_arquivo, cache_colunar, variante, df)
+            relator.mensagem(f"✅ Cópia colunar ({cache_colunar}) gravada para as próximas leituras")
+        except Exception as e:
+            relator.aviso(f"⚠️  Aviso: Não foi possível gravar a cópia colunar ({e}).")
+
+    relator.mensagem("--- ✅ DataFrame carregado com sucesso! ---")
+    return df
+
+# ==============================================================================
+# FUNÇÃO 2: CONVERSOR DE NOTEBOOK (Com detecção completa e relatório)
+# ==============================================================================
+def converter_notebook_para_py(caminho_notebook: str, caminho_script_saida: str | None = None,
+                               checkpoints: bool = False, silencioso: bool = False,
+                               ao_registrar: Callable[[str, dict], None] | None = None,
+                               retornar_metricas: bool = False):
+    """
+    Converte um notebook Jupyter (.ipynb) para um script Python (.py) limpo e compatível.
+
+    Identifica e neutraliza comandos específicos do Jupyter (mágicos, shell, display)
+    e gera um relatório final sobre as modificações realizadas.
+
+    Com `checkpoints=True`, cada célula de código vira uma etapa cujas
+    variáveis são guardadas em disco (veja `CheckpointsEtapas`). A chave de
+    cada etapa combina o hash do seu código, a etapa anterior e os arquivos
+    que ela lê. Ao rodar o script de novo, as etapas que não mudaram são
+    restauradas em vez de executadas, e a execução recomeça na primeira
+    etapa alterada.
+
+    Com `silencioso`, `ao_registrar` e `retornar_metricas`, funciona como em
+    `carregar_csv_inteligente`: as fases medidas são 'leitura_notebook',
+    'transformacao' e 'escrita', e o retorno passa a ser o `MetricasExecucao`.
+    """
+    relator = _Relator('converter_notebook', caminho_notebook, silencioso, ao_registrar)
+    if not caminho_notebook.endswith('.ipynb'):
+        relator.falhar(ValueError("O arquivo de entrada deve ser um Jupyter Notebook (.ipynb)"))
+        relator.mensagem("❌ ERRO: O arquivo de entrada deve ser um Jupyter Notebook (.ipynb)")
+        return relator.metricas if retornar_metricas else None
+    if caminho_script_saida is None:
+        caminho_script_saida = caminho_notebook.replace('.ipynb', '.py')
+    relator.mensagem(f"\n--- 🔄 Convertendo '{caminho_notebook}' para '{caminho_script_saida}' ---")
+
+    try:
+        comandos_jupyter_encontrados = _converter_notebook(caminho_notebook, caminho_script_saida, relator,
+                                                           checkpoints)
+        relator.mensagem(f"--- ✅ Conversão concluída! Arquivo salvo em: '{caminho_script_saida}' ---")
+        _imprimir_relatorio_compatibilidade(relator, comandos_jupyter_encontrados)
+        relator.concluir()
+
+    except FileNotFoundError as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: Notebook '{caminho_notebook}' não encontrado.")
+    except Exception as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: Problema inesperado durante a conversão: {e}")
+
+    if retornar_metricas:
+        return relator.metricas
+
+
+def _converter_notebook(caminho_notebook: str, caminho_script_saida: str, relator: _Relator,
+                        checkpoints: bool = False) -> set[str]:
+    """
+    Núcleo de `converter_notebook_para_py`: lê, transforma e grava o script,
+    propagando os erros. Retorna os comandos do Jupyter encontrados.
+    """
+    with relator.fase('leitura_notebook'):
+        celulas = _ler_celulas_notebook(caminho_notebook)
+        if celulas is None:
+            import nbformat
+            with open(caminho_notebook, 'r', encoding='utf-8') as f:
+                notebook = nbformat.read(f, as_version=4)
+            celulas = [(cell.cell_type, cell.source) for cell in notebook.cells]
+    relator.metricas.bytes_processados = os.path.getsize(caminho_notebook)
+
+    with relator.fase('transformacao'):
+        script_python = [
+            "# -*- coding: utf-8 -*-",
+            '"""',
+            f"Script gerado automaticamente a partir de {caminho_notebook.split('/')[-1]}",
+            '"""',
+            ""
+        ]
+        if checkpoints:
+            script_python.extend(CABECALHO_CHECKPOINTS)
+
+        # Usamos um set para armazenar os comandos únicos encontrados
+        comandos_jupyter_encontrados = set()
+
+        numero_etapa = 0
+        # Nomes de módulos importados pelas células anteriores
+        modulos = frozenset()
+        for tipo, codigo in celulas:
+            if checkpoints and tipo == 'code':
+                numero_etapa += 1
+                linhas, comandos = _transformar_celula_em_etapa(numero_etapa, codigo, modulos)
+                modulos |= _nomes_importados(codigo)
+            else:
+                linhas, comandos = _transformar_celula(tipo, codigo)
+            script_python.extend(linhas)
+            comandos_jupyter_encontrados.update(comandos)
+        conteudo = "\n".join(script_python)
+
+    with relator.fase('escrita'):
+        # Não regrava o script se o conteúdo não mudou (mantém o mtime e evita
+        # disparar ferramentas que observam a pasta de saída)
+        if _ler_script_existente(caminho_script_saida) != conteudo:
+            with open(caminho_script_saida, 'w', encoding='utf-8') as f:
+                f.write(conteudo)
+    relator.metricas.linhas = conteudo.count('\n') + 1
+    return comandos_jupyter_encontrados
+
+
+# Quantas células transformadas ficam memorizadas entre conversões do mesmo processo
+MAX_CELULAS_MEMORIZADAS = 8192
+
+# Início dos scripts gerados com `checkpoints=True`
+CABECALHO_CHECKPOINTS = (
+    "from ferramentas_analista import CheckpointsEtapas",
+    "",
+    "# Cada célula de código é uma etapa: se o código, as etapas anteriores e os",
+    "# arquivos lidos não mudaram, as variáveis dela são restauradas do checkpoint",
+    "_checkpoints = CheckpointsEtapas(__file__, globals())",
+    "",
+)
+
+
+@functools.lru_cache(maxsize=MAX_CELULAS_MEMORIZADAS)
+def _transformar_celula(tipo: str, codigo: str) -> tuple[tuple[str, ...], frozenset[str]]:
+    """
+    Converte uma célula em linhas do script e retorna também os comandos do
+    Jupyter encontrados nela.
+
+    O resultado é memorizado, no processo atual, pelo tipo e pelo código da
+    célula: ao reconverter um notebook salvo de novo (no modo de observação,
+    ou em um worker da conversão em lote), só as células editadas passam
+    outra vez pelo tratamento dos comandos mágicos, shell e display(). A
+    memória não é guardada em disco: transformar uma célula custa menos que
+    ler o resultado de um arquivo.
+    """
+    linhas = []
+    comandos_jupyter_encontrados = set()
+    if tipo == 'code':
+        codigo_limpo, comandos_jupyter_encontrados = _limpar_codigo(codigo)
+        linhas.extend(["\n# --- Célula de Código ---", *codigo_limpo, "\n"])
+
+    elif tipo == 'markdown':
+        linhas.append("#" + "="*78)
+        linhas_markdown = [f"# {linha}" for linha in codigo.split('\n')]
+        linhas.extend(["# CÉLULA DE MARKDOWN", *linhas_markdown])
+        linhas.append("#" + "="*78 + "\n")
+    return tuple(linhas), frozenset(comandos_jupyter_encontrados)
+
+
+def _limpar_codigo(codigo: str) -> tuple[list[str], set[str]]:
+    """
+    Neutraliza os comandos do Jupyter de uma célula de código (mágicos, shell
+    e display()) e retorna as linhas resultantes e os comandos encontrados.
+    """
+    codigo_limpo = []
+    comandos_jupyter_encontrados = set()
+    linhas_codigo = codigo.split('\n')
+
+    for i, linha in enumerate(linhas_codigo):
+        linha_strip = linha.strip()
+        linha_processada = linha
+
+        # Identifica todos os comandos, mas só processa uma vez por linha
+        if 'display(' in linha:
+            linha_processada = linha.replace('display(', 'print(', 1)
+            if '#' not in linha_processada:
+                linha_processada += " # Convertido de display() para print()"
+            comandos_jupyter_encontrados.add('display()')
+
+        elif linha_strip.startswith('%'):
+            # Pega o comando específico (ex: %matplotlib, %%time)
+            comando_magico = linha_strip.split(' ')[0]
+            comandos_jupyter_encontrados.add(comando_magico)
+            linha_processada = f"# {linha}"
+
+        elif linha_strip.startswith('!'):
+            # Pega o comando shell (ex: !pip)
+            comando_shell = "!" + linha_strip[1:].split(' ')[0]
+            comandos_jupyter_encontrados.add(comando_shell)
+            linha_processada = f"# {linha}"
+
+        codigo_limpo.append(linha_processada)
+
+    return codigo_limpo, comandos_jupyter_encontrados
+
+
+@functools.lru_cache(maxsize=MAX_CELULAS_MEMORIZADAS)
+def _transformar_celula_em_etapa(numero: int, codigo: str,
+                                 modulos: frozenset[str] = frozenset()) -> tuple[tuple[str, ...], frozenset[str]]:
+    """
+    Como `_transformar_celula` para uma célula de código, mas a envolve em uma
+    etapa com checkpoint (veja `CheckpointsEtapas`):
+
+        if _checkpoints.iniciar('etapa_03', '<hash do código>', entradas=[...], variaveis=[...]):
+            <código da célula>
+            _checkpoints.salvar()
+
+    `modulos` são os nomes importados pelas células anteriores: chamar um
+    método deles (`plt.figure()`) não conta como alterar uma variável.
+
+    Células que não podem ser indentadas com segurança (com textos de várias
+    linhas, `from __future__` ou erros de sintaxe) ou que não criam variáveis
+    além dos módulos que importam (como um `print`, um gráfico ou só
+    `import`s) são mantidas como estão e sempre executadas, mas
+    continuam entrando no encadeamento das chaves. As que leem arquivos de
+    caminho só conhecido na execução também são sempre executadas, e as
+    etapas seguintes deixam de ser restauradas.
+    """
+    codigo_limpo, comandos = _limpar_codigo(codigo)
+    nome = f"etapa_{numero:02d}"
+    hash_codigo = hashlib.sha256("\n".join(codigo_limpo).encode('utf-8')).hexdigest()[:16]
+    analise = _analisar_etapa(codigo_limpo, modulos)
+    if analise is None:
+        linhas = [f"\n# --- Etapa {numero:02d} (sempre executada) ---",
+                  f"_checkpoints.iniciar({nome!r}, {hash_codigo!r}, armazenar=False)",
+                  *codigo_limpo, "\n"]
+    elif analise[2] or set(analise[1]) <= _nomes_importados(codigo):
+        entradas, _, entradas_desconhecidas = analise
+        opcoes = ", entradas_desconhecidas=True" if entradas_desconhecidas else ""
+        linhas = [f"\n# --- Etapa {numero:02d} (sempre executada) ---",
+                  f"_checkpoints.iniciar({nome!r}, {hash_codigo!r}, entradas={entradas!r}, "
+                  f"armazenar=False{opcoes})",
+                  *codigo_limpo, "\n"]
+    else:
+        entradas, variaveis, _ = analise
+        linhas = [f"\n# --- Etapa {numero:02d} (com checkpoint) ---",
+                  f"if _checkpoints.iniciar({nome!r}, {hash_codigo!r}, entradas={entradas!r}, "
+                  f"variaveis={variaveis!r}):",
+                  *_indentar(codigo_limpo), "    _checkpoints.salvar()", "\n"]
+    return tuple(linhas), frozenset(comandos)
+
+
+def _indentar(linhas: list[str]) -> list[str]:
+    return [f"    {linha}" if linha.strip() else linha for linha in linhas]
+
+
+# Funções cujos argumentos de caminho são tratados como arquivos lidos pela etapa
+PADRAO_FUNCOES_LEITURA = re.compile(r'(^|_)(read|load|open|carregar|ler)', re.IGNORECASE)
+# Funções que gravam arquivos: os caminhos passados a elas não são entradas
+PADRAO_FUNCOES_ESCRITA = re.compile(r'^(to_|save|write|dump|salvar|gravar|export)', re.IGNORECASE)
+# Textos com cara de nome de arquivo ('log_acessos.tsv', 'dados/vendas.csv')
+PADRAO_CAMINHO_ARQUIVO = re.compile(r'^[^\s*?"<>|]+\.[A-Za-z][A-Za-z0-9]{0,7}$')
+
+
+@functools.lru_cache(maxsize=MAX_CELULAS_MEMORIZADAS)
+def _nomes_importados(codigo: str) -> frozenset[str]:
+    """
+    Nomes ligados por `import` no nível do módulo (fora de funções e classes)
+    de uma célula de código. Se a célula tiver erros de sintaxe, cada linha
+    de import é lida sozinha.
+    """
+    import ast
+
+    try:
+        pendentes = ast.parse("\n".join(_limpar_codigo(codigo)[0])).body
+    except SyntaxError:
+        pendentes = []
+        for linha in codigo.split('\n'):
+            if re.match(r'(import|from)\s', linha):
+                with contextlib.suppress(SyntaxError):
+                    pendentes.extend(ast.parse(linha).body)
+    nomes = set()
+    while pendentes:
+        no = pendentes.pop()
+        if isinstance(no, (ast.Import, ast.ImportFrom)):
+            nomes.update((a.asname or a.name.split('.')[0]) for a in no.names if a.name != '*')
+        elif not isinstance(no, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            pendentes.extend(ast.iter_child_nodes(no))
+    return frozenset(nomes)
+
+
+def _analisar_etapa(codigo_limpo: list[str],
+                    modulos: frozenset[str] = frozenset()) -> tuple[list[str], list[str], bool] | None:
+    """
+    Analisa o código de uma célula e retorna os arquivos que ela lê, as
+    variáveis que ela cria ou modifica e se ela lê arquivos cujo caminho só
+    é conhecido na execução; ou None se o código não puder ser colocado
+    dentro de um bloco `if`.
+
+    As entradas são os textos passados como primeiro argumento (ou como
+    argumento 'caminho'/'path'/'file...') a funções de leitura (`read_csv`,
+    `carregar_csv_inteligente`, `open`...) e os textos com cara de nome de
+    arquivo passados a qualquer outra função, exceto às que gravam
+    (`to_csv`, `savefig`...). Se o caminho dado a uma função de leitura não
+    for um texto fixo (uma variável, uma f-string), a etapa tem entradas
+    desconhecidas; arquivos já abertos na própria célula (`with open(...) as
+    f: json.load(f)`) não contam. As variáveis são os nomes
+    atribuídos no nível do módulo, os importados, as funções e classes
+    definidas e os objetos alterados por atribuição de item/atributo ou por
+    chamada de método (`df['x'] = ...`, `df.dropna(inplace=True)`), exceto
+    os módulos importados aqui ou nas células anteriores (`modulos`).
+    """
+    import ast
+
+    texto = "\n".join(codigo_limpo)
+    try:
+        arvore = ast.parse(texto)
+        # A própria indentação pode gerar erros (ex: tabulações misturadas)
+        compile("if True:\n" + "\n".join(_indentar(codigo_limpo)) + "\n    pass\n", '<etapa>', 'exec')
+    except SyntaxError:
+        return None
+
+    def texto_fixo(no) -> bool:
+        return isinstance(no, ast.Constant) and isinstance(no.value, str)
+
+    def nome_funcao(chamada) -> str:
+        return chamada.func.attr if isinstance(chamada.func, ast.Attribute) else getattr(chamada.func, 'id', '')
+
+    # Nomes ligados a arquivos abertos na própria célula
+    arquivos_abertos = set()
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.withitem) and isinstance(no.optional_vars, ast.Name):
+            arquivos_abertos.add(no.optional_vars.id)
+        elif isinstance(no, ast.Assign) and isinstance(no.value, ast.Call) and nome_funcao(no.value) == 'open':
+            arquivos_abertos.update(alvo.id for alvo in no.targets if isinstance(alvo, ast.Name))
+
+    entradas, entradas_desconhecidas = [], False
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.ImportFrom) and no.module == '__future__':
+            return None
+        # A indentação alteraria o conteúdo de textos com várias linhas
+        if (isinstance(no, ast.JoinedStr) or (isinstance(no, ast.Constant) and isinstance(no.value, (str, bytes)))) \
+                and no.end_lineno != no.lineno:
+            return None
+        if not isinstance(no, ast.Call):
+            continue
+        funcao = nome_funcao(no)
+        if PADRAO_FUNCOES_ESCRITA.search(funcao):
+            continue
+        if funcao == 'open':
+            modo = no.args[1] if len(no.args) > 1 else next((k.value for k in no.keywords if k.arg == 'mode'), None)
+            if texto_fixo(modo) and set(modo.value) & set('wax'):
+                continue
+        if PADRAO_FUNCOES_LEITURA.search(funcao):
+            argumentos = no.args[:1] + [k.value for k in no.keywords
+                                        if k.arg and re.match(r'caminho|path|file', k.arg)]
+            for argumento in argumentos:
+                if texto_fixo(argumento):
+                    entradas.append(argumento.value)
+                elif not (isinstance(argumento, ast.Name) and argumento.id in arquivos_abertos):
+                    entradas_desconhecidas = True
+        else:
+            argumentos = no.args + [k.value for k in no.keywords]
+            entradas.extend(a.value for a in argumentos if texto_fixo(a) and PADRAO_CAMINHO_ARQUIVO.match(a.value))
+
+    variaveis = []
+    importados = set(modulos)
+
+    def base(alvo):
+        while isinstance(alvo, (ast.Attribute, ast.Subscript, ast.Starred)):
+            alvo = alvo.value
+        return alvo.id if isinstance(alvo, ast.Name) else None
+
+    def registrar_alvo(alvo):
+        if isinstance(alvo, (ast.Tuple, ast.List)):
+            for elemento in alvo.elts:
+                registrar_alvo(elemento)
+        elif isinstance(alvo, ast.Name):
+            variaveis.append(alvo.id)
+        else:
+            registrar_alterado(alvo)
+
+    def registrar_alterado(objeto):
+        # Alterar um módulo (`plt.figure()`, `plt.rcParams[...] = ...`) não é guardado no checkpoint
+        if base(objeto) is not None and base(objeto) not in importados:
+            variaveis.append(base(objeto))
+
+    def visitar(no):
+        if isinstance(no, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            variaveis.append(no.name)
+            return
+        if isinstance(no, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            return
+        if isinstance(no, (ast.Import, ast.ImportFrom)):
+            nomes = [(a.asname or a.name.split('.')[0]) for a in no.names if a.name != '*']
+            variaveis.extend(nomes)
+            importados.update(nomes)
+        elif isinstance(no, ast.Assign):
+            for alvo in no.targets:
+                registrar_alvo(alvo)
+        elif isinstance(no, (ast.AugAssign, ast.AnnAssign, ast.NamedExpr, ast.For, ast.AsyncFor)):
+            registrar_alvo(no.target)
+        elif isinstance(no, ast.withitem) and no.optional_vars is not None:
+            registrar_alvo(no.optional_vars)
+        elif isinstance(no, ast.Expr) and isinstance(no.value, ast.Call) \
+                and isinstance(no.value.func, ast.Attribute):
+            registrar_alterado(no.value.func.value)
+        for filho in ast.iter_child_nodes(no):
+            visitar(filho)
+
+    visitar(arvore)
+    variaveis = [v for v in dict.fromkeys(variaveis) if not v.startswith('__') and v != '_checkpoints']
+    return list(dict.fromkeys(entradas)), variaveis, entradas_desconhecidas
+
+
+def _ler_script_existente(caminho_script: str) -> str | None:
+    """Conteúdo atual do script de saída, ou None se ele não existir ou não for legível."""
+    try:
+        with open(caminho_script, 'r', encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _imprimir_relatorio_compatibilidade(relator: _Relator, comandos_jupyter_encontrados,
+                                        notebooks_por_comando: dict[str, list[str]] | None = None):
+    """
+    Imprime o relatório dos comandos do Jupyter tratados na conversão. Na
+    conversão em lote, `notebooks_por_comando` indica onde cada um apareceu.
+    """
+    # Gera o relatório final se algum comando foi encontrado
+    if not comandos_jupyter_encontrados:
+        return
+    relator.mensagem("\n" + "="*50)
+    relator.mensagem("⚠️  RELATÓRIO DE COMPATIBILIDADE")
+    relator.mensagem("="*50)
+    relator.mensagem("Seu notebook continha comandos específicos do Jupyter que não")
+    relator.mensagem("funcionam em scripts .py. Eles foram tratados da seguinte forma:")
+
+    # Ordena para uma exibição consistente
+    for cmd in sorted(list(comandos_jupyter_encontrados)):
+        if cmd == 'display()':
+            relator.mensagem(f"   - [CONVERTIDO] '{cmd}': Substituído pela função 'print()'.")
+        else:
+            relator.mensagem(f"   - [COMENTADO]  '{cmd}': A linha de comando foi mantida, mas desativada com '#'.")
+        if notebooks_por_comando:
+            relator.mensagem(f"       em {len(notebooks_por_comando[cmd])} notebook(s)")
+    relator.mensagem("="*50)
+
+# ==============================================================================
+# FUNÇÃO 3: CARREGAMENTO EM BLOCOS (STREAMING)
+# ==============================================================================
+def carregar_csv_em_blocos(caminho_arquivo: str, linhas_por_bloco: int = 100_000,
+                           bytes_por_bloco: int | None = None, amostra_bytes: int = 20000,
+                           motor: str | None = None, usar_cache: bool = True,
+                           colunas: list[str] | None = None,
+                           filtro: str | Callable[[pd.DataFrame], pd.Series] | None = None,
+                           silencioso: bool = False,
+                           ao_registrar: Callable[[str, dict], None] | None = None) -> Iterator[pd.DataFrame]:
+    """
+    Versão em blocos de `carregar_csv_inteligente`, para arquivos maiores que a memória.
+
+    A codificação e o delimitador são detectados uma única vez e, em seguida,
+    o arquivo é lido em DataFrames sucessivos de tamanho limitado, de modo que
+    o uso de memória não cresce com o tamanho do arquivo.
+
+    Args:
+        caminho_arquivo (str): Caminho do arquivo a ser lido.
+        linhas_por_bloco (int): Número de linhas de cada bloco.
+        bytes_por_bloco (int, optional): Tamanho aproximado de cada bloco em bytes.
+                                         Se informado, tem prioridade sobre
+                                         `linhas_por_bloco` e é convertido em
+                                         linhas pela média de bytes por linha
+                                         da amostra.
+        amostra_bytes (int): Bytes lidos do início do arquivo para a detecção.
+        motor (str, optional): Força um motor específico ('c' ou 'python').
+                               O 'pyarrow' não suporta leitura em blocos.
+        usar_cache (bool): Reaproveita a detecção guardada no cache.
+        colunas (list[str], optional): Colunas a serem lidas, como em
+                                       `carregar_csv_inteligente`.
+        filtro (str | callable, optional): Filtro de linhas aplicado a cada
+                                           bloco, como em `carregar_csv_inteligente`.
+        silencioso (bool): Desliga as mensagens impressas.
+        ao_registrar (callable, optional): Recebe os eventos 'fase', 'concluido'
+                                           e 'erro', como em `carregar_csv_inteligente`.
+                                           O tempo de 'leitura_csv' soma todos os blocos.
+
+    Yields:
+        pd.DataFrame: Os blocos do arquivo, na ordem em que aparecem.
+
+    Erros no meio da leitura são propagados, para que um processamento em
+    lote não trate um arquivo lido pela metade como completo.
+    """
+    relator = _Relator('carregar_csv_em_blocos', caminho_arquivo, silencioso, ao_registrar)
+    relator.mensagem(f"--- 🚀 Iniciando Leitura em Blocos de '{caminho_arquivo}' ---")
+    try:
+        formato = _detectar_formato(caminho_arquivo, amostra_bytes, usar_cache, relator)
+    except FileNotFoundError as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: O arquivo não foi encontrado em: '{caminho_arquivo}'")
+        return
+
+    if bytes_por_bloco is not None:
+        linhas_por_bloco = max(1, int(bytes_por_bloco / formato['bytes_por_linha']))
+    relator.mensagem(f"✅ Tamanho do bloco: {linhas_por_bloco} linhas")
+
+    motores = [m for m in _motores_candidatos(formato['delimitador'], motor) if m != 'pyarrow']
+    if not motores:
+        raise ValueError("O motor 'pyarrow' não suporta leitura em blocos. Use 'c' ou 'python'.")
+    opcoes_leitura = {'sep': formato['delimitador'], 'encoding': formato['codificacao'],
+                      'compression': formato.get('compressao')}
+
+    try:
+        usecols, colunas = _resolver_colunas(caminho_arquivo, motores, relator, colunas, filtro, **opcoes_leitura)
+        if usecols is not None:
+            opcoes_leitura['usecols'] = usecols
+        # Os tipos vêm de uma amostra, e não de cada bloco, para serem os mesmos em todos
+        opcoes_leitura = _fixar_colunas_texto(caminho_arquivo, motores, relator, opcoes_leitura, em_blocos=True)
+        total_blocos = 0
+        for bloco in _ler_em_blocos(caminho_arquivo, motores, linhas_por_bloco, relator,
+                                    filtro=filtro, colunas=colunas, **opcoes_leitura):
+            if total_blocos == 0:
+                relator.mensagem(f"✅ Motor de leitura utilizado: '{relator.metricas.motor}'")
+            total_blocos += 1
+            relator.metricas.linhas += len(bloco)
+            yield bloco
+        relator.metricas.bytes_processados = os.path.getsize(caminho_arquivo)
+        relator.mensagem(f"--- ✅ Leitura em blocos concluída ({total_blocos} blocos) ---")
+        relator.concluir()
+    except Exception as e:
+        relator.falhar(e)
+        raise
+
+
+def _ler_em_blocos(caminho_arquivo: str, motores: list[str], linhas_por_bloco: int, relator: _Relator,
+                   filtro: str | Callable[[pd.DataFrame], pd.Series] | None = None,
+                   colunas: list[str] | None = None, **opcoes_leitura) -> Iterator[pd.DataFrame]:
+    """
+    Lê o arquivo em blocos, aplicando o filtro de linhas e a seleção de colunas
+    a cada bloco. O motor usado fica em `relator.metricas.motor`.
+
+    O primeiro bloco decide o motor: depois de entregar dados, não há como
+    trocar de motor sem repetir linhas, então os erros seguintes são propagados.
+    """
+    import pandas as pd
+
+    for motor_atual in motores:
+        leitor = pd.read_csv(caminho_arquivo, engine=motor_atual, chunksize=linhas_por_bloco, **opcoes_leitura)
+        with leitor:
+            try:
+                with relator.fase('leitura_csv'):
+                    primeiro_bloco = next(leitor, None)
+            except ValueError as e:
+                if motor_atual == motores[-1]:
+                    raise
+                relator.aviso(f"⚠️  Aviso: O motor '{motor_atual}' não conseguiu ler o arquivo ({e}).")
+                continue
+
+            relator.metricas.motor = motor_atual
+            blocos = itertools.chain([primeiro_bloco], leitor) if primeiro_bloco is not None else iter(())
+            while True:
+                with relator.fase('leitura_csv'):
+                    bloco = next(blocos, None)
+                if bloco is None:
+                    return
+                if filtro is not None:
+                    with relator.fase('filtro'):
+                        bloco = _aplicar_filtro(bloco, filtro)
+                if colunas is not None:
+                    bloco = bloco[colunas]
+                bloco.attrs['motor_csv'] = motor_atual
+                yield bloco
+
+
+def _aplicar_filtro(bloco: pd.DataFrame, filtro: str | Callable[[pd.DataFrame], pd.Series]) -> pd.DataFrame:
+    """Mantém só as linhas do bloco que satisfazem o filtro (expressão do `query` ou função)."""
+    if isinstance(filtro, str):
+        return bloco.query(filtro)
+    return bloco[filtro(bloco)]
+
+
+def _colunas_do_filtro(filtro: str, cabecalho: list[str]) -> list[str]:
+    """Colunas do cabeçalho citadas na expressão do filtro (nomes simples ou entre crases)."""
+    sem_textos = re.sub(r"`[^`]*`|\"[^\"]*\"|'[^']*'", ' ', filtro)
+    nomes = set(re.findall(r'`([^`]+)`', filtro)) | set(re.findall(r'[^\W\d]\w*', sem_textos))
+    return [coluna for coluna in cabecalho if coluna in nomes]
+
+
+def _resolver_colunas(caminho_arquivo: str, motores: list[str], relator: _Relator,
+                      colunas: list[str] | None, filtro, **opcoes_leitura) -> tuple[list[str] | None, list[str] | None]:
+    """
+    Decide quais colunas o parser deve converter: as pedidas mais as citadas
+    no filtro (descartadas depois de filtrar). Valida os nomes pelo cabeçalho.
+
+    Returns:
+        tuple: (colunas a ler, colunas a devolver); None significa todas.
+    """
+    if colunas is None:
+        return None, None
+    cabecalho = list(_ler_cabecalho(caminho_arquivo, motores, relator, **opcoes_leitura).columns)
+    colunas = list(colunas)
+    ausentes = [c for c in colunas if c not in cabecalho]
+    if ausentes:
+        raise ValueError(f"Colunas não encontradas no arquivo: {ausentes}. Disponíveis: {cabecalho}")
+    extras = _colunas_do_filtro(filtro, cabecalho) if isinstance(filtro, str) else []
+    return colunas + [c for c in extras if c not in colunas], colunas
+
+# ==============================================================================
+# FUNÇÃO 4: CARREGAMENTO PARALELO DE VÁRIOS ARQUIVOS
+# ==============================================================================
+@dataclass
+class ResultadoCargaMultipla:
+    """
+    Resultado de `carregar_varios_csv`.
+
+    Attributes:
+        dataframes (dict): Caminho do arquivo -> DataFrame carregado.
+        erros (dict): Caminho do arquivo -> descrição do erro, para os arquivos
+                      que não puderam ser carregados.
+        concatenados (dict): Tupla de colunas -> DataFrame com todos os arquivos
+                             que têm exatamente essas colunas. Só é preenchido
+                             com `concatenar=True`.
+        metricas (dict): Caminho do arquivo -> `MetricasExecucao` do carregamento.
+    """
+    dataframes: dict[str, pd.DataFrame] = field(default_factory=dict)
+    erros: dict[str, str] = field(default_factory=dict)
+    concatenados: dict[tuple[str, ...], pd.DataFrame] = field(default_factory=dict)
+    metricas: dict[str, MetricasExecucao] = field(default_factory=dict)
+
+
+def _carregar_csv_em_processo(caminho_arquivo: str, opcoes_carga: dict) -> tuple[pd.DataFrame | None, MetricasExecucao]:
+    """Executa o carregador em um processo do pool, sem imprimir nada."""
+    relator = _Relator('carregar_csv', caminho_arquivo, silencioso=True)
+    try:
+        df = _carregar_csv(caminho_arquivo, relator=relator, **opcoes_carga)
+        relator.concluir()
+        return df, relator.metricas
+    except Exception as e:
+        relator.falhar(e)
+        return None, relator.metricas
+
+
+def carregar_varios_csv(caminhos: str | list[str], max_workers: int | None = None,
+                        concatenar: bool = False, coluna_origem: str | None = 'arquivo_origem',
+                        silencioso: bool = False, **opcoes_carga) -> ResultadoCargaMultipla:
+    """
+    Carrega vários arquivos CSV/texto em paralelo, em um pool de processos.
+
+    Cada arquivo passa pela mesma detecção de `carregar_csv_inteligente`. Em vez
+    de imprimir os erros e devolver None, os arquivos que falham são listados
+    em `resultado.erros`, e os demais continuam sendo carregados.
+
+    Args:
+        caminhos (str | list[str]): Lista de caminhos ou um padrão glob
+                                    (ex: 'exportacoes/**/*.csv').
+        max_workers (int, optional): Número de processos. Padrão: número de CPUs.
+                                     Com 1, tudo roda no processo atual.
+        concatenar (bool): Se True, junta os arquivos com as mesmas colunas
+                           em `resultado.concatenados`.
+        coluna_origem (str, optional): Nome da coluna que identifica o arquivo
+                                       de origem de cada linha nos DataFrames
+                                       concatenados. None para não criá-la.
+        silencioso (bool): Desliga o resumo impresso ao final.
+        **opcoes_carga: Repassadas ao carregador (amostra_bytes, motor, ...).
+
+    Returns:
+        ResultadoCargaMultipla: DataFrames, erros, concatenações e métricas.
+    """
+    import pandas as pd
+
+    if isinstance(caminhos, str):
+        caminhos = sorted(glob.glob(caminhos, recursive=True))
+    caminhos = list(dict.fromkeys(caminhos))
+
+    relator = _Relator('carregar_varios_csv', f"{len(caminhos)} arquivos", silencioso)
+    relator.mensagem(f"--- 🚀 Carregando {len(caminhos)} arquivos em paralelo ---")
+    resultado = ResultadoCargaMultipla()
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(caminhos), 1))
+
+    def registrar(caminho: str, df: pd.DataFrame | None, metricas: MetricasExecucao):
+        resultado.metricas[caminho] = metricas
+        if metricas.erro is not None:
+            resultado.erros[caminho] = metricas.erro
+        else:
+            resultado.dataframes[caminho] = df
+
+    if max_workers == 1:
+        for caminho in caminhos:
+            registrar(caminho, *_carregar_csv_em_processo(caminho, opcoes_carga))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {
+                executor.submit(_carregar_csv_em_processo, caminho, opcoes_carga): caminho
+                for caminho in caminhos
+            }
+            for futuro in as_completed(futuros):
+                caminho = futuros[futuro]
+                try:
+                    registrar(caminho, *futuro.result())
+                except Exception as e:
+                    # Falhas do próprio pool (processo morto, erro de serialização)
+                    resultado.erros[caminho] = f"{type(e).__name__}: {e}"
+
+    # Mantém a ordem de entrada, independente da ordem de conclusão
+    resultado.dataframes = {c: resultado.dataframes[c] for c in caminhos if c in resultado.dataframes}
+    resultado.erros = {c: resultado.erros[c] for c in caminhos if c in resultado.erros}
+
+    if concatenar:
+        grupos: dict[tuple[str, ...], list[pd.DataFrame]] = {}
+        for caminho, df in resultado.dataframes.items():
+            esquema = tuple(df.columns)
+            if coluna_origem is not None:
+                df = df.assign(**{coluna_origem: caminho})
+            grupos.setdefault(esquema, []).append(df)
+        for colunas, dfs in grupos.items():
+            resultado.concatenados[colunas] = pd.concat(dfs, ignore_index=True)
+
+    relator.mensagem(f"--- ✅ {len(resultado.dataframes)} arquivos carregados, {len(resultado.erros)} com erro ---")
+    for caminho, erro in resultado.erros.items():
+        relator.aviso(f"   - ❌ '{caminho}': {erro}")
+    return resultado
+
+# ==============================================================================
+# FUNÇÃO 5: CONVERSÃO DE NOTEBOOKS EM LOTE
+# ==============================================================================
+NOME_MANIFESTO_CONVERSAO = '.conversao_notebooks.json'
+
+
+@dataclass
+class ResultadoConversaoLote:
+    """
+    Resultado de `converter_notebooks_em_lote`.
+
+    Attributes:
+        convertidos (dict): Notebook -> script gerado nesta execução.
+        pulados (dict): Notebook -> script existente, para os notebooks cujo
+                        conteúdo não mudou desde a última execução.
+        erros (dict): Notebook -> descrição do erro.
+        comandos (dict): Comando do Jupyter -> notebooks em que ele aparece,
+                         somando convertidos e pulados.
+    """
+    convertidos: dict[str, str] = field(default_factory=dict)
+    pulados: dict[str, str] = field(default_factory=dict)
+    erros: dict[str, str] = field(default_factory=dict)
+    comandos: dict[str, list[str]] = field(default_factory=dict)
+
+
+def _listar_notebooks(raiz: str) -> list[str]:
+    """Lista os notebooks da árvore, ignorando pastas ocultas e checkpoints do Jupyter."""
+    notebooks = []
+    for pasta, subpastas, arquivos in os.walk(raiz):
+        subpastas[:] = sorted(p for p in subpastas if not p.startswith('.'))
+        notebooks.extend(os.path.join(pasta, a) for a in sorted(arquivos) if a.endswith('.ipynb'))
+    return notebooks
+
+
+def _caminho_script(caminho_notebook: str, base: str, pasta_saida: str | None) -> str:
+    """Caminho do script de um notebook: ao lado dele ou espelhado em `pasta_saida`."""
+    if pasta_saida is None:
+        return caminho_notebook[:-len('.ipynb')] + '.py'
+    relativo = os.path.relpath(caminho_notebook, base)
+    if relativo.startswith(os.pardir):
+        relativo = os.path.basename(caminho_notebook)
+    return os.path.join(pasta_saida, relativo[:-len('.ipynb')] + '.py')
+
+
+def _hash_arquivo(caminho_arquivo: str) -> str:
+    """SHA-256 do conteúdo do arquivo, lido em blocos."""
+    h = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(1 << 20), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _converter_notebook_em_processo(tarefa: tuple[str, str, str | None, bool]) -> dict:
+    """
+    Converte um notebook em um processo do pool, sem imprimir nada. Pula a
+    conversão quando o hash do conteúdo é igual ao da execução anterior e o
+    script ainda existe.
+    """
+    caminho_notebook, caminho_script, hash_anterior, checkpoints = tarefa
+    try:
+        hash_atual = _hash_arquivo(caminho_notebook)
+        if hash_atual == hash_anterior and os.path.exists(caminho_script):
+            return {'status': 'pulado', 'hash': hash_atual}
+        os.makedirs(os.path.dirname(caminho_script) or '.', exist_ok=True)
+        relator = _Relator('converter_notebook', caminho_notebook, silencioso=True)
+        comandos = _converter_notebook(caminho_notebook, caminho_script, relator, checkpoints)
+        return {'status': 'convertido', 'hash': hash_atual, 'comandos': sorted(comandos)}
+    except Exception as e:
+        return {'status': 'erro', 'erro': f"{type(e).__name__}: {e}"}
+
+
+def _gravar_json_atomico(caminho_arquivo: str, dados: dict):
+    """Grava o JSON em um arquivo temporário e o move para o destino."""
+    pasta = os.path.dirname(caminho_arquivo) or '.'
+    os.makedirs(pasta, exist_ok=True)
+    temporario = f"{caminho_arquivo}.{os.getpid()}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(dados, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(temporario, caminho_arquivo)
+
+
+def converter_notebooks_em_lote(raiz: str | list[str], pasta_saida: str | None = None,
+                                max_workers: int | None = None, manifesto: str | None = None,
+                                forcar: bool = False, caminho_relatorio: str | None = None,
+                                checkpoints: bool = False, silencioso: bool = False) -> ResultadoConversaoLote:
+    """
+    Converte todos os notebooks de uma árvore de pastas em paralelo, em um pool
+    de processos, e gera um único relatório de compatibilidade.
+
+    O hash do conteúdo de cada notebook fica registrado em um manifesto. Nas
+    execuções seguintes, os notebooks que não mudaram (e cujo script ainda
+    existe) são pulados, e os comandos do Jupyter registrados para eles
+    continuam entrando no relatório.
+
+    Args:
+        raiz (str | list[str]): Pasta a ser percorrida (pastas ocultas, como
+                                '.ipynb_checkpoints', são ignoradas) ou uma
+                                lista de notebooks.
+        pasta_saida (str, optional): Pasta dos scripts, espelhando a estrutura
+                                     da raiz. Padrão: ao lado de cada notebook.
+        max_workers (int, optional): Número de processos. Padrão: número de CPUs.
+                                     Com 1, tudo roda no processo atual.
+        manifesto (str, optional): Caminho do manifesto. Padrão:
+                                   '.conversao_notebooks.json' na raiz (ou na
+                                   pasta atual, quando `raiz` é uma lista).
+        forcar (bool): Converte todos os notebooks, ignorando o manifesto.
+        caminho_relatorio (str, optional): Se informado, grava o relatório
+                                           combinado em JSON.
+        checkpoints (bool): Gera scripts com etapas com checkpoint (veja
+                            `converter_notebook_para_py`).
+        silencioso (bool): Desliga as mensagens impressas.
+
+    Returns:
+        ResultadoConversaoLote: Notebooks convertidos, pulados, com erro e os
+                                comandos do Jupyter encontrados.
+    """
+    if isinstance(raiz, str):
+        base = raiz
+        notebooks = _listar_notebooks(raiz)
+    else:
+        base = os.getcwd()
+        notebooks = list(dict.fromkeys(raiz))
+    if manifesto is None:
+        manifesto = os.path.join(base, NOME_MANIFESTO_CONVERSAO)
+    pasta_manifesto = os.path.dirname(os.path.abspath(manifesto))
+
+    relator = _Relator('converter_notebooks_em_lote', f"{len(notebooks)} notebooks", silencioso)
+    relator.mensagem(f"\n--- 🔄 Convertendo {len(notebooks)} notebooks em paralelo ---")
+
+    # As entradas do manifesto usam caminhos relativos à sua pasta, para que
+    # ele continue válido em outro checkout do repositório
+    def chave(caminho: str) -> str:
+        return os.path.relpath(os.path.abspath(caminho), pasta_manifesto)
+
+    anteriores = {}
+    if not forcar and os.path.exists(manifesto):
+        try:
+            with open(manifesto, 'r', encoding='utf-8') as f:
+                anteriores = json.load(f).get('notebooks', {})
+        except (OSError, ValueError) as e:
+            relator.aviso(f"⚠️  Aviso: Manifesto '{manifesto}' ignorado ({e}).")
+
+    tarefas = []
+    for caminho in notebooks:
+        script = _caminho_script(caminho, base, pasta_saida)
+        anterior = anteriores.get(chave(caminho), {})
+        # Um script gerado em outro modo precisa ser convertido de novo
+        mesmo_destino = (anterior.get('script') == chave(script)
+                         and anterior.get('checkpoints', False) == checkpoints)
+        tarefas.append((caminho, script, anterior.get('hash') if mesmo_destino else None, checkpoints))
+
+    max_workers = min(max_workers or os.cpu_count() or 1, max(len(tarefas), 1))
+    with relator.fase('conversao'):
+        if max_workers == 1:
+            saidas = [_converter_notebook_em_processo(t) for t in tarefas]
+        else:
+            # Notebooks costumam ser pequenos: agrupa as tarefas para reduzir
+            # a troca de mensagens com os processos
+            tamanho_lote = max(1, len(tarefas) // (max_workers * 4))
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                saidas = list(executor.map(_converter_notebook_em_processo, tarefas, chunksize=tamanho_lote))
+
+    resultado = ResultadoConversaoLote()
+    # Mantém as entradas de notebooks que não fizeram parte desta execução
+    novos = {k: v for k, v in anteriores.items() if os.path.exists(os.path.join(pasta_manifesto, k))}
+    for (caminho, script, _, _), saida in zip(tarefas, saidas):
+        if saida['status'] == 'erro':
+            resultado.erros[caminho] = saida['erro']
+            novos.pop(chave(caminho), None)
+            continue
+        if saida['status'] == 'pulado':
+            resultado.pulados[caminho] = script
+            comandos = anteriores[chave(caminho)].get('comandos', [])
+        else:
+            resultado.convertidos[caminho] = script
+            comandos = saida['comandos']
+        novos[chave(caminho)] = {'hash': saida['hash'], 'script': chave(script), 'comandos': comandos}
+        if checkpoints:
+            novos[chave(caminho)]['checkpoints'] = True
+        for cmd in comandos:
+            resultado.comandos.setdefault(cmd, []).append(caminho)
+
+    try:
+        _gravar_json_atomico(manifesto, {'versao': 1, 'notebooks': novos})
+    except OSError as e:
+        relator.aviso(f"⚠️  Aviso: Não foi possível gravar o manifesto '{manifesto}' ({e}).")
+
+    relator.metricas.linhas = len(resultado.convertidos)
+    relator.mensagem(f"--- ✅ {len(resultado.convertidos)} convertidos, {len(resultado.pulados)} sem alterações, "
+                     f"{len(resultado.erros)} com erro ---")
+    for caminho, erro in resultado.erros.items():
+        relator.aviso(f"   - ❌ '{caminho}': {erro}")
+    _imprimir_relatorio_compatibilidade(relator, resultado.comandos.keys(), resultado.comandos)
+
+    if caminho_relatorio is not None:
+        _gravar_json_atomico(caminho_relatorio, {
+            'convertidos': resultado.convertidos,
+            'pulados': resultado.pulados,
+            'erros': resultado.erros,
+            'comandos': resultado.comandos,
+        })
+    relator.concluir()
+    return resultado
+
+# ==============================================================================
+# FUNÇÃO 6: OBSERVAÇÃO DE NOTEBOOKS
+# ==============================================================================
+def observar_notebooks(diretorio: str, pasta_saida: str | None = None, intervalo: float = 1.0,
+                       max_ciclos: int | None = None, checkpoints: bool = False, silencioso: bool = False,
+                       ao_registrar: Callable[[str, dict], None] | None = None) -> int:
+    """
+    Observa uma pasta e reconverte os notebooks assim que eles são salvos.
+
+    A pasta é consultada a cada `intervalo` segundos, comparando só a data de
+    modificação e o tamanho de cada notebook. Como as células transformadas
+    ficam memorizadas e o script só é regravado quando muda, reconverter um
+    notebook em que uma célula foi editada custa pouco.
+
+    Args:
+        diretorio (str): Pasta com os notebooks (subpastas ocultas são ignoradas).
+        pasta_saida (str, optional): Pasta dos scripts, espelhando a estrutura
+                                     do diretório. Padrão: ao lado de cada notebook.
+        intervalo (float): Segundos entre duas consultas à pasta.
+        max_ciclos (int, optional): Para depois deste número de consultas.
+                                    Padrão: até Ctrl+C.
+        checkpoints (bool): Gera scripts com etapas com checkpoint (veja
+                            `converter_notebook_para_py`).
+        silencioso (bool): Desliga as mensagens impressas.
+        ao_registrar (callable, optional): Recebe os eventos de cada conversão.
+
+    Returns:
+        int: Número de conversões realizadas.
+    """
+    relator = _Relator('observar_notebooks', diretorio, silencioso, ao_registrar)
+    relator.mensagem(f"--- 👀 Observando '{diretorio}' a cada {intervalo}s (Ctrl+C para parar) ---")
+    vistos: dict[str, tuple[int, int]] = {}
+    conversoes = 0
+    ciclo = 0
+    try:
+        while max_ciclos is None or ciclo < max_ciclos:
+            if ciclo:
+                time.sleep(intervalo)
+            ciclo += 1
+            atuais = {}
+            for caminho in _listar_notebooks(diretorio):
+                try:
+                    estado = os.stat(caminho)
+                except OSError:
+                    continue
+                atuais[caminho] = (estado.st_mtime_ns, estado.st_size)
+                if vistos.get(caminho) == atuais[caminho]:
+                    continue
+                script = _caminho_script(caminho, diretorio, pasta_saida)
+                try:
+                    os.makedirs(os.path.dirname(script) or '.', exist_ok=True)
+                    _converter_notebook(caminho, script, _Relator('converter_notebook', caminho,
+                                                                  silencioso=True, ao_registrar=ao_registrar),
+                                        checkpoints=checkpoints)
+                except Exception as e:
+                    # Um notebook salvo pela metade é tentado de novo quando mudar outra vez
+                    relator.aviso(f"⚠️  Aviso: '{caminho}' não pôde ser convertido ({type(e).__name__}: {e}).")
+                    continue
+                conversoes += 1
+                relator.mensagem(f"✅ '{caminho}' -> '{script}'")
+            vistos = atuais
+    except KeyboardInterrupt:
+        pass
+    relator.mensagem(f"--- ⏹️  Observação encerrada: {conversoes} conversões ---")
+    relator.metricas.linhas = conversoes
+    relator.concluir()
+    return conversoes
+
+# ==============================================================================
+# FUNÇÃO 7: PERFIL DE ARQUIVOS GRANDES (UMA PASSAGEM)
+# ==============================================================================
+QUANTIS_PADRAO = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+class _HyperLogLog:
+    """
+    Contagem aproximada de valores distintos (HyperLogLog), com 2**precisao
+    registradores de um byte. Com a precisão padrão (14), usa 16 KB por coluna
+    e o erro típico fica em torno de 1%.
+    """
+
+    def __init__(self, precisao: int = 14):
+        import numpy as np
+
+        self.precisao = precisao
+        self.registros = np.zeros(1 << precisao, dtype=np.uint8)
+
+    def adicionar(self, hashes):
+        """Registra um array de hashes de 64 bits (uint64)."""
+        import numpy as np
+
+        if not len(hashes):
+            return
+        p = self.precisao
+        indices = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        restantes = hashes << np.uint64(p)
+        # Posição do primeiro bit 1 nos bits restantes (zeros à esquerda + 1)
+        with np.errstate(divide='ignore'):
+            posicao = 64 - np.floor(np.log2(restantes.astype(np.float64)))
+        posicao = np.where(restantes == 0, 64 - p + 1, posicao).astype(np.uint8)
+        np.maximum.at(self.registros, indices, posicao)
+
+    def estimar(self) -> int:
+        import numpy as np
+
+        m = len(self.registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimativa = alfa * m * m / np.sum(np.ldexp(1.0, -self.registros.astype(np.int32)))
+        vazios = int(np.count_nonzero(self.registros == 0))
+        # Correção para cardinalidades pequenas (contagem linear)
+        if estimativa <= 2.5 * m and vazios:
+            estimativa = m * np.log(m / vazios)
+        return int(round(estimativa))
+
+
+class _EsbocoQuantis:
+    """
+    Esboço de quantis no estilo KLL: uma pilha de compactadores em que cada
+    item do nível h representa 2**h valores. Quando um nível passa da sua
+    capacidade, seus itens são ordenados e metade deles (os de posição par ou
+    ímpar, ao acaso) sobe para o nível seguinte. A memória fica em torno de
+    3k valores, independentemente do tamanho do arquivo.
+    """
+
+    def __init__(self, k: int = 200, gerador=None):
+        import numpy as np
+
+        self.k = k
+        self.gerador = gerador if gerador is not None else np.random.default_rng(0)
+        self.niveis = [np.empty(0)]
+
+    def _capacidade(self, nivel: int) -> int:
+        # Os níveis mais baixos (de menor peso) têm capacidade menor
+        return max(2, math.ceil(self.k * (2 / 3) ** (len(self.niveis) - 1 - nivel)))
+
+    def adicionar(self, valores):
+        import numpy as np
+
+        self.niveis[0] = np.concatenate([self.niveis[0], valores])
+        nivel = 0
+        while nivel < len(self.niveis):
+            itens = self.niveis[nivel]
+            if len(itens) > self._capacidade(nivel):
+                if nivel + 1 == len(self.niveis):
+                    self.niveis.append(np.empty(0))
+                itens = np.sort(itens)
+                n_par = len(itens) - len(itens) % 2
+                promovidos = itens[self.gerador.integers(2):n_par:2]
+                self.niveis[nivel] = itens[n_par:]
+                self.niveis[nivel + 1] = np.concatenate([self.niveis[nivel + 1], promovidos])
+            nivel += 1
+
+    def quantis(self, probabilidades) -> list[float]:
+        import numpy as np
+
+        valores = np.concatenate(self.niveis)
+        if not len(valores):
+            return []
+        pesos = np.concatenate([np.full(len(itens), 2.0 ** nivel) for nivel, itens in enumerate(self.niveis)])
+        ordem = np.argsort(valores, kind='stable')
+        valores, acumulado = valores[ordem], np.cumsum(pesos[ordem])
+        posicoes = np.searchsorted(acumulado, np.asarray(probabilidades) * acumulado[-1], side='left')
+        return valores[np.minimum(posicoes, len(valores) - 1)].tolist()
+
+
+@dataclass
+class PerfilColuna:
+    """
+    Resumo de uma coluna calculado por `perfilar_csv`.
+
+    Attributes:
+        nome (str): Nome da coluna.
+        tipo (str): 'inteiro', 'decimal', 'booleano', 'data/hora', 'texto' ou
+                    'vazio' (só nulos), considerando todos os blocos.
+        linhas (int): Total de linhas.
+        nulos (int): Linhas sem valor.
+        distintos_aprox (int): Valores distintos, estimados com HyperLogLog.
+        minimo, maximo: Menor e maior valor (para texto, em ordem alfabética).
+        media, desvio_padrao: Média e desvio padrão amostral (colunas
+                              numéricas, booleanas e de datas).
+        quantis (dict): Probabilidade -> quantil aproximado.
+    """
+    nome: str
+    tipo: str
+    linhas: int
+    nulos: int
+    distintos_aprox: int
+    minimo: object = None
+    maximo: object = None
+    media: object = None
+    desvio_padrao: object = None
+    quantis: dict[float, object] = field(default_factory=dict)
+
+
+@dataclass
+class RelatorioPerfil:
+    """
+    Resultado de `perfilar_csv`.
+
+    Attributes:
+        caminho (str): Arquivo analisado.
+        linhas (int): Total de linhas do arquivo.
+        colunas (dict): Nome da coluna -> `PerfilColuna`.
+        metricas (MetricasExecucao): Tempo por fase, bytes e linhas processados.
+    """
+    caminho: str
+    linhas: int
+    colunas: dict[str, PerfilColuna]
+    metricas: MetricasExecucao
+
+    def como_dataframe(self) -> pd.DataFrame:
+        """Uma linha por coluna do arquivo, com os quantis em colunas 'q<percentual>'."""
+        import pandas as pd
+
+        registros = []
+        for perfil in self.colunas.values():
+            registro = {k: v for k, v in asdict(perfil).items() if k != 'quantis'}
+            registro.update({f"q{q * 100:g}": valor for q, valor in perfil.quantis.items()})
+            registros.append(registro)
+        return pd.DataFrame(registros).set_index('nome')
+
+    def como_dict(self) -> dict:
+        return {
+            'caminho': self.caminho,
+            'linhas': self.linhas,
+            'colunas': {nome: asdict(perfil) for nome, perfil in self.colunas.items()},
+            'metricas': self.metricas.como_dict(),
+        }
+
+
+class _AcumuladorColuna:
+    """Estatísticas de uma coluna, atualizadas bloco a bloco em memória constante."""
+
+    def __init__(self, nome: str, precisao_distintos: int, k_quantis: int, gerador):
+        self.nome = nome
+        self.linhas = 0
+        self.nulos = 0
+        self.tipos: set[str] = set()
+        # Média e soma dos quadrados dos desvios, combinadas entre blocos
+        # pelo método de Chan (extensão do algoritmo de Welford)
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = self.maximo = None
+        self.minimo_texto = self.maximo_texto = None
+        self.datas: bool | None = None
+        self.distintos = _HyperLogLog(precisao_distintos)
+        self.esboco = _EsbocoQuantis(k_quantis, gerador)
+
+    def _classificar(self, validos: pd.Series) -> tuple[str, pd.Series | None]:
+        """Tipo do bloco e, se ele for numérico (ou de datas), os valores como float."""
+        import numpy as np
+        import pandas as pd
+
+        tipos = pd.api.types
+        if tipos.is_bool_dtype(validos):
+            return 'booleano', validos.astype('float64')
+        if tipos.is_numeric_dtype(validos):
+            numeros = validos.astype('float64')
+            # Inteiros com nulos chegam como float
+            inteiro = tipos.is_integer_dtype(validos) or bool(np.all(np.mod(numeros.to_numpy(), 1) == 0))
+            return ('inteiro' if inteiro else 'decimal'), numeros
+        if tipos.is_datetime64_any_dtype(validos):
+            return 'data/hora', validos.astype('datetime64[ns]').astype('int64').astype('float64')
+        if self.datas is not False:
+            texto = validos.astype(str)
+            # Uma amostra pequena descarta rapidamente o texto que não é data
+            amostra = pd.to_datetime(texto.iloc[:100], format='ISO8601', errors='coerce')
+            datas = pd.to_datetime(texto, format='ISO8601', errors='coerce') if amostra.notna().all() else amostra
+            self.datas = bool(datas.notna().all()) and len(datas) == len(texto)
+            if self.datas:
+                datas = datas.dt.tz_localize(None) if datas.dt.tz is not None else datas
+                return 'data/hora', datas.astype('datetime64[ns]').astype('int64').astype('float64')
+        return 'texto', None
+
+    def adicionar(self, serie: pd.Series):
+        import numpy as np
+        import pandas as pd
+
+        self.linhas += len(serie)
+        validos = serie.dropna()
+        self.nulos += len(serie) - len(validos)
+        if validos.empty:
+            return
+        tipo, numeros = self._classificar(validos)
+        self.tipos.add(tipo)
+
+        if numeros is None:
+            texto = validos.astype(str)
+            self.distintos.adicionar(pd.util.hash_pandas_object(texto, index=False).to_numpy())
+            minimo, maximo = texto.min(), texto.max()
+            self.minimo_texto = minimo if self.minimo_texto is None else min(self.minimo_texto, minimo)
+            self.maximo_texto = maximo if self.maximo_texto is None else max(self.maximo_texto, maximo)
+            return
+
+        # Os hashes são sempre de float64, para que 1 e 1.0 contem como o mesmo valor
+        self.distintos.adicionar(pd.util.hash_pandas_object(numeros, index=False).to_numpy())
+        valores = numeros.to_numpy()
+        self.esboco.adicionar(valores)
+        n_bloco = len(valores)
+        media_bloco = float(valores.mean())
+        m2_bloco = float(np.square(valores - media_bloco).sum())
+        delta = media_bloco - self.media
+        total = self.n + n_bloco
+        self.media += delta * n_bloco / total
+        self.m2 += m2_bloco + delta * delta * self.n * n_bloco / total
+        self.n = total
+        minimo, maximo = float(valores.min()), float(valores.max())
+        self.minimo = minimo if self.minimo is None else min(self.minimo, minimo)
+        self.maximo = maximo if self.maximo is None else max(self.maximo, maximo)
+
+    def _tipo_final(self) -> str:
+        if not self.tipos:
+            return 'vazio'
+        if len(self.tipos) == 1:
+            return next(iter(self.tipos))
+        if self.tipos <= {'inteiro', 'decimal', 'booleano'}:
+            return 'decimal'
+        return 'texto'
+
+    def finalizar(self, probabilidades) -> PerfilColuna:
+        import pandas as pd
+
+        tipo = self._tipo_final()
+        perfil = PerfilColuna(self.nome, tipo, self.linhas, self.nulos, self.distintos.estimar())
+        if tipo == 'texto':
+            # Só é possível comparar os textos se nenhum bloco foi numérico
+            if self.tipos == {'texto'}:
+                perfil.minimo, perfil.maximo = self.minimo_texto, self.maximo_texto
+            return perfil
+        if tipo == 'vazio':
+            return perfil
+
+        converter = {
+            'inteiro': lambda v: int(v),
+            'booleano': lambda v: bool(v),
+            'data/hora': lambda v: pd.Timestamp(int(v)),
+        }.get(tipo, float)
+        perfil.minimo, perfil.maximo = converter(self.minimo), converter(self.maximo)
+        desvio = (self.m2 / (self.n - 1)) ** 0.5 if self.n > 1 else None
+        if tipo == 'data/hora':
+            perfil.media = pd.Timestamp(int(self.media))
+            perfil.desvio_padrao = pd.Timedelta(int(desvio), unit='ns') if desvio is not None else None
+        else:
+            perfil.media, perfil.desvio_padrao = self.media, desvio
+        if tipo != 'booleano':
+            perfil.quantis = dict(zip(probabilidades, map(converter, self.esboco.quantis(probabilidades))))
+        return perfil
+
+
+def perfilar_csv(caminho_arquivo: str, linhas_por_bloco: int = 100_000,
+                 bytes_por_bloco: int | None = None, quantis: tuple[float, ...] = QUANTIS_PADRAO,
+                 precisao_distintos: int = 14, k_quantis: int = 200, silencioso: bool = False,
+                 ao_registrar: Callable[[str, dict], None] | None = None,
+                 **opcoes_blocos) -> RelatorioPerfil | None:
+    """
+    Gera um resumo de cada coluna de um arquivo CSV/texto em uma única
+    passagem pelos blocos de `carregar_csv_em_blocos`, sem carregar o arquivo
+    inteiro: substitui o `df.head()`/`df.info()` em arquivos maiores que a memória.
+
+    Para cada coluna são calculados o total de linhas, os nulos, o tipo
+    inferido, o mínimo e o máximo, a média e o desvio padrão (combinados entre
+    blocos pelo método de Welford/Chan), o número aproximado de valores
+    distintos (HyperLogLog) e quantis aproximados (esboço no estilo KLL). A
+    memória usada por coluna é fixa, qualquer que seja o tamanho do arquivo.
+
+    Args:
+        caminho_arquivo (str): Caminho do arquivo a ser analisado.
+        linhas_por_bloco (int): Linhas de cada bloco lido.
+        bytes_por_bloco (int, optional): Tamanho aproximado de cada bloco em bytes.
+        quantis (tuple): Probabilidades dos quantis calculados.
+        precisao_distintos (int): Precisão do HyperLogLog (2**precisao registradores;
+                                  erro típico de 1.04 / sqrt(2**precisao)).
+        k_quantis (int): Tamanho do esboço de quantis; maior é mais preciso.
+        silencioso (bool): Desliga as mensagens impressas.
+        ao_registrar (callable, optional): Recebe os eventos 'fase', 'concluido' e 'erro'.
+        **opcoes_blocos: Repassadas a `carregar_csv_em_blocos` (amostra_bytes, motor, ...).
+
+    Returns:
+        RelatorioPerfil | None: O relatório (veja `como_dataframe()`), ou None em caso de erro.
+    """
+    import numpy as np
+
+    relator = _Relator('perfilar_csv', caminho_arquivo, silencioso, ao_registrar)
+    relator.mensagem(f"--- 🔬 Perfilando '{caminho_arquivo}' em uma passagem ---")
+    leitura = {}
+
+    def registrar_leitura(evento: str, dados: dict):
+        if evento == 'concluido':
+            leitura.update(dados['metricas'])
+
+    try:
+        if not os.path.exists(caminho_arquivo):
+            raise FileNotFoundError(caminho_arquivo)
+        gerador = np.random.default_rng(0)
+        acumuladores: dict[str, _AcumuladorColuna] = {}
+        blocos = carregar_csv_em_blocos(caminho_arquivo, linhas_por_bloco, bytes_por_bloco,
+                                        silencioso=True, ao_registrar=registrar_leitura, **opcoes_blocos)
+        while True:
+            with relator.fase('leitura_csv'):
+                bloco = next(blocos, None)
+            if bloco is None:
+                break
+            with relator.fase('perfil'):
+                for coluna in bloco.columns:
+                    if coluna not in acumuladores:
+                        acumuladores[coluna] = _AcumuladorColuna(coluna, precisao_distintos, k_quantis, gerador)
+                    acumuladores[coluna].adicionar(bloco[coluna])
+            relator.metricas.linhas += len(bloco)
+
+        with relator.fase('perfil'):
+            colunas = {nome: acumulador.finalizar(quantis) for nome, acumulador in acumuladores.items()}
+    except FileNotFoundError as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: O arquivo não foi encontrado em: '{caminho_arquivo}'")
+        return None
+    except Exception as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: Problema inesperado ao perfilar o arquivo: {e}")
+        return None
+
+    for chave in ('codificacao', 'confianca', 'delimitador', 'motor', 'bytes_processados'):
+        setattr(relator.metricas, chave, leitura.get(chave, getattr(relator.metricas, chave)))
+    relatorio = RelatorioPerfil(caminho_arquivo, relator.metricas.linhas, colunas, relator.metricas)
+    relator.mensagem(f"✅ {relatorio.linhas} linhas, {len(colunas)} colunas")
+    if colunas:
+        relator.mensagem(relatorio.como_dataframe().to_string())
+    relator.concluir()
+    return relatorio
+
+# ==============================================================================
+# FUNÇÃO 8: ÍNDICE DE TEMPO PARA LOGS ORDENADOS
+# ==============================================================================
+VERSAO_INDICE_TEMPO = 1
+# Bytes do início do arquivo usados para reconhecer rotação ou truncamento
+BYTES_IDENTIDADE_INDICE = 4096
+
+
+def _caminho_indice_tempo(caminho_arquivo: str) -> str:
+    return f"{caminho_arquivo}.idx.json"
+
+
+def _identidade_cabeca(caminho_arquivo: str, limite: int) -> tuple[int, str]:
+    """Hash dos primeiros bytes do arquivo (até `limite`), que não mudam enquanto ele só cresce."""
+    with open(caminho_arquivo, 'rb') as f:
+        cabeca = f.read(min(limite, BYTES_IDENTIDADE_INDICE))
+    return len(cabeca), hashlib.sha1(cabeca).hexdigest()
+
+
+def _registros_completos(f) -> Iterator[bytes]:
+    """
+    Percorre um arquivo binário a partir da posição atual e entrega os
+    registros completos, juntando as linhas de campos entre aspas com quebras
+    de linha. Uma última linha sem '\\n' (ainda sendo escrita) não é entregue.
+    """
+    pendente = b''
+    for linha in f:
+        if not linha.endswith(b'\n'):
+            return
+        registro = pendente + linha if pendente else linha
+        if registro.count(b'"') % 2:
+            pendente = registro
+            continue
+        pendente = b''
+        yield registro
+
+
+def _novo_indice_tempo(caminho_arquivo: str, coluna: str, linhas_por_entrada: int, amostra_bytes: int,
+                       relator: _Relator) -> dict:
+    """Cria um índice vazio, com o formato do arquivo e a posição onde começam os dados."""
+    formato = _detectar_formato(caminho_arquivo, amostra_bytes, True, relator)
+    _exigir_acesso_por_bytes(formato)
+    cabecalho = _ler_cabecalho(caminho_arquivo, _motores_candidatos(formato['delimitador']), relator,
+                               sep=formato['delimitador'], encoding=formato['codificacao'])
+    nomes = list(cabecalho.columns)
+    if coluna not in nomes:
+        raise ValueError(f"Coluna '{coluna}' não encontrada no arquivo. Colunas: {', '.join(map(str, nomes))}")
+    with open(caminho_arquivo, 'rb') as f:
+        inicio_dados = len(next(_registros_completos(f), b''))
+    return {
+        'versao': VERSAO_INDICE_TEMPO, 'coluna': coluna, 'linhas_por_entrada': linhas_por_entrada,
+        'codificacao': formato['codificacao'], 'delimitador': formato['delimitador'], 'colunas': nomes,
+        'inicio_dados': inicio_dados, 'tamanho': inicio_dados, 'linhas': 0, 'ordenado': True,
+        'identidade': None, 'entradas': [],
+    }
+
+
+def _atualizar_indice_tempo(caminho_arquivo: str, coluna: str, linhas_por_entrada: int, amostra_bytes: int,
+                            relator: _Relator) -> dict:
+    """
+    Núcleo de `construir_indice_tempo`: lê o índice existente e o estende a
+    partir do último byte indexado, ou o reconstrói se o arquivo foi
+    truncado, rotacionado ou indexado com outras opções.
+    """
+    import pandas as pd
+
+    caminho_indice = _caminho_indice_tempo(caminho_arquivo)
+    tamanho_atual = os.path.getsize(caminho_arquivo)
+    indice = None
+    with relator.fase('indice'):
+        with contextlib.suppress(OSError, ValueError):
+            with open(caminho_indice, encoding='utf-8') as f:
+                indice = json.load(f)
+        if indice is not None:
+            opcoes = (indice.get('versao'), indice.get('coluna'), indice.get('linhas_por_entrada'))
+            if opcoes != (VERSAO_INDICE_TEMPO, coluna, linhas_por_entrada):
+                indice = None
+            elif (tamanho_atual < indice['tamanho']
+                  or _identidade_cabeca(caminho_arquivo, indice['identidade'][0]) != tuple(indice['identidade'])):
+                relator.aviso("⚠️  Aviso: O arquivo foi truncado ou substituído desde a indexação. "
+                              "Reconstruindo o índice.")
+                indice = None
+    if indice is None:
+        indice = _novo_indice_tempo(caminho_arquivo, coluna, linhas_por_entrada, amostra_bytes, relator)
+    if tamanho_atual == indice['tamanho']:
+        relator.mensagem(f"✅ Índice de tempo atualizado: {len(indice['entradas'])} entradas, "
+                         f"{indice['linhas']} linhas")
+        return indice
+
+    with relator.fase('indice'):
+        posicao_coluna = indice['colunas'].index(coluna)
+        codificacao, delimitador = indice['codificacao'], indice['delimitador']
+        posicao, linhas, novas = indice['tamanho'], indice['linhas'], []
+        with open(caminho_arquivo, 'rb') as f:
+            f.seek(posicao)
+            for registro in _registros_completos(f):
+                if registro.strip():
+                    if linhas % linhas_por_entrada == 0:
+                        texto = registro.decode(codificacao).rstrip('\r\n')
+                        valor = next(csv.reader([texto], delimiter=delimitador))[posicao_coluna]
+                        novas.append([valor, posicao])
+                    linhas += 1
+                posicao += len(registro)
+        relator.metricas.bytes_processados += posicao - indice['tamanho']
+
+        # O índice só é útil se os tempos das entradas estiverem em ordem
+        valores = [valor for valor, _ in indice['entradas'][-1:] + novas]
+        tempos = pd.to_datetime(pd.Series(valores), errors='coerce')
+        if indice['ordenado'] and not (tempos.notna().all() and tempos.is_monotonic_increasing):
+            relator.aviso(f"⚠️  Aviso: A coluna '{coluna}' não está em ordem crescente; "
+                          "o índice não pode ser usado para intervalos de tempo.")
+            indice['ordenado'] = False
+
+        indice['entradas'].extend(novas)
+        indice['tamanho'], indice['linhas'] = posicao, linhas
+        indice['identidade'] = list(_identidade_cabeca(caminho_arquivo, posicao))
+        _gravar_json_atomico(caminho_indice, indice)
+    relator.mensagem(f"✅ Índice de tempo atualizado: {len(indice['entradas'])} entradas "
+                     f"(+{len(novas)}), {indice['linhas']} linhas")
+    return indice
+
+
+def construir_indice_tempo(caminho_arquivo: str, coluna: str = 'Timestamp', linhas_por_entrada: int = 10_000,
+                           amostra_bytes: int = 20000, silencioso: bool = False,
+                           ao_registrar: Callable[[str, dict], None] | None = None) -> dict | None:
+    """
+    Cria ou estende um índice esparso de tempo para um arquivo ordenado pela
+    coluna `coluna` (como o `log_acessos.tsv`).
+
+    A cada `linhas_por_entrada` linhas, o índice guarda o valor da coluna e a
+    posição em bytes da linha, em um arquivo ao lado dos dados
+    (`<arquivo>.idx.json`), junto com a codificação, o delimitador e o
+    cabeçalho detectados. Quando o arquivo cresce, só as linhas novas são
+    percorridas; se ele for truncado ou substituído (rotação de logs), o
+    índice é reconstruído.
+
+    Args:
+        caminho_arquivo (str): Caminho do arquivo (não comprimido).
+        coluna (str): Coluna de data/hora pela qual o arquivo está ordenado.
+        linhas_por_entrada (int): Intervalo, em linhas, entre entradas do índice.
+        amostra_bytes (int): Bytes usados na detecção da codificação e do delimitador.
+        silencioso (bool): Desliga as mensagens impressas.
+        ao_registrar (callable, optional): Recebe os eventos 'fase', 'concluido' e 'erro'.
+
+    Returns:
+        dict | None: O índice, ou None em caso de erro.
+    """
+    relator = _Relator('construir_indice_tempo', caminho_arquivo, silencioso, ao_registrar)
+    try:
+        indice = _atualizar_indice_tempo(caminho_arquivo, coluna, linhas_por_entrada, amostra_bytes, relator)
+    except FileNotFoundError as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: O arquivo não foi encontrado em: '{caminho_arquivo}'")
+        return None
+    except Exception as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: Não foi possível indexar o arquivo: {e}")
+        return None
+    relator.metricas.linhas = indice['linhas']
+    relator.concluir()
+    return indice
+
+
+def _alinhar_fuso(momento, fuso) -> pd.Timestamp:
+    """Converte `momento` em Timestamp no fuso `fuso` (ou sem fuso), para que possa ser comparado."""
+    import pandas as pd
+
+    momento = pd.Timestamp(momento)
+    if fuso is not None and momento.tzinfo is None:
+        return momento.tz_localize(fuso)
+    if fuso is None and momento.tzinfo is not None:
+        return momento.tz_convert(None)
+    return momento
+
+
+def carregar_intervalo_tempo(caminho_arquivo: str, inicio, fim, coluna: str = 'Timestamp',
+                             linhas_por_entrada: int = 10_000, motor: str | None = None,
+                             amostra_bytes: int = 20000, silencioso: bool = False,
+                             ao_registrar: Callable[[str, dict], None] | None = None,
+                             retornar_metricas: bool = False):
+    """
+    Carrega só as linhas com `inicio <= coluna < fim` de um arquivo ordenado
+    por tempo, sem ler o arquivo inteiro.
+
+    O índice de `construir_indice_tempo` é atualizado (só as linhas novas são
+    percorridas) e consultado por busca binária: a leitura vai direto ao
+    intervalo de bytes entre a última entrada anterior a `inicio` e a
+    primeira entrada a partir de `fim`, com a codificação, o delimitador e o
+    cabeçalho guardados no índice.
+
+    Args:
+        caminho_arquivo (str): Caminho do arquivo (não comprimido).
+        inicio: Início do intervalo (inclusivo); texto ou data/hora.
+        fim: Fim do intervalo (exclusivo); texto ou data/hora.
+        coluna (str): Coluna de data/hora pela qual o arquivo está ordenado.
+        linhas_por_entrada (int): Intervalo, em linhas, entre entradas do índice.
+        motor (str, optional): Força um motor de leitura ('pyarrow', 'c' ou 'python').
+        amostra_bytes (int): Bytes usados na detecção da codificação e do delimitador.
+        silencioso (bool): Desliga as mensagens impressas.
+        ao_registrar (callable, optional): Recebe os eventos 'fase', 'concluido' e 'erro'.
+        retornar_metricas (bool): Se True, retorna `(df, metricas)`.
+
+    Returns:
+        pd.DataFrame | None: As linhas do intervalo, com `coluna` convertida
+                             para data/hora, ou None em caso de erro.
+    """
+    import bisect
+    import pandas as pd
+
+    relator = _Relator('carregar_intervalo_tempo', caminho_arquivo, silencioso, ao_registrar)
+    relator.mensagem(f"--- 🕒 Carregando '{caminho_arquivo}' de {inicio} a {fim} ---")
+    df = None
+    try:
+        indice = _atualizar_indice_tempo(caminho_arquivo, coluna, linhas_por_entrada, amostra_bytes, relator)
+        if not indice['ordenado']:
+            raise ValueError(f"O arquivo não está ordenado por '{coluna}'. "
+                             "Use carregar_csv_inteligente com filtro=")
+        relator.metricas.bytes_processados = 0
+        relator.metricas.codificacao = indice['codificacao']
+        relator.metricas.delimitador = indice['delimitador']
+
+        with relator.fase('indice'):
+            tempos = list(pd.to_datetime(pd.Series([valor for valor, _ in indice['entradas']], dtype=object)))
+            posicoes = [posicao for _, posicao in indice['entradas']]
+            if tempos:
+                fuso = tempos[0].tzinfo
+                inicio_indice, fim_indice = _alinhar_fuso(inicio, fuso), _alinhar_fuso(fim, fuso)
+                # Linhas entre duas entradas têm tempos entre os delas
+                primeira = max(bisect.bisect_left(tempos, inicio_indice) - 1, 0)
+                ultima = bisect.bisect_left(tempos, fim_indice)
+                de = posicoes[primeira]
+                ate = posicoes[ultima] if ultima < len(posicoes) else indice['tamanho']
+            else:
+                de = ate = indice['tamanho']
+
+        with relator.fase('leitura_csv'):
+            with open(caminho_arquivo, 'rb') as f:
+                f.seek(de)
+                trecho = f.read(max(ate - de, 0))
+            relator.metricas.bytes_processados = len(trecho)
+            motores = _motores_candidatos(indice['delimitador'], motor)
+            opcoes_leitura = {'sep': indice['delimitador'], 'encoding': indice['codificacao']}
+            if trecho.strip():
+                opcoes_trecho = _fixar_colunas_texto(caminho_arquivo, motores, relator, opcoes_leitura,
+                                                     em_blocos=True)
+                df, motor_usado = _ler_csv_com_fallback(io.BytesIO(trecho), motores, relator, header=None,
+                                                        names=indice['colunas'], **opcoes_trecho)
+            else:
+                df = _ler_cabecalho(caminho_arquivo, motores, relator, **opcoes_leitura)
+                motor_usado = _motores_sem_pyarrow(motores)[0]
+        with relator.fase('filtro'):
+            df[coluna] = pd.to_datetime(df[coluna])
+            fuso = df[coluna].dt.tz
+            inicio, fim = _alinhar_fuso(inicio, fuso), _alinhar_fuso(fim, fuso)
+            df = df[(df[coluna] >= inicio) & (df[coluna] < fim)].reset_index(drop=True)
+
+        df.attrs['motor_csv'] = motor_usado
+        relator.metricas.motor = motor_usado
+        relator.metricas.linhas = len(df)
+        relator.mensagem(f"✅ {len(df)} linhas lidas de {_formatar_bytes(len(trecho))} "
+                         f"(de {_formatar_bytes(indice['tamanho'])} indexados)")
+        relator.concluir()
+    except FileNotFoundError as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: O arquivo não foi encontrado em: '{caminho_arquivo}'")
+        df = None
+    except Exception as e:
+        relator.falhar(e)
+        relator.mensagem(f"❌ ERRO: Ocorreu um problema inesperado: {e}")
+        df = None
+
+    if retornar_metricas:
+        return df, relator.metricas
+    return df
+
+# ==============================================================================
+# FUNÇÃO 9: CARREGAMENTO ASSÍNCRONO (ASYNCIO)
+# ==============================================================================
+class CarregadorAssincrono:
+    """
+    Versão `async` de `carregar_csv_inteligente` para serviços em asyncio.
+
+    A detecção e a leitura rodam fora do loop de eventos, em um executor:
+    por padrão, um pool de `max_concorrencia` threads. Um
+    `ProcessPoolExecutor` também pode ser passado para que a leitura não
+    dispute o GIL com o loop (as opções precisam, então, ser serializáveis).
+    No máximo `max_concorrencia` carregamentos ficam em andamento ao mesmo
+    tempo: os demais esperam, sem ocupar o executor nem memória.
+
+    Ao cancelar um `carregar`, um carregamento que ainda não começou é
+    descartado. Um que já está em execução não pode ser interrompido; ele
+    termina em segundo plano e só então libera sua vaga, para que uma rajada
+    de cancelamentos não ultrapasse o limite de concorrência.
+
+    Exemplo:
+        async with CarregadorAssincrono(max_concorrencia=4) as carregador:
+            df = await carregador.carregar('log_acessos.tsv', silencioso=True)
+    """
+
+    def __init__(self, max_concorrencia: int = 4, executor=None):
+        import asyncio
+
+        if max_concorrencia < 1:
+            raise ValueError("max_concorrencia deve ser pelo menos 1")
+        self.max_concorrencia = max_concorrencia
+        self._executor = executor
+        self._executor_proprio = None
+        self._vagas = asyncio.Semaphore(max_concorrencia)
+
+    def _obter_executor(self):
+        if self._executor is not None:
+            return self._executor
+        if self._executor_proprio is None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self._executor_proprio = ThreadPoolExecutor(max_workers=self.max_concorrencia,
+                                                        thread_name_prefix='carregador_assincrono')
+        return self._executor_proprio
+
+    async def carregar(self, caminho_arquivo: str, **opcoes_carga):
+        """
+        Carrega o arquivo como `carregar_csv_inteligente(caminho_arquivo, **opcoes_carga)`,
+        sem bloquear o loop de eventos.
+
+        Returns:
+            O mesmo de `carregar_csv_inteligente`: o DataFrame, ou None em caso
+            de erro (ou `(df, metricas)` com `retornar_metricas=True`).
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        await self._vagas.acquire()
+        try:
+            futuro = self._obter_executor().submit(carregar_csv_inteligente, caminho_arquivo, **opcoes_carga)
+        except BaseException:
+            self._vagas.release()
+            raise
+
+        def liberar_vaga(_):
+            # Chamado na thread do executor: a vaga é devolvida no loop
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(self._vagas.release)
+
+        futuro.add_done_callback(liberar_vaga)
+        try:
+            # O shield impede que o cancelamento de quem espera marque a vaga
+            # como livre enquanto o carregamento ainda ocupa o executor
+            return await asyncio.shield(asyncio.wrap_future(futuro))
+        except asyncio.CancelledError:
+            futuro.cancel()
+            raise
+
+    def fechar(self, esperar: bool = True):
+        """Encerra o pool de threads criado pelo carregador (um executor externo não é afetado)."""
+        if self._executor_proprio is not None:
+            self._executor_proprio.shutdown(wait=esperar, cancel_futures=True)
+            self._executor_proprio = None
+
+    async def __aenter__(self) -> CarregadorAssincrono:
+        return self
+
+    async def __aexit__(self, *erro):
+        import asyncio
+
+        await asyncio.get_running_loop().run_in_executor(None, self.fechar)
+
+# ==============================================================================
+# FUNÇÃO 10: RECARGA INCREMENTAL DE ARQUIVOS QUE CRESCEM
+# ==============================================================================
+class _TrechoArquivo(io.RawIOBase):
+    """Arquivo somente leitura restrito aos bytes [inicio, fim) de outro, sem copiá-los."""
+
+    def __init__(self, caminho_arquivo: str, inicio: int, fim: int):
+        super().__init__()
+        self._arquivo = open(caminho_arquivo, 'rb')
+        self._inicio, self._fim = inicio, fim
+        self._arquivo.seek(inicio)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._arquivo.tell() - self._inicio
+
+    def seek(self, posicao: int, de_onde: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: self._inicio, io.SEEK_CUR: self._arquivo.tell(), io.SEEK_END: self._fim}[de_onde]
+        self._arquivo.seek(min(max(base + posicao, self._inicio), self._fim))
+        return self.tell()
+
+    def readinto(self, destino) -> int:
+        restante = self._fim - self._arquivo.tell()
+        if restante <= 0:
+            return 0
+        with memoryview(destino) as visao:
+            return self._arquivo.readinto(visao[:restante])
+
+    def close(self):
+        self._arquivo.close()
+        super().close()
+
+
+def _fim_ultimo_registro(caminho_arquivo: str, inicio: int, fim: int) -> int:
+    """
+    Posição logo depois do último registro completo entre `inicio` (um
+    início de registro) e `fim`. Uma linha sem '\\n' ou um campo entre aspas
+    ainda aberto, de um registro que está sendo escrito, ficam de fora.
+    """
+    if fim <= inicio:
+        return inicio
+    with open(caminho_arquivo, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as dados:
+        quebra = dados.rfind(b'\n', inicio, fim)
+        aspas = _contar_aspas_mapeado(dados, inicio, quebra + 1) if quebra != -1 else 0
+        # Com um número ímpar de aspas, a quebra está dentro de um campo: recua uma linha
+        while quebra != -1 and aspas % 2:
+            anterior = dados.rfind(b'\n', inicio, quebra)
+            aspas -= dados[max(anterior + 1, inicio):quebra + 1].count(b'"')
+            quebra = anterior
+    return quebra + 1 if quebra != -1 else inicio
+
+
+class CarregadorIncremental:
+    """
+    Mantém um DataFrame de um arquivo que só cresce (como o `log_acessos.tsv`)
+    e, a cada `atualizar()`, lê apenas as linhas acrescentadas desde a última vez.
+
+    A primeira atualização detecta a codificação, o delimitador e o cabeçalho
+    e carrega o arquivo até o último registro completo (uma linha ainda sendo
+    escrita fica para a próxima). As seguintes leem só os bytes novos, com o
+    mesmo formato e o mesmo motor de leitura, e os acrescentam ao DataFrame.
+    Se o arquivo diminuir, for trocado por outro (rotação) ou tiver o início
+    alterado, o arquivo é carregado de novo do zero.
+
+    Exemplo:
+        log = CarregadorIncremental('log_acessos.tsv')
+        log.atualizar()          # carga completa
+        novas = log.atualizar()  # só as linhas acrescentadas
+        log.df                   # todas as linhas lidas até agora
+
+    Attributes:
+        df (pd.DataFrame | None): Todas as linhas lidas até agora.
+        posicao (int): Byte seguinte ao último registro já lido.
+        ultima_atualizacao (str | None): 'carga_completa', 'incremental' ou
+                                         'sem_mudancas'.
+        metricas (MetricasExecucao | None): Métricas da última atualização.
+    """
+
+    def __init__(self, caminho_arquivo: str, amostra_bytes: int = 20000, motor: str | None = None,
+                 usar_cache: bool = True, silencioso: bool = False,
+                 ao_registrar: Callable[[str, dict], None] | None = None):
+        self.caminho_arquivo = caminho_arquivo
+        self.amostra_bytes = amostra_bytes
+        self.motor = motor
+        self.usar_cache = usar_cache
+        self.silencioso = silencioso
+        self.ao_registrar = ao_registrar
+        self.posicao = 0
+        self.ultima_atualizacao = None
+        self.metricas = None
+        self._partes: list[pd.DataFrame] = []
+        self._opcoes_leitura: dict = {}
+        self._motores: list[str] = []
+        self._colunas: list[str] = []
+        self._identidade = None
+
+    @property
+    def df(self) -> pd.DataFrame | None:
+        # As partes acrescentadas só são juntadas quando o DataFrame é pedido
+        if len(self._partes) > 1:
+            import pandas as pd
+
+            self._partes = [pd.concat(self._partes, ignore_index=True)]
+        return self._partes[0] if self._partes else None
+
+    def _mudou(self, estado: os.stat_result) -> bool:
+        """Indica se o arquivo foi truncado, substituído ou alterado antes da posição já lida."""
+        if self._identidade is None:
+            return True
+        dispositivo, inode, tamanho_cabeca, hash_cabeca = self._identidade
+        return ((estado.st_dev, estado.st_ino) != (dispositivo, inode)
+                or estado.st_size < self.posicao
+                or _identidade_cabeca(self.caminho_arquivo, tamanho_cabeca) != (tamanho_cabeca, hash_cabeca))
+
+    def _guardar_identidade(self):
+        estado = os.stat(self.caminho_arquivo)
+        self._identidade = (estado.st_dev, estado.st_ino,
+                            *_identidade_cabeca(self.caminho_arquivo, self.posicao))
+
+    def _carga_completa(self, relator: _Relator) -> pd.DataFrame:
+        formato = _detectar_formato(self.caminho_arquivo, self.amostra_bytes, self.usar_cache, relator)
+        _exigir_acesso_por_bytes(formato)
+        motores = _motores_candidatos(formato['delimitador'], self.motor)
+        with relator.fase('leitura_csv'):
+            fim = _fim_ultimo_registro(self.caminho_arquivo, 0, os.path.getsize(self.caminho_arquivo))
+            self._opcoes_leitura = _fixar_colunas_texto(
+                self.caminho_arquivo, motores, relator,
+                {'sep': formato['delimitador'], 'encoding': formato['codificacao']}, em_blocos=True
+            )
+            with io.BufferedReader(_TrechoArquivo(self.caminho_arquivo, 0, fim)) as trecho:
+                df, motor_usado = _ler_csv_com_fallback(trecho, motores, relator, **self._opcoes_leitura)
+        # As próximas leituras usam o mesmo motor, para manter os mesmos tipos
+        self._motores = [motor_usado, *MOTORES_CSV[MOTORES_CSV.index(motor_usado) + 1:]]
+        self._colunas = list(df.columns)
+        self._partes = [df]
+        self.posicao = fim
+        relator.metricas.bytes_processados = fim
+        return df
+
+    def _carga_incremental(self, tamanho: int, relator: _Relator) -> pd.DataFrame | None:
+        with relator.fase('leitura_csv'):
+            fim = _fim_ultimo_registro(self.caminho_arquivo, self.posicao, tamanho)
+            if fim == self.posicao:
+                # Nenhum registro completo novo (só uma linha ainda sendo escrita)
+                return None
+            sem_linhas = not any(len(parte) for parte in self._partes)
+            if sem_linhas:
+                # O arquivo começou só com o cabeçalho, e os tipos da carga
+                # completa não vieram de dados: são inferidos agora
+                self._opcoes_leitura = _fixar_colunas_texto(
+                    self.caminho_arquivo, self._motores, relator,
+                    {'sep': self._opcoes_leitura['sep'], 'encoding': self._opcoes_leitura['encoding']},
+                    em_blocos=True
+                )
+            with io.BufferedReader(_TrechoArquivo(self.caminho_arquivo, self.posicao, fim)) as trecho:
+                novas, motor_usado = _ler_csv_com_fallback(
+                    trecho, self._motores, relator, header=None, names=self._colunas, **self._opcoes_leitura
+                )
+            relator.metricas.bytes_processados = fim - self.posicao
+            self.posicao = fim
+            if novas.empty:
+                # Só linhas em branco
+                return None
+            if sem_linhas:
+                self._partes = [novas]
+                return novas
+            # Mantém os tipos já usados no DataFrame, quando as linhas novas os admitem
+            for coluna, tipo in self._partes[0].dtypes.items():
+                if novas[coluna].dtype != tipo:
+                    with contextlib.suppress(TypeError, ValueError):
+                        novas[coluna] = novas[coluna].astype(tipo)
+        self._partes.append(novas)
+        return novas
+
+    def atualizar(self) -> pd.DataFrame | None:
+        """
+        Lê o que foi acrescentado ao arquivo desde a última atualização.
+
+        Returns:
+            pd.DataFrame | None: As linhas lidas nesta atualização (o arquivo
+                                 inteiro, na primeira vez ou após rotação; um
+                                 DataFrame vazio se nada mudou), ou None em
+                                 caso de erro. O DataFrame completo fica em `df`.
+        """
+        relator = _Relator('carregar_incremental', self.caminho_arquivo, self.silencioso, self.ao_registrar)
+        self.metricas = relator.metricas
+        try:
+            estado = os.stat(self.caminho_arquivo)
+            with relator.fase('verificacao'):
+                recarregar = not self._partes or self._mudou(estado)
+            if recarregar:
+                if self._partes:
+                    relator.aviso("⚠️  Aviso: O arquivo foi truncado ou substituído. Carregando do início.")
+                else:
+                    relator.mensagem(f"--- 🚀 Carregando '{self.caminho_arquivo}' ---")
+                lidas = self._carga_completa(relator)
+                self.ultima_atualizacao = 'carga_completa'
+            else:
+                lidas = None
+                if estado.st_size > self.posicao:
+                    lidas = self._carga_incremental(estado.st_size, relator)
+                self.ultima_atualizacao = 'incremental' if lidas is not None else 'sem_mudancas'
+                if lidas is None:
+                    lidas = self._partes[0].iloc[0:0]
+            self._guardar_identidade()
+        except FileNotFoundError as e:
+            relator.falhar(e)
+            relator.mensagem(f"❌ ERRO: O arquivo não foi encontrado em: '{self.caminho_arquivo}'")
+            return None
+        except Exception as e:
+            relator.falhar(e)
+            relator.mensagem(f"❌ ERRO: Ocorreu um problema inesperado: {e}")
+            return None
+
+        relator.metricas.linhas = len(lidas)
+        relator.metricas.motor = self._motores[0] if self._motores else None
+        relator.mensagem(f"✅ {len(lidas)} linhas lidas ({self.ultima_atualizacao}); "
+                         f"total: {sum(len(parte) for parte in self._partes)}")
+        relator.concluir()
+        return lidas
+
+# ==============================================================================
+# FUNÇÃO 11: CHECKPOINTS DOS SCRIPTS GERADOS
+# ==============================================================================
+class CheckpointsEtapas:
+    """
+    Executa as etapas dos scripts gerados com
+    `converter_notebook_para_py(..., checkpoints=True)`, guardando em disco as
+    variáveis produzidas por cada uma.
+
+    A chave de cada etapa combina o hash do seu código, a chave da etapa
+    anterior e a identidade (tamanho e mtime) dos arquivos que ela lê. Se a
+    chave é a mesma da execução anterior, as variáveis da etapa são
+    restauradas e o código é pulado; como as chaves são encadeadas, a
+    execução recomeça de fato na primeira etapa alterada. Depois de uma etapa
+    que lê arquivos de caminho desconhecido, as seguintes deixam de ser
+    restauradas (e guardadas) nessa execução. DataFrames são
+    guardados em Parquet (ou pickle, se não for possível), módulos pelo nome
+    e os demais valores com pickle. Etapas que definem funções ou classes
+    usadas depois, ou cujas variáveis não podem ser guardadas, são sempre
+    executadas.
+
+    Os checkpoints ficam em '<script>.checkpoints/', ao lado do script.
+    """
+
+    def __init__(self, caminho_script: str, namespace: dict, pasta: str | None = None, silencioso: bool = False):
+        self.pasta = pasta or os.path.splitext(os.path.abspath(caminho_script))[0] + '.checkpoints'
+        self.namespace = namespace
+        self._relator = _Relator('checkpoints', caminho_script, silencioso)
+        self._chave_anterior = ''
+        self._encadeamento_valido = True
+        self._etapa = None
+
+    def _caminho_manifesto(self, nome: str) -> str:
+        return os.path.join(self.pasta, f"{nome}.json")
+
+    @staticmethod
+    def _identidade_entrada(caminho_arquivo: str) -> list:
+        try:
+            estado = os.stat(caminho_arquivo)
+        except OSError:
+            return [caminho_arquivo, None, None]
+        return [caminho_arquivo, estado.st_size, estado.st_mtime_ns]
+
+    def iniciar(self, nome: str, hash_codigo: str, entradas: list[str] = (), variaveis: list[str] = (),
+                armazenar: bool = True, entradas_desconhecidas: bool = False) -> bool:
+        """
+        Calcula a chave da etapa e, se houver um checkpoint válido, restaura
+        suas variáveis.
+
+        Args:
+            armazenar (bool): Se False, a etapa é sempre executada.
+            entradas_desconhecidas (bool): Se True, a etapa lê arquivos que
+                                           não estão em `entradas`, então as
+                                           etapas seguintes não podem mais
+                                           confiar na chave encadeada.
+
+        Returns:
+            bool: True se a etapa precisa ser executada.
+        """
+        identidade = [hash_codigo, self._chave_anterior, [self._identidade_entrada(c) for c in entradas]]
+        chave = hashlib.sha256(json.dumps(identidade).encode('utf-8')).hexdigest()
+        self._chave_anterior = chave
+        self._etapa = None
+        if entradas_desconhecidas:
+            self._encadeamento_valido = False
+        if not armazenar or not self._encadeamento_valido:
+            return True
+
+        manifesto = None
+        with contextlib.suppress(OSError, ValueError):
+            with open(self._caminho_manifesto(nome), encoding='utf-8') as f:
+                manifesto = json.load(f)
+        if manifesto is not None and manifesto.get('chave') == chave and manifesto.get('armazenavel'):
+            try:
+                valores = {variavel: self._ler_valor(descricao)
+                           for variavel, descricao in manifesto['variaveis'].items()}
+            except Exception as e:
+                self._relator.aviso(f"⚠️  Aviso: Checkpoint da etapa '{nome}' ilegível ({e}). Executando a etapa.")
+            else:
+                self.namespace.update(valores)
+                self._relator.mensagem(f"⏩ Etapa '{nome}' restaurada do checkpoint")
+                return False
+        self._etapa = (nome, chave, list(variaveis))
+        self._relator.mensagem(f"▶️  Executando a etapa '{nome}'")
+        return True
+
+    def salvar(self):
+        """Guarda as variáveis da etapa em execução junto com a sua chave."""
+        if self._etapa is None:
+            return
+        nome, chave, variaveis = self._etapa
+        self._etapa = None
+        os.makedirs(self.pasta, exist_ok=True)
+        descricoes, armazenavel = {}, True
+        for variavel in variaveis:
+            if variavel not in self.namespace:
+                continue
+            try:
+                descricoes[variavel] = self._gravar_valor(nome, variavel, self.namespace[variavel])
+            except Exception as e:
+                self._relator.aviso(f"⚠️  Aviso: A variável '{variavel}' da etapa '{nome}' não pode ser guardada "
+                                    f"({e}). A etapa será sempre executada.")
+                armazenavel = False
+                break
+        _gravar_json_atomico(self._caminho_manifesto(nome),
+                             {'chave': chave, 'armazenavel': armazenavel, 'variaveis': descricoes})
+
+    def _gravar_valor(self, nome: str, variavel: str, valor) -> dict:
+        import pickle
+        import types
+
+        if isinstance(valor, types.ModuleType):
+            return {'modulo': valor.__name__}
+        # Funções, classes e objetos definidos no próprio script não podem ser
+        # recriados sem executar a etapa que os define
+        modulo_script = self.namespace.get('__name__')
+        if modulo_script in (getattr(valor, '__module__', None), type(valor).__module__):
+            raise ValueError("definida no próprio script")
+
+        caminho_base = os.path.join(self.pasta, f"{nome}-{variavel}")
+        pd = sys.modules.get('pandas')
+        if pd is not None and isinstance(valor, pd.DataFrame) and importlib.util.find_spec('pyarrow') is not None:
+            try:
+                valor.to_parquet(f"{caminho_base}.parquet.tmp")
+                os.replace(f"{caminho_base}.parquet.tmp", f"{caminho_base}.parquet")
+                return {'parquet': os.path.basename(f"{caminho_base}.parquet")}
+            except Exception:
+                # Colunas com nomes ou tipos que o Parquet não aceita: usa pickle
+                with contextlib.suppress(OSError):
+                    os.remove(f"{caminho_base}.parquet.tmp")
+        with open(f"{caminho_base}.pkl.tmp", 'wb') as f:
+            pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{caminho_base}.pkl.tmp", f"{caminho_base}.pkl")
+        return {'pickle': os.path.basename(f"{caminho_base}.pkl")}
+
+    def _ler_valor(self, descricao: dict):
+        import importlib
+        import pickle
+
+        if 'modulo' in descricao:
+            return importlib.import_module(descricao['modulo'])
+        if 'parquet' in descricao:
+            import pandas as pd
+            return pd.read_parquet(os.path.join(self.pasta, descricao['parquet']))
+        with open(os.path.join(self.pasta, descricao['pickle']), 'rb') as f:
+            return pickle.load(f)
+
+    def limpar(self):
+        """Apaga todos os checkpoints do script."""
+        import shutil
+
+        shutil.rmtree(self.pasta, ignore_errors=True)
+
+# ==============================================================================
+# LINHA DE COMANDO
+# ==============================================================================
+def _cli_carregar(args) -> int:
+    df = carregar_csv_inteligente(args.caminho, amostra_bytes=args.amostra_bytes, motor=args.motor,
+                                  usar_cache=not args.sem_cache, otimizar_memoria=args.otimizar_memoria,
+                                  cache_colunar=args.cache_colunar, colunas=args.colunas,
+                                  filtro=args.filtro, n_processos=args.processos,
+                                  silencioso=args.silencioso)
+    if df is None:
+        return 1
+    print(f"\n{len(df)} linhas x {len(df.columns)} colunas")
+    if args.linhas > 0:
+        print(df.head(args.linhas).to_string())
+    return 0
+
+
+def _cli_detectar(args) -> int:
+    resultados, codigo = {}, 0
+    for caminho in args.caminhos:
+        relator = _Relator('detectar_formato', caminho, silencioso=args.json)
+        relator.mensagem(f"\n--- 🔎 Detectando o formato de '{caminho}' ---")
+        try:
+            formato = _detectar_formato(caminho, args.amostra_bytes, not args.sem_cache, relator)
+            with relator.fase('deteccao_cabecalho'):
+                tem_cabecalho = _detectar_cabecalho(caminho, formato, args.amostra_bytes, not args.sem_cache)
+            relator.mensagem(f"✅ Cabeçalho: {'sim' if tem_cabecalho else 'não'}")
+            resultados[caminho] = {**formato, 'tem_cabecalho': tem_cabecalho}
+            relator.concluir()
+        except (OSError, ValueError) as e:
+            relator.falhar(e)
+            print(f"❌ ERRO: Não foi possível detectar o formato de '{caminho}': {e}", file=sys.stderr)
+            codigo = 1
+    if args.json:
+        print(json.dumps(resultados, ensure_ascii=False, indent=2))
+    return codigo
+
+
+def _cli_converter(args) -> int:
+    if args.observar:
+        if len(args.caminhos) != 1 or not os.path.isdir(args.caminhos[0]):
+            args.parser.error("--observar exige uma única pasta")
+        observar_notebooks(args.caminhos[0], pasta_saida=args.saida, intervalo=args.intervalo,
+                           checkpoints=args.checkpoints, silencioso=args.silencioso)
+        return 0
+
+    # Uma única pasta usa o manifesto dela; notebooks avulsos, o da pasta atual
+    if len(args.caminhos) == 1 and os.path.isdir(args.caminhos[0]):
+        raiz = args.caminhos[0]
+    else:
+        raiz = []
+        for caminho in args.caminhos:
+            raiz.extend(_listar_notebooks(caminho) if os.path.isdir(caminho) else [caminho])
+    resultado = converter_notebooks_em_lote(raiz, pasta_saida=args.saida, max_workers=args.workers,
+                                            manifesto=args.manifesto, forcar=args.forcar,
+                                            caminho_relatorio=args.relatorio, checkpoints=args.checkpoints,
+                                            silencioso=args.silencioso)
+    return 1 if resultado.erros else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Ponto de entrada da linha de comando.
+
+    Como o pandas, o chardet e o nbformat só são importados quando usados,
+    'detectar' e 'converter' iniciam sem pagar a importação do pandas.
+
+    Exemplos:
+        python ferramentas_analista.py carregar relatorio_vendas_BR.csv --linhas 10
+        python ferramentas_analista.py detectar exportacoes/*.csv --json
+        python ferramentas_analista.py converter notebooks/ --saida scripts/ --workers 8
+
+    Returns:
+        int: Código de saída (1 se algum arquivo falhou).
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='ferramentas_analista',
+                                     description="Caixa de Ferramentas do Analista de Dados")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    carregador = subparsers.add_parser('carregar', aliases=['load'],
+                                       help="Carrega um CSV/texto e mostra as primeiras linhas")
+    carregador.add_argument('caminho', help="Arquivo a ser carregado")
+    carregador.add_argument('--linhas', type=int, default=5, help="Linhas exibidas (padrão: 5)")
+    carregador.add_argument('--motor', choices=MOTORES_CSV, help="Força um motor de leitura")
+    carregador.add_argument('--otimizar-memoria', action='store_true', help="Escolhe tipos mais econômicos")
+    carregador.add_argument('--cache-colunar', choices=FORMATOS_CACHE_COLUNAR,
+                            help="Grava/lê uma cópia colunar do resultado")
+    carregador.add_argument('--colunas', nargs='+', help="Colunas a serem lidas")
+    carregador.add_argument('--filtro', help="Filtro de linhas (ex: \"Status_Code == 401\")")
+    carregador.add_argument('--processos', type=int, help="Lê o arquivo dividido em N processos")
+    carregador.set_defaults(executar=_cli_carregar)
+
+    detector = subparsers.add_parser('detectar', aliases=['sniff'],
+                                     help="Detecta codificação, delimitador e cabeçalho, sem carregar")
+    detector.add_argument('caminhos', nargs='+', help="Arquivos a serem analisados")
+    detector.add_argument('--json', action='store_true', help="Imprime o resultado em JSON")
+    detector.set_defaults(executar=_cli_detectar)
+
+    for subparser in (carregador, detector):
+        subparser.add_argument('--amostra-bytes', type=int, default=20000,
+                               help="Bytes de cada amostra usada na detecção")
+        subparser.add_argument('--sem-cache', action='store_true', help="Ignora o cache da detecção")
+    carregador.add_argument('--silencioso', action='store_true', help="Não imprime a detecção")
+
+    conversor = subparsers.add_parser('converter', aliases=['convert'],
+                                      help="Converte notebooks (.ipynb) em scripts (.py)")
+    conversor.add_argument('caminhos', nargs='+', help="Pastas ou notebooks")
+    conversor.add_argument('--saida', help="Pasta dos scripts (padrão: ao lado de cada notebook)")
+    conversor.add_argument('--workers', type=int, help="Número de processos (padrão: número de CPUs)")
+    conversor.add_argument('--manifesto', help=f"Manifesto de hashes (padrão: {NOME_MANIFESTO_CONVERSAO} na pasta)")
+    conversor.add_argument('--forcar', action='store_true', help="Converte tudo, ignorando o manifesto")
+    conversor.add_argument('--relatorio', help="Grava o relatório combinado em JSON")
+    conversor.add_argument('--checkpoints', action='store_true',
+                           help="Gera etapas com checkpoint, puladas quando nada mudou")
+    conversor.add_argument('--silencioso', action='store_true', help="Não imprime mensagens")
+    conversor.add_argument('--observar', action='store_true',
+                           help="Fica observando a pasta e reconverte os notebooks alterados")
+    conversor.add_argument('--intervalo', type=float, default=1.0,
+                           help="Segundos entre as consultas à pasta no modo --observar")
+    conversor.set_defaults(executar=_cli_converter, parser=conversor)
+
+    args = parser.parse_args(argv)
+    return args.executar(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
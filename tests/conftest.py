@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def pasta_cache(tmp_path, monkeypatch):
+    """Isola o cache de detecção e o cache colunar de cada teste."""
+    import ferramentas_analista as fa
+
+    pasta = tmp_path / 'cache'
+    monkeypatch.setenv('FERRAMENTAS_ANALISTA_CACHE', str(pasta))
+    monkeypatch.setattr(fa, '_cache_deteccao', fa.CacheDeteccao(str(pasta / 'deteccao.json')))
+    monkeypatch.setattr(fa, '_cache_colunar', fa.CacheColunar(str(pasta / 'colunar')))
+    return pasta
+
+
+@pytest.fixture
+def log_acessos(tmp_path):
+    """Um log no formato do `log_acessos.tsv`, com alguns milhares de linhas."""
+    caminho = tmp_path / 'log_acessos.tsv'
+    linhas = ['Timestamp\tIP_Address\tEndpoint\tStatus_Code\tCodigo\tData']
+    for i in range(6000):
+        # 'Codigo' só tem letras no começo: lido bloco a bloco, viraria número nos blocos seguintes
+        codigo = f"A{i}" if i < 50 else str(i)
+        linhas.append(f"2025-08-17T{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}Z\t10.0.0.{i % 7}"
+                      f"\t/api/{i % 5}\t{(200, 401, 404)[i % 3]}\t{codigo}\t2025-08-{1 + i % 28:02d}")
+    caminho.write_text('\n'.join(linhas) + '\n', encoding='utf-8')
+    return str(caminho)
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+
+def test_resultado_igual_ao_carregamento_sincrono(log_acessos):
+    async def carregar():
+        async with fa.CarregadorAssincrono(max_concorrencia=2) as carregador:
+            return await asyncio.gather(*(carregador.carregar(log_acessos, silencioso=True) for _ in range(3)))
+
+    esperado = fa.carregar_csv_inteligente(log_acessos, silencioso=True)
+    for df in asyncio.run(carregar()):
+        pd.testing.assert_frame_equal(df, esperado)
+
+
+def test_max_concorrencia_limita_carregamentos_simultaneos(monkeypatch):
+    trava = threading.Lock()
+    ativos = {'agora': 0, 'maximo': 0}
+
+    def carregar_lento(caminho, **opcoes):
+        with trava:
+            ativos['agora'] += 1
+            ativos['maximo'] = max(ativos['maximo'], ativos['agora'])
+        threading.Event().wait(0.05)
+        with trava:
+            ativos['agora'] -= 1
+        return caminho
+
+    monkeypatch.setattr(fa, 'carregar_csv_inteligente', carregar_lento)
+
+    async def carregar():
+        # O executor externo tem folga: quem limita é o carregador
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            carregador = fa.CarregadorAssincrono(max_concorrencia=2, executor=executor)
+            return await asyncio.gather(*(carregador.carregar(f'arquivo_{i}.csv') for i in range(6)))
+
+    assert asyncio.run(carregar()) == [f'arquivo_{i}.csv' for i in range(6)]
+    assert ativos['maximo'] == 2
+
+
+@pytest.mark.parametrize('max_concorrencia', [1, 2])
+def test_cancelamento_descarta_carregamento_que_nao_comecou(monkeypatch, max_concorrencia):
+    liberar = threading.Event()
+    iniciados = []
+
+    def carregar_bloqueado(caminho, **opcoes):
+        iniciados.append(caminho)
+        liberar.wait(5)
+        return caminho
+
+    monkeypatch.setattr(fa, 'carregar_csv_inteligente', carregar_bloqueado)
+
+    async def carregar():
+        # Com max_concorrencia=1 o segundo espera uma vaga; com 2, espera na fila do executor
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            carregador = fa.CarregadorAssincrono(max_concorrencia=max_concorrencia, executor=executor)
+            primeiro = asyncio.create_task(carregador.carregar('primeiro.csv'))
+            segundo = asyncio.create_task(carregador.carregar('segundo.csv'))
+            await asyncio.sleep(0.05)
+            segundo.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await segundo
+            liberar.set()
+            resultado = await primeiro
+            # A vaga do cancelado volta: um novo carregamento ainda passa
+            return resultado, await carregador.carregar('terceiro.csv')
+
+    assert asyncio.run(carregar()) == ('primeiro.csv', 'terceiro.csv')
+    assert iniciados == ['primeiro.csv', 'terceiro.csv']
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+
+def test_blocos_por_tamanho_em_bytes(log_acessos):
+    inteiro = fa.carregar_csv_inteligente(log_acessos, silencioso=True)
+    bytes_por_linha = fa._detectar_formato(log_acessos, 20000)['bytes_por_linha']
+    linhas_por_bloco = int(20_000 / bytes_por_linha)
+
+    blocos = list(fa.carregar_csv_em_blocos(log_acessos, bytes_por_bloco=20_000, silencioso=True))
+
+    assert len(blocos) == -(-len(inteiro) // linhas_por_bloco)
+    assert all(len(bloco) == linhas_por_bloco for bloco in blocos[:-1])
+    assert blocos[1].index[0] == linhas_por_bloco
+    pd.testing.assert_frame_equal(pd.concat(blocos), inteiro)
+
+
+def test_motor_pyarrow_nao_le_em_blocos(log_acessos):
+    with pytest.raises(ValueError, match='pyarrow'):
+        next(fa.carregar_csv_em_blocos(log_acessos, motor='pyarrow', silencioso=True))
+
+
+def test_erro_no_meio_da_leitura_e_propagado(log_acessos):
+    with open(log_acessos, encoding='utf-8') as f:
+        linhas = f.readlines()
+    linhas[2500] = linhas[2500].rstrip('\n') + '\tcampo\textra\n'
+    with open(log_acessos, 'w', encoding='utf-8') as f:
+        f.writelines(linhas)
+    blocos = fa.carregar_csv_em_blocos(log_acessos, linhas_por_bloco=1000, motor='c', silencioso=True)
+
+    assert len(next(blocos)) == 1000
+    with pytest.raises(ValueError):
+        list(blocos)
+
+
+def test_arquivo_inexistente_nao_gera_blocos(tmp_path):
+    assert list(fa.carregar_csv_em_blocos(str(tmp_path / 'nao_existe.csv'), silencioso=True)) == []
@@ -0,0 +1,78 @@
+import os
+
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+
+@pytest.mark.parametrize('otimizar_memoria', [False, True])
+@pytest.mark.parametrize('formato', fa.FORMATOS_CACHE_COLUNAR)
+def test_leitura_do_cache_igual_a_leitura_do_csv(log_acessos, formato, otimizar_memoria):
+    falta = fa.carregar_csv_inteligente(log_acessos, cache_colunar=formato,
+                                        otimizar_memoria=otimizar_memoria, silencioso=True)
+    acerto = fa.carregar_csv_inteligente(log_acessos, cache_colunar=formato,
+                                         otimizar_memoria=otimizar_memoria, silencioso=True)
+
+    assert 'cache_colunar' not in falta.attrs
+    assert os.path.exists(acerto.attrs.pop('cache_colunar'))
+    assert acerto.attrs == falta.attrs
+    pd.testing.assert_frame_equal(acerto, falta)
+
+
+def test_gravacao_preserva_outras_variantes(log_acessos):
+    fa.carregar_csv_inteligente(log_acessos, cache_colunar='parquet', silencioso=True)
+    fa.carregar_csv_inteligente(log_acessos, cache_colunar='parquet', colunas=['Endpoint'], silencioso=True)
+    fa.carregar_csv_inteligente(log_acessos, cache_colunar='feather', silencioso=True)
+    assert fa.info_cache_colunar()['total_copias'] == 3
+
+    # Com a origem alterada, só a cópia da mesma variante e formato é trocada
+    with open(log_acessos, 'a', encoding='utf-8') as f:
+        f.write('2025-08-18T00:00:00Z\t10.0.0.1\t/api/0\t200\t1\t2025-08-18\n')
+    df = fa.carregar_csv_inteligente(log_acessos, cache_colunar='parquet', silencioso=True)
+    assert 'cache_colunar' not in df.attrs
+    assert fa.info_cache_colunar()['total_copias'] == 3
+
+
+@pytest.mark.parametrize('formato', fa.FORMATOS_CACHE_COLUNAR)
+def test_tipos_e_attrs_restaurados(tmp_path, formato):
+    origem = tmp_path / 'origem.csv'
+    origem.write_text('x\n1\n', encoding='utf-8')
+    df = pd.DataFrame({
+        'quando': pd.to_datetime(['2025-08-17 11:20:05', '2025-08-17 11:21:10']).astype('datetime64[s]'),
+        'status': pd.Series([200, 401], dtype='int16'),
+        'categoria': pd.Series(['a', 'b'], dtype='category'),
+    })
+    df.attrs = {'motor_csv': 'c', 'memoria': {'otimizada': 10}}
+    cache = fa.CacheColunar(str(tmp_path / 'colunar'))
+
+    cache.gravar(str(origem), formato, {}, df)
+    lido = cache.ler(str(origem), formato, {})
+
+    assert lido.attrs.pop('cache_colunar')
+    assert lido.attrs == df.attrs
+    pd.testing.assert_frame_equal(lido, df)
+
+
+def test_limite_remove_as_copias_usadas_ha_mais_tempo(tmp_path):
+    df = pd.DataFrame({'produto': ['Café', 'Chá', 'Pão'] * 100, 'preco': range(300)})
+    origens = []
+    for nome in ('a', 'b', 'c'):
+        origem = tmp_path / f'{nome}.csv'
+        origem.write_text('x\n1\n', encoding='utf-8')
+        origens.append(str(origem))
+    cache = fa.CacheColunar(str(tmp_path / 'colunar'))
+
+    cache.gravar(origens[0], 'parquet', {}, df)
+    cache.limite_bytes = int(cache.info()['total_bytes'] * 2.5)
+    cache.gravar(origens[1], 'parquet', {}, df)
+    for instante, origem in enumerate(origens[:2]):
+        os.utime(cache.ler(origem, 'parquet', {}).attrs['cache_colunar'], (instante, instante))
+    # Ler a cópia de 'a' a torna a mais recente
+    assert cache.ler(origens[0], 'parquet', {}) is not None
+    cache.gravar(origens[2], 'parquet', {}, df)
+
+    assert cache.info()['total_copias'] == 2
+    assert cache.ler(origens[1], 'parquet', {}) is None
+    assert cache.ler(origens[0], 'parquet', {}) is not None
+    assert cache.ler(origens[2], 'parquet', {}) is not None
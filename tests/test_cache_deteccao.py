@@ -0,0 +1,53 @@
+import json
+import os
+
+import ferramentas_analista as fa
+
+
+def test_gravacoes_de_processos_diferentes_sao_mescladas(tmp_path):
+    caminho = str(tmp_path / 'deteccao.json')
+    # Dois processos que carregaram o cache antes de qualquer gravação
+    primeiro, segundo = fa.CacheDeteccao(caminho), fa.CacheDeteccao(caminho)
+    assert primeiro.obter('a.csv', [1]) is None
+    assert segundo.obter('b.csv', [2]) is None
+
+    primeiro.guardar('a.csv', [1], {'delimitador': ','})
+    segundo.guardar('b.csv', [2], {'delimitador': ';'})
+
+    with open(caminho, encoding='utf-8') as f:
+        assert len(json.load(f)) == 2
+    assert fa.CacheDeteccao(caminho).obter('a.csv', [1]) == {'delimitador': ','}
+    assert segundo.obter('a.csv', [1]) == {'delimitador': ','}
+
+
+def test_limite_de_entradas(tmp_path):
+    cache = fa.CacheDeteccao(str(tmp_path / 'deteccao.json'), max_entradas=2)
+    for i in range(3):
+        cache.guardar(f'{i}.csv', [i], {'delimitador': ','})
+    assert sorted(fa.CacheDeteccao(cache.caminho_disco).info()['arquivos']) == \
+        sorted(os.path.abspath(f'{i}.csv') for i in (1, 2))
+
+
+def test_cabecalho_guardado_na_entrada_do_arquivo(log_acessos, monkeypatch, capsys):
+    chamadas = []
+    has_header = fa.csv.Sniffer.has_header
+
+    def contar(self, amostra):
+        chamadas.append(amostra)
+        return has_header(self, amostra)
+
+    monkeypatch.setattr(fa.csv.Sniffer, 'has_header', contar)
+
+    def detectar():
+        assert fa.main(['detectar', log_acessos, '--json']) == 0
+        return json.loads(capsys.readouterr().out)[log_acessos]
+
+    assert detectar()['tem_cabecalho'] is True
+    assert detectar()['tem_cabecalho'] is True
+    assert len(chamadas) == 1
+
+    # Se o arquivo muda, o cabeçalho é verificado de novo, junto com o resto da detecção
+    with open(log_acessos, 'a', encoding='utf-8') as f:
+        f.write('2025-08-18T00:00:00Z\t10.0.0.1\t/api/0\t200\t1\t2025-08-18\n')
+    assert detectar()['tem_cabecalho'] is True
+    assert len(chamadas) == 2
@@ -0,0 +1,101 @@
+import os
+import subprocess
+import sys
+
+import nbformat
+
+import ferramentas_analista as fa
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _analisar(codigo):
+    return fa._analisar_etapa(codigo.splitlines())
+
+
+def test_entradas_de_caminhos_fixos():
+    entradas, _, desconhecidas = _analisar(
+        "import json\n"
+        "df = pd.read_csv('vendas.csv')\n"
+        "with open('config.json') as f:\n"
+        "    config = json.load(f)\n"
+        "converter_notebook_para_py('Analise.ipynb')\n"
+        "df.to_csv('saida.csv')\n"
+        "pd.set_option('display.max_columns', None)\n"
+    )
+    assert sorted(entradas) == ['Analise.ipynb', 'config.json', 'vendas.csv']
+    assert not desconhecidas
+
+
+def test_caminho_variavel_e_entrada_desconhecida():
+    assert _analisar("df = pd.read_csv(caminho)")[2]
+    assert _analisar("df = carregar_csv_inteligente(f'dados_{ano}.csv')")[2]
+
+
+def _executar(script):
+    ambiente = {**os.environ, 'PYTHONPATH': RAIZ}
+    saida = subprocess.run([sys.executable, script], cwd=os.path.dirname(script), env=ambiente,
+                           capture_output=True, text=True, check=True)
+    return saida.stdout
+
+
+def test_etapas_sempre_executadas(tmp_path):
+    (tmp_path / 'dados.txt').write_text('abc', encoding='utf-8')
+    notebook = nbformat.v4.new_notebook(cells=[
+        nbformat.v4.new_code_cell("n = 1"),
+        nbformat.v4.new_code_cell("print('sem variáveis', n)"),
+        nbformat.v4.new_code_cell("caminho = 'dados.txt'"),
+        nbformat.v4.new_code_cell("texto = open(caminho).read()"),
+        nbformat.v4.new_code_cell("m = n + len(texto)\nprint('m =', m)"),
+    ])
+    caminho_notebook = tmp_path / 'analise.ipynb'
+    nbformat.write(notebook, str(caminho_notebook))
+    script = str(tmp_path / 'analise.py')
+    fa.converter_notebook_para_py(str(caminho_notebook), script, checkpoints=True, silencioso=True)
+
+    _executar(script)
+    (tmp_path / 'dados.txt').write_text('abcdef', encoding='utf-8')
+    saida = _executar(script)
+
+    assert "⏩ Etapa 'etapa_01' restaurada do checkpoint" in saida
+    assert 'sem variáveis 1' in saida
+    # O arquivo lido por um caminho variável mudou: as etapas seguintes não podem ser restauradas
+    assert 'm = 7' in saida
+
+
+def test_celula_de_grafico_sempre_executada():
+    importacoes = "import matplotlib.pyplot as plt\nimport seaborn as sns"
+    grafico = ("if df_vendas is not None:\n"
+               "    plt.figure(figsize=(10, 6))\n"
+               "    sns.barplot(data=df_vendas, x='Preço', y='Categoria')\n"
+               "    plt.show()")
+    modulos = fa._nomes_importados(importacoes)
+    assert modulos == {'plt', 'sns'}
+
+    linhas, _ = fa._transformar_celula_em_etapa(1, importacoes)
+    assert linhas[0] == "\n# --- Etapa 01 (sempre executada) ---"
+    linhas, _ = fa._transformar_celula_em_etapa(2, grafico, modulos)
+    assert linhas[0] == "\n# --- Etapa 02 (sempre executada) ---"
+    # Sem os módulos das células anteriores, `plt` e `sns` pareceriam variáveis alteradas
+    assert _analisar(grafico)[1] == ['plt', 'sns']
+    assert fa._analisar_etapa(grafico.splitlines(), modulos)[1] == []
+
+
+def test_etapa_que_so_usa_modulos_roda_de_novo(tmp_path):
+    # Como um gráfico: a etapa 3 só chama funções de módulos importados antes
+    notebook = nbformat.v4.new_notebook(cells=[
+        nbformat.v4.new_code_cell("import json"),
+        nbformat.v4.new_code_cell("dados = {'a': 1}"),
+        nbformat.v4.new_code_cell("json.dump(dados, open('grafico.json', 'w'))"),
+    ])
+    caminho_notebook = tmp_path / 'analise.ipynb'
+    nbformat.write(notebook, str(caminho_notebook))
+    script = str(tmp_path / 'analise.py')
+    fa.converter_notebook_para_py(str(caminho_notebook), script, checkpoints=True, silencioso=True)
+
+    _executar(script)
+    os.remove(tmp_path / 'grafico.json')
+    saida = _executar(script)
+
+    assert "⏩ Etapa 'etapa_02' restaurada do checkpoint" in saida
+    assert (tmp_path / 'grafico.json').exists()
@@ -0,0 +1,52 @@
+import codecs
+
+import pytest
+
+import ferramentas_analista as fa
+
+
+@pytest.fixture
+def sem_detector_estatistico(monkeypatch):
+    def falhar():
+        raise AssertionError('a detecção estatística não deveria ser usada')
+
+    monkeypatch.setattr(fa, '_detector_estatistico', falhar)
+
+
+@pytest.mark.parametrize('bom, codificacao, esperada', [
+    (codecs.BOM_UTF8, 'utf-8', 'utf-8-sig'),
+    (b'', 'utf-16', 'utf-16'),  # o codec 'utf-16' já grava a BOM
+])
+def test_bom(tmp_path, sem_detector_estatistico, bom, codificacao, esperada):
+    caminho = tmp_path / 'clientes.csv'
+    caminho.write_bytes(bom + 'Cliente;Cidade\nJoão;São Paulo\n'.encode(codificacao))
+
+    formato = fa._detectar_formato(str(caminho), 20000, usar_cache=False)
+    df = fa.carregar_csv_inteligente(str(caminho), usar_cache=False, silencioso=True)
+
+    assert (formato['codificacao'], formato['metodo_codificacao']) == (esperada, 'BOM')
+    assert list(df.columns) == ['Cliente', 'Cidade']
+    assert df.loc[0, 'Cidade'] == 'São Paulo'
+
+
+def test_utf8_sem_detector_estatistico(tmp_path, sem_detector_estatistico):
+    caminho = tmp_path / 'clientes.csv'
+    caminho.write_text('Cliente;Cidade\n' + 'João;São Paulo\n' * 5000, encoding='utf-8')
+
+    formato = fa._detectar_formato(str(caminho), 1000, usar_cache=False)
+
+    # A amostra do fim começa no meio de um 'ã', o que não invalida o UTF-8
+    assert (formato['codificacao'], formato['metodo_codificacao']) == ('utf-8', 'validação UTF-8')
+
+
+def test_acento_so_no_fim_do_arquivo(tmp_path):
+    caminho = tmp_path / 'vendas.csv'
+    linhas = 'Produto;Cidade\n' + 'Cafe;Recife\n' * 20000 + 'Pão de Açúcar;São Paulo\n'
+    caminho.write_bytes(linhas.encode('latin-1'))
+
+    formato = fa._detectar_formato(str(caminho), 20000, usar_cache=False)
+    df = fa.carregar_csv_inteligente(str(caminho), usar_cache=False, silencioso=True)
+
+    # Só a amostra do fim tem bytes fora do ASCII
+    assert formato['codificacao'] != 'utf-8'
+    assert df.iloc[-1].tolist() == ['Pão de Açúcar', 'São Paulo']
@@ -0,0 +1,54 @@
+import bz2
+import gzip
+import lzma
+import zipfile
+
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+COMPRESSORES = {'gzip': gzip.compress, 'bz2': bz2.compress, 'xz': lzma.compress}
+
+
+@pytest.fixture
+def vendas(tmp_path):
+    caminho = tmp_path / 'vendas.csv'
+    caminho.write_bytes(('Produto;Cidade;Preço\n' + 'Pão;São Paulo;2.5\nCafé;Recife;10\n' * 3000).encode('latin-1'))
+    return caminho
+
+
+@pytest.mark.parametrize('compressao', ['gzip', 'bz2', 'xz', 'zstd', 'zip'])
+def test_compressao_reconhecida_pelos_primeiros_bytes(vendas, compressao):
+    # Sem extensão: só a assinatura indica a compressão
+    comprimido = vendas.with_name('exportacao')
+    if compressao == 'zip':
+        with zipfile.ZipFile(comprimido, 'w') as arquivo_zip:
+            arquivo_zip.write(vendas, 'vendas.csv')
+    elif compressao == 'zstd':
+        zstandard = pytest.importorskip('zstandard')
+        comprimido.write_bytes(zstandard.ZstdCompressor().compress(vendas.read_bytes()))
+    else:
+        comprimido.write_bytes(COMPRESSORES[compressao](vendas.read_bytes()))
+
+    formato = fa._detectar_formato(str(comprimido), 20000, usar_cache=False)
+    df = fa.carregar_csv_inteligente(str(comprimido), silencioso=True)
+
+    assert formato['compressao'] == compressao
+    assert formato['delimitador'] == ';'
+    esperado = fa.carregar_csv_inteligente(str(vendas), silencioso=True)
+    pd.testing.assert_frame_equal(df, esperado)
+    blocos = fa.carregar_csv_em_blocos(str(comprimido), linhas_por_bloco=1000, silencioso=True)
+    pd.testing.assert_frame_equal(pd.concat(blocos), esperado)
+
+
+def test_zip_com_varios_arquivos(vendas):
+    comprimido = vendas.with_name('exportacoes.zip')
+    with zipfile.ZipFile(comprimido, 'w') as arquivo_zip:
+        arquivo_zip.write(vendas, 'janeiro.csv')
+        arquivo_zip.write(vendas, 'fevereiro.csv')
+
+    df, metricas = fa.carregar_csv_inteligente(str(comprimido), silencioso=True, retornar_metricas=True)
+
+    assert df is None
+    assert 'único arquivo' in metricas.erro
@@ -0,0 +1,52 @@
+import json
+import os
+
+import nbformat
+
+import ferramentas_analista as fa
+
+
+def _notebook(caminho, *codigos):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    nbformat.write(nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell(c) for c in codigos]), str(caminho))
+    return str(caminho)
+
+
+def test_conversao_em_lote_pula_os_que_nao_mudaram(tmp_path):
+    raiz, saida = tmp_path / 'notebooks', tmp_path / 'scripts'
+    a = _notebook(raiz / 'a.ipynb', "x = 1")
+    b = _notebook(raiz / 'sub' / 'b.ipynb', "%matplotlib inline\ny = 2")
+    _notebook(raiz / '.ipynb_checkpoints' / 'a-checkpoint.ipynb', "x = 0")
+    quebrado = raiz / 'quebrado.ipynb'
+    quebrado.write_text('{ não é json', encoding='utf-8')
+    relatorio = str(tmp_path / 'relatorio.json')
+
+    resultado = fa.converter_notebooks_em_lote(str(raiz), pasta_saida=str(saida), max_workers=2,
+                                               caminho_relatorio=relatorio, silencioso=True)
+
+    assert resultado.convertidos == {a: str(saida / 'a.py'), b: str(saida / 'sub' / 'b.py')}
+    assert list(resultado.erros) == [str(quebrado)]
+    assert resultado.comandos == {'%matplotlib': [b]}
+    assert (saida / 'sub' / 'b.py').read_text(encoding='utf-8').count('# %matplotlib inline') == 1
+    with open(relatorio, encoding='utf-8') as f:
+        assert json.load(f)['comandos'] == {'%matplotlib': [b]}
+
+    # Só o notebook alterado é convertido de novo; os comandos dos pulados continuam no relatório
+    _notebook(raiz / 'a.ipynb', "x = 10")
+    resultado = fa.converter_notebooks_em_lote(str(raiz), pasta_saida=str(saida), max_workers=1, silencioso=True)
+
+    assert list(resultado.convertidos) == [a]
+    assert list(resultado.pulados) == [b]
+    assert resultado.comandos == {'%matplotlib': [b]}
+    assert 'x = 10' in (saida / 'a.py').read_text(encoding='utf-8')
+
+
+def test_script_apagado_e_convertido_de_novo(tmp_path):
+    a = _notebook(tmp_path / 'a.ipynb', "x = 1")
+    fa.converter_notebooks_em_lote(str(tmp_path), max_workers=1, silencioso=True)
+    os.remove(tmp_path / 'a.py')
+
+    resultado = fa.converter_notebooks_em_lote(str(tmp_path), max_workers=1, silencioso=True)
+
+    assert list(resultado.convertidos) == [a]
+    assert (tmp_path / 'a.py').exists()
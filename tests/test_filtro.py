@@ -0,0 +1,46 @@
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+
+@pytest.fixture(autouse=True)
+def blocos_pequenos(monkeypatch):
+    # Força vários blocos mesmo em um arquivo pequeno
+    monkeypatch.setattr(fa, 'BYTES_POR_BLOCO_FILTRO', 16 * 1024)
+
+
+@pytest.mark.parametrize('motor', [None, 'c'])
+def test_filtro_igual_a_filtrar_o_dataframe_inteiro(log_acessos, motor):
+    inteiro = fa.carregar_csv_inteligente(log_acessos, motor=motor, silencioso=True)
+    filtrado = fa.carregar_csv_inteligente(log_acessos, motor=motor, filtro='Status_Code == 401', silencioso=True)
+
+    esperado = inteiro.query('Status_Code == 401').reset_index(drop=True)
+    pd.testing.assert_frame_equal(filtrado, esperado)
+
+
+def test_filtro_com_colunas(log_acessos):
+    inteiro = fa.carregar_csv_inteligente(log_acessos, silencioso=True)
+    filtrado = fa.carregar_csv_inteligente(log_acessos, colunas=['Timestamp', 'Codigo'],
+                                           filtro="Endpoint == '/api/2'", silencioso=True)
+
+    esperado = inteiro.loc[inteiro['Endpoint'] == '/api/2', ['Timestamp', 'Codigo']].reset_index(drop=True)
+    pd.testing.assert_frame_equal(filtrado, esperado)
+
+
+def test_blocos_com_os_tipos_da_leitura_inteira(log_acessos):
+    inteiro = fa.carregar_csv_inteligente(log_acessos, silencioso=True)
+    blocos = list(fa.carregar_csv_em_blocos(log_acessos, linhas_por_bloco=1000, silencioso=True))
+
+    assert len(blocos) == 6
+    pd.testing.assert_frame_equal(pd.concat(blocos, ignore_index=True), inteiro)
+
+
+@pytest.mark.parametrize('motor', [None, 'c', 'python'])
+def test_projecao_com_os_tipos_da_leitura_inteira(log_acessos, motor):
+    inteiro = fa.carregar_csv_inteligente(log_acessos, motor=motor, silencioso=True)
+    projetado = fa.carregar_csv_inteligente(log_acessos, motor=motor, colunas=['Codigo', 'Status_Code', 'Data'],
+                                            silencioso=True)
+
+    # Na ordem pedida, e não na do arquivo
+    pd.testing.assert_frame_equal(projetado, inteiro[['Codigo', 'Status_Code', 'Data']])
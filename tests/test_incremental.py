@@ -0,0 +1,56 @@
+import pandas as pd
+
+import ferramentas_analista as fa
+
+
+def _acrescentar(caminho, texto):
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write(texto)
+
+
+def test_linhas_acrescentadas_iguais_a_carga_completa(log_acessos):
+    with open(log_acessos, encoding='utf-8') as f:
+        cabecalho, *linhas = f.read().splitlines(keepends=True)
+    with open(log_acessos, 'w', encoding='utf-8') as f:
+        f.write(cabecalho + ''.join(linhas[:3000]))
+
+    log = fa.CarregadorIncremental(log_acessos, silencioso=True)
+    assert len(log.atualizar()) == 3000
+    # Uma linha pela metade fica para a próxima atualização
+    _acrescentar(log_acessos, ''.join(linhas[3000:]) + '2025-08-18T00:00:00Z\t10.0.0.1')
+    assert len(log.atualizar()) == 3000
+    _acrescentar(log_acessos, '\t/api/0\t200\t1\t2025-08-18\n')
+    assert len(log.atualizar()) == 1
+    assert log.ultima_atualizacao == 'incremental'
+
+    pd.testing.assert_frame_equal(log.df, fa.carregar_csv_inteligente(log_acessos, silencioso=True))
+
+
+def test_arquivo_que_comeca_so_com_cabecalho(log_acessos):
+    with open(log_acessos, encoding='utf-8') as f:
+        cabecalho, *linhas = f.read().splitlines(keepends=True)
+    with open(log_acessos, 'w', encoding='utf-8') as f:
+        f.write(cabecalho)
+
+    log = fa.CarregadorIncremental(log_acessos, silencioso=True)
+    assert log.atualizar().empty
+    assert log.atualizar().empty
+    assert log.ultima_atualizacao == 'sem_mudancas'
+    _acrescentar(log_acessos, ''.join(linhas[:100]))
+    log.atualizar()
+    _acrescentar(log_acessos, ''.join(linhas[100:]))
+    log.atualizar()
+
+    # Os tipos vêm das linhas, e não do DataFrame vazio da primeira carga
+    pd.testing.assert_frame_equal(log.df, fa.carregar_csv_inteligente(log_acessos, silencioso=True))
+
+
+def test_codigos_com_zeros_a_esquerda_com_motor_c(log_acessos):
+    log = fa.CarregadorIncremental(log_acessos, motor='c', silencioso=True)
+    log.atualizar()
+    # Lidas sozinhas, as linhas novas dariam 'Codigo' numérico (123 em vez de '00123')
+    _acrescentar(log_acessos, '2025-08-18T00:00:00Z\t10.0.0.1\t/api/0\t200\t00123\t2025-08-18\n'
+                              '2025-08-18T00:00:01Z\t10.0.0.2\t/api/1\t401\t00456\t2025-08-18\n')
+    assert list(log.atualizar()['Codigo']) == ['00123', '00456']
+
+    pd.testing.assert_frame_equal(log.df, fa.carregar_csv_inteligente(log_acessos, motor='c', silencioso=True))
@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+INICIO, FIM = '2025-08-17T00:30:00Z', '2025-08-17T01:00:00Z'
+
+
+def _filtrar(df, inicio, fim):
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+    intervalo = (df['Timestamp'] >= pd.Timestamp(inicio)) & (df['Timestamp'] < pd.Timestamp(fim))
+    return df[intervalo].reset_index(drop=True)
+
+
+@pytest.mark.parametrize('motor', [None, 'c'])
+def test_intervalo_igual_a_filtrar_a_carga_inteira(log_acessos, motor):
+    intervalo, metricas = fa.carregar_intervalo_tempo(log_acessos, INICIO, FIM, linhas_por_entrada=500,
+                                                      motor=motor, silencioso=True, retornar_metricas=True)
+    inteiro = fa.carregar_csv_inteligente(log_acessos, motor=motor, silencioso=True)
+
+    # 'Codigo' só tem letras no começo do arquivo: lido sozinho, o trecho daria números
+    pd.testing.assert_frame_equal(intervalo, _filtrar(inteiro, INICIO, FIM))
+    assert len(intervalo) == 1800
+    assert metricas.bytes_processados < fa.os.path.getsize(log_acessos) / 2
+
+
+def test_indice_estendido_quando_o_arquivo_cresce(log_acessos):
+    indice = fa.construir_indice_tempo(log_acessos, linhas_por_entrada=500, silencioso=True)
+    assert (indice['linhas'], len(indice['entradas'])) == (6000, 12)
+
+    with open(log_acessos, 'a', encoding='utf-8') as f:
+        f.write('2025-08-17T02:00:00Z\t10.0.0.1\t/api/0\t200\t1\t2025-08-17\n')
+    indice = fa.construir_indice_tempo(log_acessos, linhas_por_entrada=500, silencioso=True)
+    assert (indice['linhas'], len(indice['entradas'])) == (6001, 13)
+
+    intervalo = fa.carregar_intervalo_tempo(log_acessos, '2025-08-17T01:40:00Z', '2025-08-17T03:00:00Z',
+                                            linhas_por_entrada=500, silencioso=True)
+    assert list(intervalo['Codigo']) == ['1']
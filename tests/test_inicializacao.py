@@ -0,0 +1,31 @@
+import os
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(RAIZ, 'ferramentas_analista.py')
+
+# Limite folgado: sem o pandas, a linha de comando inicia em poucas dezenas de ms
+LIMITE_AJUDA_SEGUNDOS = 2.0
+
+
+def _python(*argumentos):
+    ambiente = {**os.environ, 'PYTHONPATH': RAIZ}
+    return subprocess.run([sys.executable, *argumentos], env=ambiente, capture_output=True, text=True, check=True)
+
+
+def test_importacao_nao_carrega_dependencias_pesadas():
+    saida = _python('-c', "import sys, ferramentas_analista; "
+                          "print(' '.join(m for m in ('pandas', 'chardet', 'nbformat') if m in sys.modules))")
+    assert saida.stdout.strip() == ''
+
+
+def test_ajuda_da_linha_de_comando_inicia_rapido():
+    _python(SCRIPT, '--help')  # aquece o cache de bytecode
+    inicio = time.perf_counter()
+    saida = _python(SCRIPT, '--help')
+    duracao = time.perf_counter() - inicio
+
+    assert 'converter' in saida.stdout
+    assert duracao < LIMITE_AJUDA_SEGUNDOS
@@ -0,0 +1,53 @@
+import json
+import os
+
+import nbformat
+import pytest
+
+import ferramentas_analista as fa
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _celulas_nbformat(caminho):
+    with open(caminho, encoding='utf-8') as f:
+        notebook = nbformat.read(f, as_version=4)
+    return [(celula.cell_type, celula.source) for celula in notebook.cells]
+
+
+def test_notebook_do_repositorio_igual_ao_nbformat():
+    caminho = os.path.join(RAIZ, 'Analise_Exploratoria_Completa.ipynb')
+    assert fa._ler_celulas_notebook(caminho) == _celulas_nbformat(caminho)
+
+
+def test_textos_escapados_e_saidas_puladas(tmp_path):
+    codigo = 'print("aspas \\" e \\\\ barra")\ntexto = "São Paulo \\u00e9 \U0001f600"\t# fim'
+    celula = nbformat.v4.new_code_cell(codigo, outputs=[
+        nbformat.v4.new_output('display_data', data={'image/png': 'iVBORw0KGgo=' * 1000, 'text/plain': '<Figura>'}),
+        nbformat.v4.new_output('stream', name='stdout', text='{"não": ["é", "código"]}\n'),
+    ])
+    notebook = nbformat.v4.new_notebook(cells=[
+        nbformat.v4.new_markdown_cell('# Título\n\n- item com `[colchetes]` e {chaves}'),
+        celula,
+        nbformat.v4.new_raw_cell(''),
+    ], metadata={'kernelspec': {'name': 'python3', 'display_name': 'Python 3'}})
+    caminho = str(tmp_path / 'analise.ipynb')
+    nbformat.write(notebook, caminho)
+
+    assert fa._ler_celulas_notebook(caminho) == _celulas_nbformat(caminho)
+    assert fa._ler_celulas_notebook(caminho)[1] == ('code', codigo)
+
+
+def test_formato_antigo_fica_para_o_nbformat(tmp_path):
+    caminho = tmp_path / 'antigo.ipynb'
+    caminho.write_text(json.dumps({'nbformat': 3, 'nbformat_minor': 0, 'metadata': {},
+                                   'worksheets': [{'cells': []}]}), encoding='utf-8')
+    assert fa._ler_celulas_notebook(str(caminho)) is None
+
+
+@pytest.mark.parametrize('conteudo', ['', '{"cells": [', '{"cells": [{"source": "x"}], "nbformat": 4}'])
+def test_notebook_invalido(tmp_path, conteudo):
+    caminho = tmp_path / 'quebrado.ipynb'
+    caminho.write_text(conteudo, encoding='utf-8')
+    with pytest.raises(ValueError):
+        fa._ler_celulas_notebook(str(caminho))
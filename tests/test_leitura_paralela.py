@@ -0,0 +1,58 @@
+import csv
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def feedback(tmp_path):
+    """O `dados_feedback_US.csv` repetido, com comentários de várias linhas e aspas escapadas."""
+    with open(os.path.join(RAIZ, 'dados_feedback_US.csv'), encoding='utf-8') as f:
+        cabecalho, *linhas = [linha + '\n' for linha in f.read().splitlines()]
+    extras = ['7001,2,"Late delivery.\nThe box was ""open"", again,\nand wet."\n',
+              '7002,1,"""Terrible""\n\n"\n']
+    caminho = tmp_path / 'feedback.csv'
+    caminho.write_text(cabecalho + ''.join((linhas + extras) * 2000), encoding='utf-8')
+    return str(caminho)
+
+
+def _registros(texto):
+    return list(csv.reader(io.StringIO(texto, newline='')))
+
+
+def test_intervalos_terminam_em_fins_de_registro(feedback):
+    with open(feedback, 'rb') as f:
+        dados = f.read()
+
+    with ThreadPoolExecutor(4) as executor:
+        intervalos = fa._dividir_em_registros(feedback, 64, executor)
+
+    assert len(intervalos) > 32
+    assert intervalos[0][0] == dados.index(b'\n') + 1 and intervalos[-1][1] == len(dados)
+    assert all(fim == proximo for (_, fim), (proximo, _) in zip(intervalos, intervalos[1:]))
+    # Cada intervalo, lido sozinho, tem só registros completos de três campos
+    total = 0
+    for inicio, fim in intervalos:
+        registros = _registros(dados[inicio:fim].decode('utf-8'))
+        assert all(len(registro) == 3 for registro in registros)
+        total += len(registros)
+    assert total == len(_registros(dados.decode('utf-8'))) - 1
+
+
+def test_leitura_paralela_igual_a_leitura_unica(feedback, monkeypatch):
+    monkeypatch.setattr(fa, 'TAMANHO_MINIMO_PARALELO', 0)
+
+    unica = fa.carregar_csv_inteligente(feedback, silencioso=True)
+    paralela, metricas = fa.carregar_csv_inteligente(feedback, n_processos=2, silencioso=True,
+                                                     retornar_metricas=True)
+
+    assert 'divisao_arquivo' in metricas.fases
+    assert paralela.loc[3, 'Comment'] == 'Late delivery.\nThe box was "open", again,\nand wet.'
+    pd.testing.assert_frame_equal(paralela, unica)
@@ -0,0 +1,48 @@
+import logging
+import os
+
+import nbformat
+import pytest
+
+import ferramentas_analista as fa
+
+
+def test_metricas_e_eventos_do_carregador(log_acessos, capsys):
+    eventos = []
+    df, metricas = fa.carregar_csv_inteligente(log_acessos, silencioso=True, retornar_metricas=True,
+                                               ao_registrar=lambda evento, dados: eventos.append((evento, dados)))
+
+    assert capsys.readouterr().out == ''
+    assert {'leitura_amostra', 'deteccao_codificacao', 'deteccao_delimitador', 'leitura_csv'} <= set(metricas.fases)
+    assert (metricas.linhas, metricas.bytes_processados) == (len(df), os.path.getsize(log_acessos))
+    assert (metricas.codificacao, metricas.delimitador, metricas.motor) == ('utf-8', '\t', df.attrs['motor_csv'])
+
+    fases = [dados for evento, dados in eventos if evento == 'fase']
+    assert {dados['fase'] for dados in fases} == set(metricas.fases)
+    assert sum(dados['duracao'] for dados in fases) == pytest.approx(metricas.tempo_total)
+    assert eventos[-1][0] == 'concluido'
+    assert eventos[-1][1]['metricas'] == metricas.como_dict()
+
+
+def test_erro_registrado_sem_excecao(tmp_path, caplog):
+    eventos = []
+    caminho = str(tmp_path / 'nao_existe.csv')
+    with caplog.at_level(logging.ERROR, logger='ferramentas_analista'):
+        df, metricas = fa.carregar_csv_inteligente(caminho, silencioso=True, retornar_metricas=True,
+                                                   ao_registrar=lambda evento, dados: eventos.append(evento))
+
+    assert df is None
+    assert metricas.erro.startswith('FileNotFoundError')
+    assert eventos[-1] == 'erro'
+    assert metricas.erro in caplog.text
+
+
+def test_metricas_do_conversor(tmp_path):
+    caminho = str(tmp_path / 'analise.ipynb')
+    nbformat.write(nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell("x = 1")]), caminho)
+
+    metricas = fa.converter_notebook_para_py(caminho, silencioso=True, retornar_metricas=True)
+
+    assert set(metricas.fases) == {'leitura_notebook', 'transformacao', 'escrita'}
+    assert metricas.bytes_processados == os.path.getsize(caminho)
+    assert metricas.erro is None
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+pytest.importorskip('pyarrow')
+
+
+def _sem_attrs(df):
+    df.attrs = {}
+    return df
+
+
+def test_pyarrow_com_os_tipos_do_motor_c(log_acessos):
+    rapido = fa.carregar_csv_inteligente(log_acessos, silencioso=True)
+    assert rapido.attrs['motor_csv'] == 'pyarrow'
+
+    # Datas e horários continuam texto, como no motor 'c'
+    assert rapido.loc[0, 'Timestamp'] == '2025-08-17T00:00:00Z'
+    assert rapido.loc[0, 'Data'] == '2025-08-01'
+    pd.testing.assert_frame_equal(_sem_attrs(rapido),
+                                  _sem_attrs(fa.carregar_csv_inteligente(log_acessos, motor='c', silencioso=True)))
+
+
+def test_horas_lidas_pelo_proximo_motor(tmp_path):
+    caminho = tmp_path / 'turnos.csv'
+    caminho.write_text('Turno,Inicio\n' + ''.join(f'T{i},{8 + i % 10:02d}:30\n' for i in range(50)),
+                       encoding='utf-8')
+
+    df = fa.carregar_csv_inteligente(str(caminho), silencioso=True)
+
+    # O 'pyarrow' leria '08:30' como hora; o 'c' assume a leitura
+    assert df.attrs['motor_csv'] == 'c'
+    assert df.loc[0, 'Inicio'] == '08:30'
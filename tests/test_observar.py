@@ -0,0 +1,56 @@
+import os
+
+import nbformat
+
+import ferramentas_analista as fa
+
+
+def _notebook(caminho, *codigos):
+    nbformat.write(nbformat.v4.new_notebook(cells=[nbformat.v4.new_code_cell(c) for c in codigos]), str(caminho))
+    return str(caminho)
+
+
+def test_so_as_celulas_editadas_sao_transformadas_de_novo(tmp_path):
+    caminho = _notebook(tmp_path / 'analise.ipynb', "x = 1", "%time y = 2", "z = 3")
+    script = str(tmp_path / 'analise.py')
+    fa._transformar_celula.cache_clear()
+
+    fa.converter_notebook_para_py(caminho, script, silencioso=True)
+    assert fa._transformar_celula.cache_info().misses == 3
+    _notebook(tmp_path / 'analise.ipynb', "x = 1", "%time y = 2", "z = 30")
+    fa.converter_notebook_para_py(caminho, script, silencioso=True)
+
+    assert fa._transformar_celula.cache_info().misses == 4
+    with open(script, encoding='utf-8') as f:
+        assert 'z = 30' in f.read()
+
+
+def test_script_igual_nao_e_regravado(tmp_path):
+    caminho = _notebook(tmp_path / 'analise.ipynb', "x = 1")
+    script = str(tmp_path / 'analise.py')
+    fa.converter_notebook_para_py(caminho, script, silencioso=True)
+    os.utime(script, ns=(0, 0))
+
+    fa.converter_notebook_para_py(caminho, script, silencioso=True)
+
+    assert os.stat(script).st_mtime_ns == 0
+
+
+def test_observacao_reconverte_notebooks_salvos(tmp_path, monkeypatch):
+    _notebook(tmp_path / 'a.ipynb', "x = 1")
+    _notebook(tmp_path / 'b.ipynb', "y = 2")
+    saida = tmp_path / 'scripts'
+    salvamentos = iter([
+        lambda: _notebook(tmp_path / 'a.ipynb', "x = 10"),
+        # Um notebook salvo pela metade gera um aviso e é tentado de novo quando mudar
+        lambda: (tmp_path / 'b.ipynb').write_text('{"cells": [', encoding='utf-8'),
+        lambda: _notebook(tmp_path / 'b.ipynb', "y = 20"),
+    ])
+    monkeypatch.setattr(fa.time, 'sleep', lambda segundos: next(salvamentos, lambda: None)())
+
+    conversoes = fa.observar_notebooks(str(tmp_path), pasta_saida=str(saida), intervalo=0, max_ciclos=5,
+                                       silencioso=True)
+
+    assert conversoes == 4
+    assert 'x = 10' in (saida / 'a.py').read_text(encoding='utf-8')
+    assert 'y = 20' in (saida / 'b.py').read_text(encoding='utf-8')
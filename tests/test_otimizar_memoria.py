@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+
+def test_tipos_escolhidos_pela_amostra(log_acessos):
+    pytest.importorskip('pyarrow')
+    padrao = fa.carregar_csv_inteligente(log_acessos, silencioso=True)
+    df = fa.carregar_csv_inteligente(log_acessos, otimizar_memoria=True, silencioso=True)
+
+    assert str(df['Timestamp'].dtype).startswith('datetime64') and str(df['Timestamp'].dt.tz) == 'UTC'
+    assert str(df['Data'].dtype).startswith('datetime64')
+    assert df['IP_Address'].dtype == 'category' and df['Endpoint'].dtype == 'category'
+    assert df['Codigo'].dtype == pd.StringDtype('pyarrow')
+    assert df['Status_Code'].dtype == 'int16'
+
+    # Os valores não mudam, só os tipos
+    assert list(df['Codigo']) == list(padrao['Codigo'])
+    assert list(df['Endpoint'].astype(str)) == list(padrao['Endpoint'])
+    assert (df['Status_Code'] == padrao['Status_Code']).all()
+    assert (df['Timestamp'] == pd.to_datetime(padrao['Timestamp'])).all()
+
+    memoria = df.attrs['memoria']
+    assert memoria['otimizada'] == df.memory_usage(deep=True).sum()
+    assert memoria['otimizada'] < memoria['estimada_sem_otimizacao'] / 2
+
+
+def test_floats_reduzidos_so_sem_perda(tmp_path):
+    caminho = tmp_path / 'precos.csv'
+    caminho.write_text('Produto,Preço,Taxa,Quantidade\n'
+                       + ''.join(f'P{i},{i}.5,0.{i + 1},{i}\n' for i in range(100)), encoding='utf-8')
+
+    df = fa.carregar_csv_inteligente(str(caminho), otimizar_memoria=True, silencioso=True)
+
+    # 0,5 é exato em float32; 0,1 não
+    assert df['Preço'].dtype == 'float32'
+    assert df['Taxa'].dtype == 'float64'
+    assert df['Quantidade'].dtype == 'int8'
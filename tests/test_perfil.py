@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import ferramentas_analista as fa
+
+LINHAS = 200_000
+
+
+@pytest.fixture(scope='module')
+def transacoes(tmp_path_factory):
+    gerador = np.random.default_rng(7)
+    df = pd.DataFrame({
+        'id': np.arange(LINHAS),
+        'valor': gerador.lognormal(3, 1, LINHAS).round(2),
+        'loja': np.char.add('L', gerador.integers(0, 50, LINHAS).astype(str)),
+        'nota': np.where(gerador.random(LINHAS) < 0.1, np.nan, gerador.integers(1, 6, LINHAS)),
+    })
+    caminho = tmp_path_factory.mktemp('perfil') / 'transacoes.csv'
+    df.to_csv(caminho, index=False)
+    return str(caminho), pd.read_csv(caminho)
+
+
+def test_estatisticas_exatas_e_aproximadas(transacoes):
+    caminho, df = transacoes
+    relatorio = fa.perfilar_csv(caminho, linhas_por_bloco=20_000, silencioso=True)
+
+    assert relatorio.linhas == LINHAS
+    valor, nota, loja = relatorio.colunas['valor'], relatorio.colunas['nota'], relatorio.colunas['loja']
+    assert (valor.tipo, nota.tipo, loja.tipo) == ('decimal', 'inteiro', 'texto')
+    assert nota.nulos == df['nota'].isna().sum()
+    assert (valor.minimo, valor.maximo) == (df['valor'].min(), df['valor'].max())
+    # Média e desvio combinados entre blocos são exatos, a menos de arredondamento
+    assert valor.media == pytest.approx(df['valor'].mean(), rel=1e-9)
+    assert valor.desvio_padrao == pytest.approx(df['valor'].std(), rel=1e-9)
+
+    # HyperLogLog com precisão 14: erro típico de ~0,8%
+    assert relatorio.colunas['id'].distintos_aprox == pytest.approx(LINHAS, rel=0.03)
+    assert loja.distintos_aprox == 50
+
+    # Quantis aproximados: o erro é medido na posição (rank), não no valor
+    ordenados = np.sort(df['valor'].to_numpy())
+    for probabilidade, quantil in valor.quantis.items():
+        posicao = np.searchsorted(ordenados, quantil, side='right') / LINHAS
+        assert posicao == pytest.approx(probabilidade, abs=0.02)
+
+
+def test_relatorio_em_dataframe(transacoes):
+    caminho, _ = transacoes
+    tabela = fa.perfilar_csv(caminho, bytes_por_bloco=500_000, quantis=(0.5,), silencioso=True).como_dataframe()
+
+    assert list(tabela.index) == ['id', 'valor', 'loja', 'nota']
+    assert 'q50' in tabela.columns
+    assert tabela.loc['id', 'linhas'] == LINHAS
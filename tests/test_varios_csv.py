@@ -0,0 +1,42 @@
+import pandas as pd
+
+import ferramentas_analista as fa
+
+
+def _escrever(caminho, texto, codificacao='utf-8'):
+    caminho.write_text(texto, encoding=codificacao)
+    return str(caminho)
+
+
+def test_erros_por_arquivo_em_processos(tmp_path):
+    janeiro = _escrever(tmp_path / 'vendas_01.csv', 'Produto;Preço\nCafé;10.5\nPão;2.0\n', 'latin-1')
+    fevereiro = _escrever(tmp_path / 'vendas_02.csv', 'Produto,Preço\nChá,7.25\n')
+    clientes = _escrever(tmp_path / 'clientes.csv', 'Cliente\tCidade\nAna\tRecife\n')
+    ausente = str(tmp_path / 'vendas_03.csv')
+
+    resultado = fa.carregar_varios_csv([ausente, janeiro, clientes, fevereiro], max_workers=2,
+                                       concatenar=True, silencioso=True)
+
+    # Um arquivo com erro não impede os demais, e a ordem de entrada é mantida
+    assert list(resultado.dataframes) == [janeiro, clientes, fevereiro]
+    assert list(resultado.erros) == [ausente]
+    assert 'FileNotFoundError' in resultado.erros[ausente]
+    assert resultado.metricas[janeiro].linhas == 2
+    assert resultado.metricas[ausente].erro == resultado.erros[ausente]
+
+    vendas = resultado.concatenados[('Produto', 'Preço')]
+    assert list(vendas['Produto']) == ['Café', 'Pão', 'Chá']
+    assert list(vendas['arquivo_origem']) == [janeiro, janeiro, fevereiro]
+    assert len(resultado.concatenados) == 2
+
+
+def test_padrao_glob_no_processo_atual(tmp_path):
+    for mes in ('01', '02'):
+        _escrever(tmp_path / f'vendas_{mes}.csv', f'Produto,Mes\nCafé,{mes}\n')
+
+    resultado = fa.carregar_varios_csv(str(tmp_path / 'vendas_*.csv'), max_workers=1, silencioso=True)
+
+    assert [df.loc[0, 'Mes'] for df in resultado.dataframes.values()] == [1, 2]
+    assert resultado.erros == {}
+    pd.testing.assert_frame_equal(resultado.dataframes[str(tmp_path / 'vendas_01.csv')],
+                                  fa.carregar_csv_inteligente(str(tmp_path / 'vendas_01.csv'), silencioso=True))